@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""``console.log`` calls written to a file, a pipe and ``/dev/null`` by every console mode.
+
+Run from the repository root: ``python benchmarks/console.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, time
+from petuhlang.cli.console import console
+
+calls, mode = int(sys.argv[1]), sys.argv[2]
+if mode != "print":
+    console.configure(mode=mode)
+log = print if mode == "print" else console.log
+start = time.perf_counter()
+for number in range(calls):
+    log("record", number)
+if mode != "print":
+    console.flush()
+sys.stdout.flush()
+print(time.perf_counter() - start, file=sys.stderr)
+"""
+MODES = ("print", "direct", "buffered", "async")
+TARGETS = ("file", "pipe", "devnull")
+
+
+def measure(mode: str, target: str, /, *, calls: int) -> float:
+    """Returns the time of the logging loop (with the final flush) in a child process."""
+    command = [sys.executable, "-c", CHILD, str(calls), mode]
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    if target == "pipe":
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
+        )
+        assert process.stdout is not None
+        while process.stdout.read(1 << 16):
+            pass
+        return float(process.communicate()[1])
+
+    with tempfile.TemporaryFile() if target == "file" else open(
+        os.devnull, "wb"
+    ) as stdout:
+        return float(
+            subprocess.run(
+                command, stdout=stdout, stderr=subprocess.PIPE, env=env, check=True
+            ).stderr
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} " + " ".join(f"{f'{target}, s':>10}" for target in TARGETS))
+    for mode in MODES:
+        times = (measure(mode, target, calls=args.calls) for target in TARGETS)
+        print(f"{mode:>9} " + " ".join(f"{elapsed:>10.3f}" for elapsed in times))
+
+
+if __name__ == "__main__":
+    main()
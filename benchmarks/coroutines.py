@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Running 10k petuh coroutines (``asyncfunction``) with ``asyncio.gather`` and ``await then[...]``.
+
+Run from the repository root: ``python benchmarks/coroutines.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime  # noqa: E402
+from petuhlang.pkeywords import then  # noqa: E402
+
+SOURCE = '''
+from petuhlang import build
+build.using >> "petuhlang"
+
+asyncfunction >> work(arg("x")) ["""
+await asyncio.sleep(0)
+return x
+"""]
+'''
+
+
+async def python_work(x: int) -> int:
+    await asyncio.sleep(0)
+    return x
+
+
+async def gather(fn, count: int, /) -> list[int]:
+    return await asyncio.gather(*(fn(i) for i in range(count)))
+
+
+async def gather_then(fn, count: int, /) -> list[int]:
+    async def one(i: int) -> int:
+        return (await then[fn(i)]).__to_compile__
+
+    return await asyncio.gather(*(one(i) for i in range(count)))
+
+
+def measure(runner, fn, /, *, count: int, repeat: int) -> float:
+    """Returns the best time of `repeat` runs of the `count` coroutines."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assert asyncio.run(runner(fn, count)) == list(range(count))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with Runtime() as runtime:
+        runtime.bind("asyncio", asyncio)
+        runtime.run_source(SOURCE)
+        work = runtime.namespace["work"]
+
+        cases = (
+            ("python, gather", gather, python_work),
+            ("petuh, gather", gather, work),
+            ("petuh, await then", gather_then, work),
+        )
+        print(f"{'case':>18} {'time, s':>8} {'us/coroutine':>13}")
+        for name, runner, fn in cases:
+            elapsed = measure(runner, fn, count=args.count, repeat=args.repeat)
+            print(f"{name:>18} {elapsed:>8.3f} {elapsed / args.count * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
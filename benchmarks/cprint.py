@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Cost of :func:`cprint`, :class:`Style` and :func:`cprint_many` against the old cprint.
+
+The old cprint built the escape sequences from the enum members on every
+call. Output is rendered to strings (``return_str=True``) with colors
+forced on, so the terminal is not measured.
+
+Run from the repository root: ``python benchmarks/cprint.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang.cli.colors import impl  # noqa: E402
+from petuhlang.cli.colors.enums import (  # noqa: E402
+    to_ansi,
+    color as color_,
+    effect as effect_,
+    background as background_,
+)
+
+
+def old_cprint(message: str, /, color: str, *, effect=None, background=None) -> str:
+    """cprint before the prefixes were precomputed."""
+    to_print = to_ansi(effect_.__members__["RESET"]) + to_ansi(color_.__members__[color])
+    if background is not None:
+        to_print += to_ansi(background_.__members__[background])
+
+    if effect is not None:
+        to_print += to_ansi(effect_.__members__[effect])
+
+    return to_print + message + to_ansi(effect_.__members__["RESET"])
+
+
+def measure(function, /, *, number: int, repeat: int) -> float:
+    """Returns the best time of one call (of `repeat` runs of `number` calls)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--segments", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    impl._render = impl._render_ansi
+    style = impl.Style("RED", effect="BOLD", background="WHITE")
+    options = {"effect": "BOLD", "background": "WHITE"}
+    assert old_cprint("x", "RED", **options) == impl.cprint(
+        "x", "RED", return_str=True, **options
+    )
+    assert style.render("x") == old_cprint("x", "RED", **options)
+
+    segments = [(f"segment {i}", style if i % 2 else None) for i in range(args.segments)]
+
+    def old_many() -> str:
+        return "".join(
+            old_cprint(message, "RED", **options) if segment_style else message
+            for message, segment_style in segments
+        )
+
+    assert impl.cprint_many(segments, return_str=True) == old_many()
+
+    many = args.number // args.segments
+    cases = (
+        ("old cprint", lambda: old_cprint("message", "RED", **options), args.number),
+        (
+            "cprint",
+            lambda: impl.cprint("message", "RED", return_str=True, **options),
+            args.number,
+        ),
+        ("Style.render", lambda: style.render("message"), args.number),
+        (f"old cprint x{args.segments}", old_many, many),
+        (
+            f"cprint_many x{args.segments}",
+            lambda: impl.cprint_many(segments, return_str=True),
+            many,
+        ),
+    )
+    print(f"{'case':>20} {'us/call':>9}")
+    for name, function, number in cases:
+        elapsed = measure(function, number=number, repeat=args.repeat)
+        print(f"{name:>20} {elapsed * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
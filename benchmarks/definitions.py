@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Throughput of petuh-function definitions with small and large kwarg defaults.
+
+Defaults are bound by reference, so a 1000-element default costs the
+same as a small one. The code cache is disabled for the cold runs and
+warmed in memory for the warm ones (its LRU is grown to hold every
+definition, with the default 1024 entries 10k functions never hit it).
+
+Run from the repository root: ``python benchmarks/definitions.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime  # noqa: E402
+from petuhlang._cache import code_cache  # noqa: E402
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+
+
+def generate_source(definitions: int, /) -> str:
+    """Source with `definitions` functions, every one has a default bound to `default`."""
+    lines = [USING]
+    lines.extend(
+        f'function >> f{i}(arg("x"), kwarg("items", value=default)) ["return x + len(items)"]'
+        for i in range(definitions)
+    )
+    return "\n".join(lines) + "\n"
+
+
+def measure(source: str, default: object, /, *, cache: bool, repeat: int) -> float:
+    """Returns the best time of `repeat` runs of the source."""
+    code_cache.enabled, maxsize = cache, code_cache.maxsize
+    code_cache.maxsize = max(maxsize, source.count("function >> "))
+    best = float("inf")
+    try:
+        for _ in range(repeat):
+            with Runtime() as runtime:
+                runtime.bind("default", default)
+                start = time.perf_counter()
+                runtime.run_source(source)
+                best = min(best, time.perf_counter() - start)
+                assert runtime.namespace["f0"].__defaults__[0] is default
+    finally:
+        code_cache.enabled, code_cache.maxsize = True, maxsize
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--definitions", type=int, default=10_000)
+    parser.add_argument("--size", type=int, default=1_000, help="items of the large default")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_source(args.definitions)
+    defaults = {"small": 0, f"list x{args.size}": list(range(args.size))}
+    print(f"{'default':>12} {'cache':>6} {'time, s':>8} {'defs/s':>9}")
+    for name, default in defaults.items():
+        for cache in (False, True):
+            elapsed = measure(source, default, cache=cache, repeat=args.repeat)
+            print(
+                f"{name:>12} {'warm' if cache else 'cold':>6} "
+                f"{elapsed:>8.3f} {args.definitions / elapsed:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
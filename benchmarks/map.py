@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Serial calls and :meth:`PetuhCompiledFunction.map` on CPU-bound and I/O-bound bodies.
+
+Run from the repository root: ``python benchmarks/map.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime  # noqa: E402
+
+SOURCE = '''
+from petuhlang import build
+build.using >> "petuhlang"
+
+function >> cpu(arg("n")) ["return sum(i * i for i in range(n))"]
+function >> io(arg("seconds")) ["import time; time.sleep(seconds); return seconds"]
+'''
+# Function, argument of every call.
+CASES = {"cpu": ("cpu", 20_000), "io": ("io", 0.002)}
+
+
+def measure(fn, argument: object, /, *, calls: int, mode: str, workers: int) -> float:
+    """Returns the time of `calls` calls (serially or by `map` in the mode)."""
+    items = [argument] * calls
+    start = time.perf_counter()
+    if mode == "serial":
+        results = [fn(item) for item in items]
+    else:
+        results = list(fn.map(items, workers=workers, mode=mode))
+    elapsed = time.perf_counter() - start
+    assert len(results) == calls
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"cpu count: {os.cpu_count()}, workers: {args.workers}")
+    print(f"{'body':>5} {'mode':>8} {'time, s':>8} {'speedup':>8}")
+    with Runtime() as runtime:
+        runtime.run_source(SOURCE)
+        with runtime.activate():
+            for case, (name, argument) in CASES.items():
+                fn = runtime.namespace[name]
+                serial = None
+                for mode in ("serial", "thread", "process"):
+                    elapsed = measure(
+                        fn, argument, calls=args.calls, mode=mode, workers=args.workers
+                    )
+                    serial = serial or elapsed
+                    print(f"{case:>5} {mode:>8} {elapsed:>8.3f} {serial / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
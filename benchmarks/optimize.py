@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Calls of petuh-functions from string bodies with ``using(optimize=...)`` off and on.
+
+Run from the repository root: ``python benchmarks/optimize.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime  # noqa: E402
+
+SOURCE = '''
+from petuhlang import build
+build.using(optimize={optimize}) >> "petuhlang"
+
+function >> helper(arg("x")) ["return x"]
+function >> calls(arg("n")) ["""
+total = 0
+for i in range(n):
+    total += helper(i) + helper(i) + helper(i)
+return total
+"""]
+function >> rebinds(arg("n")) ["""
+total = 0
+for i in range(n):
+    rebind("last", i)
+    total += helper(i) + helper(i) + helper(i)
+return total
+"""]
+'''
+CASES = ("calls", "rebinds")
+
+
+def measure(optimize: bool, /, *, calls: int, repeat: int) -> dict[str, float]:
+    """Returns the best time of `repeat` runs of every case."""
+    results: dict[str, float] = {}
+    with Runtime() as runtime:
+        runtime.bind("rebind", runtime.bind)
+        runtime.run_source(SOURCE.format(optimize=optimize))
+        for case in CASES:
+            fn = runtime.namespace[case]
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn(calls)
+                best = min(best, time.perf_counter() - start)
+            results[case] = best
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300_000, help="loop iterations")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    off = measure(False, calls=args.calls, repeat=args.repeat)
+    on = measure(True, calls=args.calls, repeat=args.repeat)
+    print(f"{'case':>8} {'off, s':>8} {'on, s':>8} {'speedup':>8}")
+    for case in CASES:
+        print(f"{case:>8} {off[case]:>8.3f} {on[case]:>8.3f} {off[case] / on[case]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Serial and parallel :func:`petuhlang.build.preload` of a generated tree of modules.
+
+Run from the repository root: ``python benchmarks/preload.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Every run parses the modules, the parse cache isn't read or written.
+os.environ["PETUHLANG_NO_CACHE"] = "1"
+
+from petuhlang import _parser  # noqa: E402
+from petuhlang._preload import preload  # noqa: E402
+
+
+def generate_tree(root: str, /, *, modules: int, definitions: int) -> None:
+    """Writing `modules` petuhlang modules (10 per package) with `definitions` each."""
+    for number in range(modules):
+        package = os.path.join(root, f"package{number // 10}")
+        os.makedirs(package, exist_ok=True)
+        lines = ["from petuhlang import build", 'build.using >> "petuhlang"', ""]
+        for i in range(definitions):
+            lines.append(
+                f'function >> f{number}_{i}(arg("x") >> int, kwarg("y", value={i})) '
+                '["return x + y"]'
+            )
+            lines.extend(f"value_{j} = compute(value_{i}, [{j}, {j}])" for j in range(10))
+        with open(os.path.join(package, f"module{number}.py"), "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+def measure(root: str, /, *, workers: int, repeat: int) -> float:
+    """Returns the best time of `repeat` preloads (nothing is parsed before)."""
+    best = float("inf")
+    for _ in range(repeat):
+        _parser.__parsed_modules__.clear()
+        start = time.perf_counter()
+        preload([root], workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--definitions", type=int, default=200, help="per module")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_tree(root, modules=args.modules, definitions=args.definitions)
+        serial = measure(root, workers=1, repeat=args.repeat)
+        print(f"{'workers':>8} {'time, s':>8} {'speedup':>8}")
+        print(f"{1:>8} {serial:>8.3f} {1:>8.2f}")
+        for workers in sorted(set(args.workers) - {1}):
+            elapsed = measure(root, workers=workers, repeat=args.repeat)
+            print(f"{workers:>8} {elapsed:>8.3f} {serial / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
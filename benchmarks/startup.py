@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Startup of ``using >> "petuhlang"`` with eager and lazy placeholders.
+
+Only the `using` statement is timed, the module is a file whose parse
+result comes from the parse cache (like every run after the first one).
+
+Run from the repository root: ``python benchmarks/startup.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime, _parser  # noqa: E402
+
+# A few definitions run at startup, the rest only when they are needed.
+TEMPLATE = """
+from petuhlang import build
+started = clock()
+build.using(lazy={lazy}) >> "petuhlang"
+elapsed = clock() - started
+
+{startup}
+if later:
+{rest}
+"""
+STARTUP_DEFINITIONS = 10
+
+
+def generate_source(definitions: int, /, *, lazy: bool) -> str:
+    """Source with `definitions` petuh-functions and petuh-classes."""
+    lines = [
+        f'function >> f{i}(arg("x"), kwarg("y", value={i})) ["return x + y"]'
+        if i % 10
+        else f"pyclass >> C{i}()"
+        for i in range(definitions)
+    ]
+    return TEMPLATE.format(
+        lazy=lazy,
+        startup="\n".join(lines[:STARTUP_DEFINITIONS]),
+        rest="\n".join(f"    {line}" for line in lines[STARTUP_DEFINITIONS:]),
+    )
+
+
+def measure(source: str, /, *, repeat: int) -> float:
+    """Returns the best time of `using` of `repeat` runs in fresh runtimes."""
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "script.py")
+        with open(filename, "w") as file:
+            file.write(source)
+
+        for _ in range(repeat + 1):
+            # Parsed modules are remembered per process, the disk cache is used.
+            _parser.__parsed_modules__.clear()
+            with Runtime() as runtime:
+                runtime.bind_many({"later": False, "clock": time.perf_counter}.items())
+                elapsed = runtime.run(filename)["elapsed"]
+            best = min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'definitions':>12} {'eager, ms':>10} {'lazy, ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        eager = measure(generate_source(size, lazy=False), repeat=args.repeat)
+        lazy = measure(generate_source(size, lazy=True), repeat=args.repeat)
+        print(
+            f"{size:>12} {eager * 1e3:>10.2f} {lazy * 1e3:>10.2f} {eager / lazy:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
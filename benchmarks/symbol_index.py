@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Scaling of :func:`petuhlang._parser.build_symbol_index` (1k-100k definitions).
+
+Run from the repository root: ``python benchmarks/symbol_index.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang._parser import build_symbol_index  # noqa: E402
+
+
+def generate_source(definitions: int, /, *, filler: int = 0) -> str:
+    """Source with `definitions` petuh-definitions and `filler` python lines after each."""
+    lines = ["from petuhlang import build", 'build.using >> "petuhlang"', ""]
+    for i in range(definitions):
+        if i % 10 == 0:
+            lines.append(f"class Holder{i}:\n    def method(self):\n        return {i}\n")
+        lines.append(
+            f'function >> f{i}(arg("x") >> int, kwarg("y", value={i})) ["return x + y"]'
+        )
+        lines.append(f"print(f{i}(1))  # function >> not_a_definition{i}")
+        lines.extend(f"value_{j} = compute(value_{i}, [{j}, {j}])" for j in range(filler))
+    return "\n".join(lines) + "\n"
+
+
+def measure(source: str, /, *, repeat: int) -> float:
+    """Returns the best time of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_symbol_index(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument(
+        "--filler", type=int, default=10, help="python lines after every definition"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'definitions':>12} {'filler':>7} {'size, KiB':>10} {'time, s':>9} {'us/def':>8}")
+    for filler in sorted({0, args.filler}):
+        for size in args.sizes:
+            source = generate_source(size, filler=filler)
+            assert len(build_symbol_index(source).symbols) == size
+            elapsed = measure(source, repeat=args.repeat)
+            print(
+                f"{size:>12} {filler:>7} {len(source) // 1024:>10} "
+                f"{elapsed:>9.3f} {elapsed / size * 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Peak RSS and time to the first line of a ``then`` block printing many lines to a pipe.
+
+"streaming" is :class:`petuhlang.utils.StreamingInterceptor` (used by
+``then``), "buffered" is :class:`petuhlang.utils.OutputInterceptor` with the
+output printed after the block (how ``then`` worked before).
+
+Run from the repository root: ``python benchmarks/then_output.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, resource
+from petuhlang.utils import OutputInterceptor, StreamingInterceptor
+
+lines, mode = int(sys.argv[1]), sys.argv[2]
+line = "x" * 100
+if mode == "streaming":
+    with StreamingInterceptor():
+        for _ in range(lines):
+            print(line)
+else:
+    with OutputInterceptor() as output:
+        for _ in range(lines):
+            print(line)
+    for captured in output:
+        print(captured)
+sys.stdout.flush()
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+"""
+MODES = ("streaming", "buffered")
+
+
+def measure(mode: str, /, *, lines: int) -> tuple[float, float, int]:
+    """Returns the time to the first line, the total time and the peak RSS (KiB)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", CHILD, str(lines), mode],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    assert process.stdout is not None
+    process.stdout.read(1)
+    first = time.perf_counter() - start
+    while process.stdout.read(1 << 16):
+        pass
+    rss = int(process.communicate()[1])
+    return first, time.perf_counter() - start, rss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'lines':>9} {'mode':>10} {'first, s':>9} {'total, s':>9} {'peak RSS, MiB':>14}")
+    for lines in args.lines:
+        for mode in MODES:
+            first, total, rss = measure(mode, lines=lines)
+            print(f"{lines:>9} {mode:>10} {first:>9.3f} {total:>9.3f} {rss / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
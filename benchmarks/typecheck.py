@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Call overhead of the typecheck modes (``using(typecheck=...)``): off, check and coerce.
+
+Run from the repository root: ``python benchmarks/typecheck.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from petuhlang import Runtime  # noqa: E402
+
+SOURCE = '''
+from petuhlang import build
+build.using >> "petuhlang"
+
+function >> add(arg("x") >> int, arg("y") >> int, kwarg("z", value=0) >> int) ["return x + y + z"]
+'''
+MODES = ("off", "check", "coerce")
+
+
+def measure(fn, args: tuple, /, *, calls: int, repeat: int) -> float:
+    """Returns the best time of one call (of `repeat` runs of `calls` calls)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = measure(
+        lambda x, y, z=0: x + y + z, (1, 2), calls=args.calls, repeat=args.repeat
+    )
+    print(f"{'mode':>16} {'ns/call':>9} {'overhead':>9}")
+    print(f"{'python':>16} {baseline * 1e9:>9.0f} {'':>9}")
+
+    cases = [(mode, (1, 2, 3)) for mode in MODES]
+    # Arguments which are converted by the coerce prologue.
+    cases.append(("coerce, strings", ("1", "2", "3")))
+    for name, call_args in cases:
+        with Runtime() as runtime:
+            runtime.typecheck = name.split(",")[0]
+            runtime.run_source(SOURCE)
+            add = runtime.namespace["add"]
+            assert add(*call_args) == 6
+            elapsed = measure(add, call_args, calls=args.calls, repeat=args.repeat)
+        print(f"{name:>16} {elapsed * 1e9:>9.0f} {elapsed / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
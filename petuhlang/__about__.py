@@ -24,3 +24,4 @@ __author__ = "DenyS"
 __license__ = "MIT"
 __title__ = "petuhlang"
 __description__ = "Python???"
+__version__ = "1.0.0"
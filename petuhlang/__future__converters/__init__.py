@@ -24,4 +24,4 @@ from .impl import *
 from .abstract import *
 
 
-__all__: tuple[str, ...] = ("BaseConverter", "ConverterABC")
+__all__: tuple[str, ...] = ("BaseConverter", "ConverterABC", "get_converter")
@@ -25,7 +25,6 @@ from __future__ import annotations
 import typing
 import contextlib
 
-from petuhlang import __pfuture__
 from .abstract import ConverterABC
 
 if typing.TYPE_CHECKING:
@@ -37,28 +36,31 @@ if typing.TYPE_CHECKING:
     ConvertersType = dict[collections.abc.Hashable, typing.Type[ConverterT]]
 
 
-__all__: tuple[str, ...] = ("BaseConverter",)
+__all__: tuple[str, ...] = ("BaseConverter", "get_converter")
 
 
-def _find_converter(type_: type, /) -> MaybeNone[ConverterT]:
-    """
-    !!! note:
-        This is a Future object that will be relevant in
-        future versions of petuhlang. There is no point
-        in using it right now.
-    """
+def _find_converter(type_: type, /) -> MaybeNone[typing.Type[ConverterT]]:
+    """Returns registered converter class for the type."""
     for types in __converters__.keys():
         if type_ in types or type_ is types:
             return __converters__[types]
 
 
-class BaseConverter(ConverterABC):
-    """
-    !!! note:
-        This is a Future object that will be relevant in
-        future versions of petuhlang. There is no point
-        in using it right now.
+def get_converter(type_: type, /) -> MaybeNone[ConverterABC]:
+    """``function``
+
+    Returns converter to the type from the converter registry.
+
+    type_: :class:`type` [Positional-only]
+        Type to convert values to.
     """
+    if (converter := _find_converter(type_)) is None:
+        return None
+    return converter(type=type_)
+
+
+class BaseConverter(ConverterABC):
+    """Converting the value by calling the type (None if it's impossible)."""
 
     def __init__(self, *, type: type) -> None:
         self.__type = type
@@ -70,9 +72,4 @@ class BaseConverter(ConverterABC):
             return self.__type(argument)
 
 
-BaseConverter = (
-    __pfuture__.FunctionArgumentConverter
-)  # TODO: PRE-ALPHA-1.5.0, IMPL IN-2.0.0
-
-
 __converters__: ConvertersType = {(str, int, bool, dict, list): BaseConverter}
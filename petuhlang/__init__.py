@@ -20,4 +20,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import typing
+
 from .objects import PetuhObject, with_convert
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Importing runtimes only when they are used."""
+    if name == "Runtime":
+        from .runtime import Runtime
+
+        return Runtime
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
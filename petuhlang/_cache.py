@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""On-disk caches of parsed petuhlang files and compiled functions (like __pycache__)."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import atexit
+import types
+import pickle
+import typing
+import hashlib
+import marshal
+import tempfile
+import threading
+import collections
+import dataclasses
+
+from petuhlang.__about__ import __version__
+
+if typing.TYPE_CHECKING:
+    from ._dataclasses import SymbolIndex
+    from .types import MaybeNone
+
+    ParserType = typing.Callable[[str], SymbolIndex]
+
+
+__all__: tuple[str, ...] = (
+    "ParseCache",
+    "parse_cache",
+    "CodeCache",
+    "CodeCacheStats",
+    "code_cache",
+    "CACHE_DIRNAME",
+    "PERSIST_DIRNAME",
+)
+
+
+CACHE_DIRNAME: typing.Final[str] = "__petuhcache__"
+# Databases of `persist` are not cache entries, eviction never looks into it.
+PERSIST_DIRNAME: typing.Final[str] = os.path.join(CACHE_DIRNAME, "persist")
+_CACHE_SUFFIX: typing.Final[str] = f".petuh-{__version__}.pickle"
+# Code compiled with `python -O` has no asserts, stores are separate like `opt-N.pyc`.
+_CODE_SUFFIX: typing.Final[str] = (
+    f".{sys.implementation.cache_tag}"
+    f"{f'.opt-{sys.flags.optimize}' if sys.flags.optimize else ''}"
+    f".petuh-{__version__}.petuhc"
+)
+_DEFAULT_MAX_SIZE: typing.Final[int] = 16 * 1024 * 1024
+
+
+def _cache_disabled_by_env() -> bool:
+    return bool(os.environ.get("PETUHLANG_NO_CACHE"))
+
+
+def _cache_directory(filename: str, /) -> str:
+    """Returns the cache directory for the source file."""
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIRNAME)
+
+
+def _atomic_write(filename: str, data: bytes, /) -> None:
+    """``function``
+
+    Writing data to a temporary file and replacing the target with it.
+
+    filename: :class:`str` [Positional-only]
+        Target file.
+
+    data: :class:`bytes` [Positional-only]
+        Data to write.
+    """
+    # Unique per writer: threads of one process may store the same entry at once.
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(filename), prefix=".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary, filename)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def _store(filename: str, data: bytes, /, *, max_size: int) -> None:
+    """Writing the cache entry and keeping its directory under the size bound."""
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        _atomic_write(filename, data)
+    except OSError:
+        # Read-only location, caching is just skipped (like __pycache__).
+        return
+
+    _evict(os.path.dirname(filename), max_size=max_size)
+
+
+def _cache_entries(
+    cache_directory: str, /, *, suffix: str | tuple[str, ...]
+) -> list[os.DirEntry]:
+    try:
+        with os.scandir(cache_directory) as entries:
+            return [
+                e
+                for e in entries
+                if e.name.endswith(suffix) and e.is_file()
+            ]
+    except OSError:
+        return []
+
+
+def _evict(cache_directory: str, /, *, max_size: int) -> None:
+    """Removing the least recently written entries until the size fits.
+
+    Only parse and code cache entries are counted, other files in the
+    directory are left alone.
+    """
+    entries = []
+    suffixes = (_CACHE_SUFFIX, _CODE_SUFFIX)
+    for entry in _cache_entries(cache_directory, suffix=suffixes):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+
+
+class ParseCache:
+    """Cache of symbol indexes keyed by path, size, mtime and content hash.
+
+    Can be disabled with ``parse_cache.enabled = False`` or by setting
+    the ``PETUHLANG_NO_CACHE`` environment variable.
+    """
+
+    def __init__(self, *, max_size: int = _DEFAULT_MAX_SIZE) -> None:
+        self.enabled = not _cache_disabled_by_env()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} enabled={self.enabled} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    @staticmethod
+    def cache_filename(filename: str, /) -> str:
+        """Returns the cache entry filename for the source file."""
+        name = os.path.splitext(os.path.basename(filename))[0]
+        return os.path.join(_cache_directory(filename), name + _CACHE_SUFFIX)
+
+    def parse(self, filename: str, /, *, parser: ParserType) -> SymbolIndex:
+        """``method``
+
+        Returns the cached symbol index or parses the file and stores the result.
+
+        filename: :class:`str` [Positional-only]
+            Source file.
+
+        parser: :class:`typing.Callable[[str], SymbolIndex]` [Keyword-only]
+            Parser called on cache miss.
+        """
+        with open(filename, "rb") as file:
+            source = file.read()
+            stat = os.fstat(file.fileno())
+
+        if not self.enabled:
+            return parser(source.decode("utf-8"))
+
+        key = (
+            os.path.abspath(filename),
+            stat.st_size,
+            stat.st_mtime_ns,
+            hashlib.sha256(source).hexdigest(),
+            __version__,
+        )
+        cache_filename = self.cache_filename(filename)
+        if (index := self.__load(cache_filename, key)) is not None:
+            self.hits += 1
+            return index
+
+        self.misses += 1
+        index = parser(source.decode("utf-8"))
+        _store(
+            cache_filename,
+            pickle.dumps((key, index), protocol=pickle.HIGHEST_PROTOCOL),
+            max_size=self.max_size,
+        )
+        return index
+
+    def clear(self, directory: str, /) -> None:
+        """Removes all parse cache entries of the source directory."""
+        cache_directory = os.path.join(directory, CACHE_DIRNAME)
+        for entry in _cache_entries(cache_directory, suffix=_CACHE_SUFFIX):
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def __load(self, cache_filename: str, key: tuple, /) -> SymbolIndex | None:
+        try:
+            with open(cache_filename, "rb") as file:
+                stored_key, index = pickle.load(file)
+        except Exception:
+            # Missing, truncated or corrupt entry (unpickling it can raise almost
+            # anything), or one written by an incompatible petuhlang version.
+            return None
+
+        return index if stored_key == key else None
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CodeCacheStats:
+    """Code cache counters."""
+
+    hits: int
+    disk_hits: int
+    misses: int
+    compile_time_saved: float
+
+
+@dataclasses.dataclass(kw_only=True)
+class _CodeStore:
+    """Compiled functions of one source file, saved as a single marshal file."""
+
+    entries: dict[str, tuple[float, types.CodeType]]
+    used: dict[str, tuple[float, types.CodeType]] = dataclasses.field(
+        default_factory=dict
+    )
+    dirty: bool = False
+
+
+class CodeCache:
+    """Cache of compiled function code: in-memory LRU plus marshal files on disk.
+
+    Entries are keyed by the hash of the function source (name, arguments
+    and body), and invalidated by python and petuhlang versions. Functions
+    of one source file share one store, it's loaded on first use and saved
+    at exit (or by :meth:`save`) with the functions used by the run. Can be
+    disabled with ``code_cache.enabled = False`` or by setting
+    the ``PETUHLANG_NO_CACHE`` environment variable.
+    """
+
+    def __init__(
+        self, *, maxsize: int = 1024, max_size: int = _DEFAULT_MAX_SIZE
+    ) -> None:
+        self.enabled = not _cache_disabled_by_env()
+        self.maxsize = maxsize
+        self.max_size = max_size
+        self.__memory: collections.OrderedDict[
+            str, tuple[types.CodeType, float]
+        ] = collections.OrderedDict()
+        self.__stores: dict[str, _CodeStore] = {}
+        self.__save_registered = False
+        # Scripts may run in several runtimes (threads) at once.
+        self.__lock = threading.RLock()
+        self.__hits = self.__disk_hits = self.__misses = 0
+        self.__saved = 0.0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} enabled={self.enabled} {self.stats()}>"
+
+    def stats(self) -> CodeCacheStats:
+        """Returns cache counters and the compile time saved (in seconds)."""
+        return CodeCacheStats(
+            hits=self.__hits,
+            disk_hits=self.__disk_hits,
+            misses=self.__misses,
+            compile_time_saved=self.__saved,
+        )
+
+    def clear(self) -> None:
+        """Clearing the in-memory cache, unsaved stores and counters."""
+        with self.__lock:
+            self.__memory.clear()
+            self.__stores.clear()
+            self.__hits = self.__disk_hits = self.__misses = 0
+            self.__saved = 0.0
+
+    @staticmethod
+    def cache_filename(filename: str, /) -> str:
+        """Returns the store filename for the source file."""
+        name = os.path.splitext(os.path.basename(filename))[0]
+        return os.path.join(_cache_directory(filename), name + _CODE_SUFFIX)
+
+    def compile(
+        self, source: str, /, *, filename: MaybeNone[str] = None
+    ) -> types.CodeType:
+        """``method``
+
+        Returns the code object of the source, compiling it only on cache miss.
+
+        source: :class:`str` [Positional-only]
+            Function source.
+
+        filename: :class:`MaybeNone[str]` = None [Keyword-only]
+            File where the function is defined, the disk cache is used
+            next to it (only in-memory cache is used if None).
+        """
+        if not self.enabled:
+            return compile(source, "<string>", "exec")
+
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        store = None
+        if filename is not None and os.path.isfile(filename):
+            store = self.__store(filename)
+
+        with self.__lock:
+            if (entry := self.__memory.get(key)) is not None:
+                self.__memory.move_to_end(key)
+                self.__hits += 1
+                self.__saved += entry[1]
+                if store is not None:
+                    self.__use(store, key, entry)
+                return entry[0]
+
+            if store is not None and (stored := store.entries.get(key)) is not None:
+                entry = (stored[1], stored[0])
+                self.__disk_hits += 1
+                self.__saved += entry[1]
+                self.__remember(key, entry)
+                self.__use(store, key, entry)
+                return entry[0]
+
+            self.__misses += 1
+
+        # Compiled without the lock, other threads don't wait for it.
+        started = time.perf_counter()
+        code = compile(source, "<string>", "exec")
+        entry = (code, time.perf_counter() - started)
+        with self.__lock:
+            self.__remember(key, entry)
+            if store is not None:
+                self.__use(store, key, entry)
+        return code
+
+    def save(self) -> None:
+        """Writing the stores with new functions (called at exit)."""
+        with self.__lock:
+            dirty = [
+                (cache_filename, marshal.dumps(store.used))
+                for cache_filename, store in self.__stores.items()
+                if store.dirty
+            ]
+            for cache_filename, _ in dirty:
+                self.__stores[cache_filename].dirty = False
+
+        for cache_filename, data in dirty:
+            # Only functions used by this run, removed ones don't pile up.
+            _store(cache_filename, data, max_size=self.max_size)
+
+    def __store(self, filename: str, /) -> _CodeStore:
+        cache_filename = self.cache_filename(filename)
+        with self.__lock:
+            if (store := self.__stores.get(cache_filename)) is None:
+                store = self.__stores[cache_filename] = _CodeStore(
+                    entries=self.__load(cache_filename)
+                )
+                if not self.__save_registered:
+                    self.__save_registered = True
+                    atexit.register(self.save)
+            return store
+
+    @staticmethod
+    def __use(
+        store: _CodeStore, key: str, entry: tuple[types.CodeType, float], /
+    ) -> None:
+        if key not in store.used:
+            store.used[key] = (entry[1], entry[0])
+            if key not in store.entries:
+                store.dirty = True
+
+    def __remember(self, key: str, entry: tuple[types.CodeType, float], /) -> None:
+        self.__memory[key] = entry
+        if len(self.__memory) > self.maxsize:
+            self.__memory.popitem(last=False)
+
+    def __load(self, cache_filename: str, /) -> dict[str, tuple[float, types.CodeType]]:
+        try:
+            with open(cache_filename, "rb") as file:
+                entries = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+
+parse_cache = ParseCache()
+code_cache = CodeCache()
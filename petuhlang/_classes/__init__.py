@@ -20,7 +20,17 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .impl import *
+import typing
 
 
 __all__: tuple[str, ...] = ("PetuhClass",)
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Importing the classes implementation only when it is used."""
+    if name == "PetuhClass":
+        from .impl import PetuhClass
+
+        return PetuhClass
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
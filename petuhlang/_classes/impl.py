@@ -23,10 +23,12 @@
 
 from __future__ import annotations
 
-import sys
 import typing
+import copyreg
+import functools
 
 from petuhlang import PetuhObject, errors
+from petuhlang.runtime import get_current_runtime
 
 if typing.TYPE_CHECKING:
     from petuhlang.types import ArgsType, KwargsType, MaybeNone
@@ -34,9 +36,15 @@ if typing.TYPE_CHECKING:
     ClsParents = typing.Sequence[type, ...] | type
 
 
-__all__: tuple[str, ...] = ("PetuhClass",)
+__all__: tuple[str, ...] = ("PetuhClass", "PetuhClassType")
 
-global_ = sys.modules["builtins"].__dict__
+# Runtime registry of petuh-classes created or unpickled in it, keyed by
+# their definitions (classes of other runtimes are different classes).
+_REGISTRY: typing.Final[str] = "petuh-classes"
+
+
+class PetuhClassType(type):
+    """Metaclass of petuh-classes, they are pickled by definition (name and bases)."""
 
 
 def _check_cls_parents(cls_name: str, /, *, parents: ClsParents) -> None:
@@ -52,7 +60,7 @@ def _check_cls_parents(cls_name: str, /, *, parents: ClsParents) -> None:
 
 def _create_instance(cls, *args: ArgsType, bindTo: str, **kwargs: KwargsType):
     """Body for classmethod."""
-    global_[bindTo] = (instance := cls(*args, **kwargs))
+    get_current_runtime().bind(bindTo, instance := cls(*args, **kwargs))
     return instance
 
 
@@ -63,6 +71,52 @@ def _concatenate_bases(other: tuple[type, ...] | type) -> tuple[type, ...]:
     return (PetuhObject,) + other
 
 
+def _reduce_class(cls: PetuhClassType) -> tuple[typing.Any, ...]:
+    return _load_class, (cls.__name__, cls.__bases__)
+
+
+copyreg.pickle(PetuhClassType, _reduce_class)
+
+
+@functools.cache
+def _derived_metaclass(meta: type, /) -> type:
+    """Metaclass for petuh-classes extending classes with their own metaclass."""
+    derived = type(f"Petuh{meta.__name__}", (PetuhClassType, meta), {})
+    # `copyreg` reducers are looked up by the exact type.
+    copyreg.pickle(derived, _reduce_class)
+    return derived
+
+
+def _create_class(cls_name: str, bases: tuple[type, ...], /) -> type:
+    meta = type
+    for base in bases:
+        if issubclass(type(base), meta):
+            meta = type(base)
+
+    if not issubclass(meta, PetuhClassType):
+        meta = PetuhClassType if meta is type else _derived_metaclass(meta)
+
+    cls = meta(
+        cls_name,
+        bases,
+        {
+            "createInstance": classmethod(_create_instance),
+            "__init__": lambda self_, *args, **kwargs: None,
+        },
+    )
+    get_current_runtime().registry(_REGISTRY)[(cls_name, bases)] = cls
+    return cls
+
+
+def _load_class(cls_name: str, bases: tuple[type, ...], /) -> type:
+    """Returns the unpickled petuh-class, it's created once per runtime."""
+    registry = get_current_runtime().registry(_REGISTRY)
+    if (cls := registry.get((cls_name, bases))) is None:
+        cls = _create_class(cls_name, bases)
+        get_current_runtime().bind(cls_name, cls)
+    return cls
+
+
 class PetuhClass(PetuhObject):
     def __init__(self, cls_name: str, /) -> None:
         self.__cls_name__ = cls_name
@@ -74,14 +128,7 @@ class PetuhClass(PetuhObject):
         else:
             bases = (PetuhObject,)
 
-        cls = type(
-            self.__cls_name__,
-            bases,
-            {
-                "createInstance": classmethod(_create_instance),
-                "__init__": lambda self_, *args, **kwargs: None,
-            },
-        )
-        global_[self.__cls_name__] = cls
+        cls = _create_class(self.__cls_name__, bases)
+        get_current_runtime().bind(self.__cls_name__, cls)
 
         return cls
@@ -21,13 +21,76 @@
 # SOFTWARE.
 """Base dataclasses in petuhlang."""
 
+from __future__ import annotations
+
 import dataclasses
 
 
-__all__: tuple[str, ...] = ("ParsedFileContainer",)
+__all__: tuple[str, ...] = (
+    "ParsedFileContainer",
+    "SymbolIndex",
+    "Symbol",
+    "SymbolSpan",
+    "ArgumentSpec",
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class SymbolSpan:
+    """Position of the definition in the source (lines are 1-based, columns 0-based)."""
+
+    line: int
+    column: int
+    end_line: int
+    end_column: int
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ArgumentSpec:
+    """``arg(...)`` or ``kwarg(...)`` found in the definition."""
+
+    kind: str
+    name: str
+    annotation: str | None = None
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Symbol:
+    """Petuh-function or petuh-class definition."""
+
+    name: str
+    category: str
+    span: SymbolSpan
+    arguments: tuple[ArgumentSpec, ...] = ()
+    scope: tuple[str, ...] = ()
+
+
+@dataclasses.dataclass(kw_only=True)
+class SymbolIndex:
+    """All definitions found in the source, in order of appearance."""
+
+    symbols: list[Symbol] = dataclasses.field(default_factory=list)
+
+    def by_category(self, category: str, /) -> list[Symbol]:
+        """Returns all symbols of the certain category."""
+        return [symbol for symbol in self.symbols if symbol.category == category]
+
+    def names(self, category: str, /) -> list[str]:
+        """Returns unique names of the certain category."""
+        return list(dict.fromkeys(s.name for s in self.symbols if s.category == category))
 
 
 @dataclasses.dataclass(kw_only=True)
 class ParsedFileContainer:
     functions: list[str]
     classes: list[str]
+    async_functions: list[str] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_index(cls, index: SymbolIndex, /) -> ParsedFileContainer:
+        """Builds container from the symbol index."""
+        return cls(
+            functions=index.names("functions"),
+            classes=index.names("classes"),
+            async_functions=index.names("async_functions"),
+        )
@@ -20,8 +20,19 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .impl import *
+import typing
+
 from .arguments import *
 
 
 __all__: tuple[str, ...] = ("PetuhFunction", "Arg", "Kwarg")
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Importing the functions implementation only when it is used."""
+    if name == "PetuhFunction":
+        from .impl import PetuhFunction
+
+        return PetuhFunction
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
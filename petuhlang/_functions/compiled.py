@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compiled petuh-functions: batch calls and rebuilding in worker processes."""
+
+from __future__ import annotations
+
+import types
+import pickle
+import typing
+import inspect
+import itertools
+import functools
+import contextvars
+import collections
+import dataclasses
+import collections.abc
+
+from petuhlang import errors
+
+if typing.TYPE_CHECKING:
+    import concurrent.futures
+
+    from petuhlang.types import MaybeNone
+
+    from .arguments import Arg, Kwarg
+
+    MapMode = typing.Literal["thread", "process"]
+    Chunk = list[typing.Any]
+    Task = tuple[typing.Callable[..., list[typing.Any]], ...]
+
+
+__all__: tuple[str, ...] = (
+    "PetuhCompiledFunction",
+    "FunctionDefinition",
+    "BoundDefinition",
+    "dump_definitions",
+    "load_definitions",
+)
+
+
+MAP_MODES: typing.Final[frozenset[str]] = frozenset({"thread", "process"})
+# Chunks submitted ahead per worker, the rest of the iterable isn't read yet.
+_IN_FLIGHT_PER_WORKER: typing.Final[int] = 2
+# Chunks per worker when the chunk size is computed from the iterable length.
+_CHUNKS_PER_WORKER: typing.Final[int] = 4
+
+# Runtime registry of functions dumped or rebuilt in it, keyed by their
+# pickled definitions (same definitions in other runtimes are other functions).
+_REGISTRY: typing.Final[str] = "rebuilt-functions"
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class FunctionDefinition:
+    """Everything needed to compile the petuh-function again."""
+
+    name: str
+    args: tuple[Arg | Kwarg, ...]
+    body: str
+    is_async: bool = False
+    typecheck: str = "off"
+    optimize: bool = False
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class BoundDefinition:
+    """Constant-bodied function or petuh-class, pickled as it is and bound again."""
+
+    name: str
+    value: typing.Any
+
+
+class PetuhCompiledFunction(functools.partial):
+    """Petuh-function compiled from the string body."""
+
+    def __new__(
+        cls, fn: types.FunctionType, /, *, definition: FunctionDefinition
+    ) -> PetuhCompiledFunction:
+        self = super().__new__(cls, fn)
+        functools.update_wrapper(self, fn)
+        self.__petuh_definition__ = definition
+        return self
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.__name__}>"
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        # Pickled by definition, the function exists only in the runtime namespace.
+        return load_definitions, (dump_definitions(self),)
+
+    def __getattr__(self, item: str) -> typing.Any:
+        # `__code__`, `__defaults__`, ... of the compiled function.
+        return getattr(self.func, item)
+
+    def __get__(
+        self, instance: typing.Any, owner: MaybeNone[type] = None
+    ) -> typing.Any:
+        # Bound like plain functions when used as class attributes.
+        return self if instance is None else types.MethodType(self, instance)
+
+    def map(
+        self,
+        iterable: typing.Iterable[typing.Any],
+        /,
+        *,
+        workers: int = 8,
+        mode: MapMode = "thread",
+        chunksize: MaybeNone[int] = None,
+    ) -> typing.Iterator[typing.Any]:
+        """``method``
+
+        Calling the function with every item of the iterable in a pool,
+        results are yielded in order as soon as they are ready. Only
+        ``workers * 2`` chunks are in flight, so the iterable may be
+        infinite.
+
+        iterable: :class:`typing.Iterable[typing.Any]` [Positional-only]
+            Function arguments.
+
+        workers: :class:`int` = 8 [Keyword-only]
+            Number of threads or processes.
+
+        mode: :class:`typing.Literal["thread", "process"]` = "thread" [Keyword-only]
+            Pool type, "process" for CPU-bound bodies. Worker processes compile
+            the function (and petuh-functions it calls) from its definition,
+            constant-bodied functions and petuh-classes it uses are pickled.
+            Other names of the runtime (e.g. instances) must exist in workers.
+
+        chunksize: :class:`MaybeNone[int]` = None [Keyword-only]
+            Items sent to a worker at once, by default computed from the
+            iterable length (1 for iterables without length).
+        """
+        if mode not in MAP_MODES:
+            raise ValueError(f"mode must be one of {sorted(MAP_MODES)}, got {mode!r}")
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if inspect.iscoroutinefunction(self.func):
+            raise errors.UnsupportedFunctionError(
+                "map can't be applied to async petuh-functions"
+            )
+
+        import concurrent.futures
+
+        chunks = _chunked(iterable, chunksize or _default_chunksize(iterable, workers))
+        if mode == "thread":
+            fn = self.func
+            return _stream(
+                concurrent.futures.ThreadPoolExecutor,
+                lambda chunk: (contextvars.copy_context().run, _call_chunk, fn, chunk),
+                chunks,
+                workers=workers,
+            )
+
+        payload = dump_definitions(self)
+        return _stream(
+            concurrent.futures.ProcessPoolExecutor,
+            lambda chunk: (_call_rebuilt_chunk, payload, chunk),
+            chunks,
+            workers=workers,
+        )
+
+
+def _default_chunksize(iterable: typing.Iterable[typing.Any], workers: int, /) -> int:
+    if isinstance(iterable, collections.abc.Sized):
+        return max(1, -(-len(iterable) // (workers * _CHUNKS_PER_WORKER)))
+    return 1
+
+
+def _chunked(
+    iterable: typing.Iterable[typing.Any], size: int, /
+) -> typing.Iterator[Chunk]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _call_chunk(fn: typing.Callable[..., typing.Any], chunk: Chunk, /) -> Chunk:
+    return [fn(item) for item in chunk]
+
+
+def _call_rebuilt_chunk(payload: bytes, chunk: Chunk, /) -> Chunk:
+    return _call_chunk(load_definitions(payload), chunk)
+
+
+def _stream(
+    executor_type: type[concurrent.futures.Executor],
+    task: typing.Callable[[Chunk], Task],
+    chunks: typing.Iterator[Chunk],
+    /,
+    *,
+    workers: int,
+) -> typing.Iterator[typing.Any]:
+    """Yielding results of the chunks in order, keeping a bounded number in flight."""
+    with executor_type(max_workers=workers) as executor:
+        pending: collections.deque[concurrent.futures.Future[Chunk]] = collections.deque(
+            executor.submit(*task(chunk))
+            for chunk in itertools.islice(chunks, workers * _IN_FLIGHT_PER_WORKER)
+        )
+        try:
+            while pending:
+                results = pending.popleft().result()
+                if (chunk := next(chunks, None)) is not None:
+                    pending.append(executor.submit(*task(chunk)))
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _collect_definitions(
+    fn: PetuhCompiledFunction, /
+) -> list[FunctionDefinition | BoundDefinition]:
+    """Definitions of the function and petuh-definitions it uses, dependencies first.
+
+    Petuh-functions are compiled again from their definitions, constant-bodied
+    functions and petuh-classes are pickled (unpicklable ones are skipped).
+    """
+    from petuhlang._classes.impl import PetuhClassType
+
+    from .impl import _Callable, _AsyncCallable, _collect_global_names
+
+    found: dict[str, MaybeNone[FunctionDefinition | BoundDefinition]] = {}
+
+    def visit(fn: PetuhCompiledFunction) -> None:
+        name = fn.__petuh_definition__.name
+        if name in found:
+            return
+
+        found[name] = None
+        code = fn.func.__code__
+        # Namespace of the runtime the function is bound into, pickling may
+        # happen in another thread (e.g. the queue feeder of a process pool).
+        namespace = fn.func.__globals__["__builtins__"]
+        for used in sorted(_collect_global_names(code) | set(code.co_freevars)):
+            dependency = inspect.unwrap(
+                namespace.get(used),
+                stop=lambda obj: isinstance(obj, PetuhCompiledFunction),
+            )
+            if isinstance(dependency, PetuhCompiledFunction):
+                visit(dependency)
+            elif used not in found and isinstance(
+                dependency, (_Callable, _AsyncCallable, PetuhClassType)
+            ):
+                try:
+                    pickle.dumps(dependency, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    continue
+                found[used] = BoundDefinition(name=used, value=dependency)
+
+        del found[name]
+        found[name] = fn.__petuh_definition__
+
+    visit(fn)
+    return list(found.values())
+
+
+def dump_definitions(fn: PetuhCompiledFunction, /) -> bytes:
+    """Returns pickled definitions which :func:`load_definitions` compiles again."""
+    from petuhlang.runtime import get_current_runtime
+
+    payload = pickle.dumps(_collect_definitions(fn), protocol=pickle.HIGHEST_PROTOCOL)
+    # Loaded in this runtime (or in forked children) without compiling.
+    get_current_runtime().registry(_REGISTRY).setdefault(payload, fn)
+    return payload
+
+
+def load_definitions(payload: bytes, /) -> PetuhCompiledFunction:
+    """Returns the function compiled from :func:`dump_definitions` (once per runtime)."""
+    from petuhlang.runtime import get_current_runtime
+
+    registry = get_current_runtime().registry(_REGISTRY)
+    if (fn := registry.get(payload)) is None:
+        fn = registry[payload] = _rebuild(pickle.loads(payload))
+    return fn
+
+
+def _rebuild(
+    definitions: list[FunctionDefinition | BoundDefinition], /
+) -> PetuhCompiledFunction:
+    """Compiling the functions in the current runtime (of the worker process)."""
+    from petuhlang.runtime import get_current_runtime
+
+    from .impl import FunctionInner
+
+    runtime = get_current_runtime()
+    if not runtime.is_bound("function"):
+        # Spawned worker, `using >> "petuhlang"` was never executed here.
+        from petuhlang.build import __pbuiltins__
+
+        runtime.bind_many(__pbuiltins__.items())
+
+    for definition in definitions:
+        if isinstance(definition, BoundDefinition):
+            runtime.bind(definition.name, definition.value)
+            continue
+
+        fn = FunctionInner(
+            definition.name, definition.args, is_async=definition.is_async
+        )._compile_from_str(
+            definition.body,
+            typecheck=definition.typecheck,
+            optimize=definition.optimize,
+        )
+
+    return fn
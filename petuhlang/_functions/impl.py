@@ -29,11 +29,17 @@ import typing
 import textwrap
 
 from .arguments import Arg, Kwarg, FnArgBase
-from petuhlang import errors, __pfuture__
+from .compiled import PetuhCompiledFunction, FunctionDefinition
+from .validation import build_validation_prologue
+from petuhlang import errors
+from petuhlang._cache import code_cache
+from petuhlang.runtime import get_current_runtime, Runtime
 from petuhlang.utils import get_memory_location, get_current_filename
 
 if typing.TYPE_CHECKING:
-    from petuhlang.types import ArgsType, KwargsType
+    from petuhlang.types import ArgsType, KwargsType, MaybeNone
+
+    from .validation import TypecheckMode
 
     Arg: FnArgBase
     Kwarg: FnArgBase
@@ -44,17 +50,86 @@ if typing.TYPE_CHECKING:
 
 __all__: tuple[str, ...] = ("PetuhFunction",)
 
-global_ = sys.modules["builtins"].__dict__
+_FACTORY_NAME: typing.Final[str] = "__petuh_factory__"
 
 
 def _build_function_args(args: typing.Sequence[Arg | Kwarg], /) -> str:
-    args = (i.name for i in args if isinstance(i, Arg))
-    kwargs = (f"{i.name}={i.value}" for i in args if isinstance(i, Kwarg))
-    return ", ".join(args) if args else "" + ", " + ", ".join(kwargs) if kwargs else ""
+    """Only names, default values are bound by reference (see `_build_function`)."""
+    return ", ".join(i.name for i in args)
+
+
+def _build_factory_code(*, source: str, free_names: typing.Iterable[str]) -> str:
+    """Wrapping the function source, so the free names become closure variables."""
+    return f"def {_FACTORY_NAME}({', '.join(free_names)}):\n{textwrap.indent(source, '    ')}"
+
+
+def _find_function_code(code: types.CodeType, /, *, name: str) -> types.CodeType:
+    """Returns code of the function (from the module or from the factory)."""
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            if const.co_name == name:
+                return const
+            if const.co_name == _FACTORY_NAME:
+                return _find_function_code(const, name=name)
+
+    raise LookupError(name)
+
+
+def _collect_global_names(code: types.CodeType, /) -> set[str]:
+    """Returns all names (globals and attributes) used by the code and nested code."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _collect_global_names(const)
+    return names
+
+
+def _build_function(
+    code: types.CodeType,
+    /,
+    *,
+    name: str,
+    args: typing.Sequence[Arg | Kwarg],
+    runtime: Runtime,
+    values: MaybeNone[dict[str, typing.Any]] = None,
+) -> types.FunctionType:
+    """``function``
+
+    Creating the function from the compiled `_build_function_code` module
+    without executing it, default values keep their identity.
+
+    code: :class:`types.CodeType` [Positional-only]
+        Compiled module with the function definition.
+
+    name: :class:`str` [Keyword-only]
+        Function name.
+
+    args: :class:`typing.Sequence[Arg | Kwarg]` [Keyword-only]
+        Function arguments.
+
+    runtime: :class:`Runtime` [Keyword-only]
+        Runtime whose globals (and cells for free names) are used.
+
+    values: :class:`MaybeNone[dict[str, typing.Any]]` = None [Keyword-only]
+        Values of the free names which are not bound by the runtime.
+    """
+    function_code = _find_function_code(code, name=name)
+    defaults = tuple(i.value for i in args if isinstance(i, Kwarg))
+    values = values or {}
+    closure = tuple(
+        types.CellType(values[free]) if free in values else runtime.cell(free)
+        for free in function_code.co_freevars
+    )
+    return types.FunctionType(
+        function_code, runtime.globals, name, defaults or None, closure or None
+    )
 
 
-def _build_function_code(*, name: str, args: str, fn_code: str) -> str:
-    return f"def {name}({args}):\n{textwrap.indent(fn_code, '    ')}"
+def _build_function_code(
+    *, name: str, args: str, fn_code: str, is_async: bool = False
+) -> str:
+    prefix = "async def" if is_async else "def"
+    return f"{prefix} {name}({args}):\n{textwrap.indent(fn_code, '    ')}"
 
 
 class _Callable:
@@ -67,52 +142,119 @@ class _Callable:
         return self.__value
 
 
+class _AsyncCallable:
+    """Returning non-callable object as coroutine function."""
+
+    def __init__(self, value: typing.Any) -> None:
+        self.__value = value
+
+    async def __call__(self, *args: ArgsType, **kwargs: KwargsType) -> typing.Any:
+        return self.__value
+
+
 class FunctionInner:
     """Compile function or returning value."""
 
-    def __init__(self, fn_name: str, args: typing.Sequence[Arg | Kwarg]) -> None:
+    def __init__(
+        self,
+        fn_name: str,
+        args: typing.Sequence[Arg | Kwarg],
+        *,
+        is_async: bool = False,
+    ) -> None:
         self.__fn_name__ = fn_name
         self.__fn_args__ = args
+        self.__is_async = is_async
 
-    def __init_args(self, fn: types.FunctionType, /) -> types.FunctionType:
-        for arg in self.__fn_args__:
-            setattr(
-                fn, arg.name, __pfuture__.FunctionInnerArgument
-            )  # TODO: PRE-ALPHA-1.5.0, IMPL IN-2.0.0
-        return fn
+    def _compile_from_str(
+        self,
+        function_code: str,
+        /,
+        *,
+        filename: MaybeNone[str] = None,
+        typecheck: MaybeNone[TypecheckMode] = None,
+        optimize: MaybeNone[bool] = None,
+    ) -> PetuhCompiledFunction:
+        # Modes of the file unless the function is rebuilt from its definition.
+        runtime = get_current_runtime()
+        file_optimize, file_typecheck = runtime.modes(filename)
+        typecheck = file_typecheck if typecheck is None else typecheck
+        optimize = file_optimize if optimize is None else optimize
+        prologue, values = build_validation_prologue(
+            self.__fn_name__, self.__fn_args__, mode=typecheck
+        )
+        source = _build_function_code(
+            name=self.__fn_name__,
+            args=_build_function_args(self.__fn_args__),
+            # Indented triple-quoted bodies must line up with the prologue.
+            fn_code=prologue + textwrap.dedent(function_code),
+            is_async=self.__is_async,
+        )
+        code = code_cache.compile(source, filename=filename)
+
+        free_names = list(values)
+        if optimize:
+            # Names bound by the runtime are resolved once, as closure cells,
+            # instead of missing globals and falling through to builtins.
+            free_names += sorted(
+                name
+                for name in _collect_global_names(
+                    _find_function_code(code, name=self.__fn_name__)
+                )
+                if runtime.is_bound(name) and name != _FACTORY_NAME
+            )
+        if free_names:
+            code = code_cache.compile(
+                _build_factory_code(source=source, free_names=free_names),
+                filename=filename,
+            )
 
-    def __compile_from_str(self, function_code: str) -> types.FunctionType:
-        exec(
-            _build_function_code(
+        fn = _build_function(
+            code,
+            name=self.__fn_name__,
+            args=self.__fn_args__,
+            runtime=runtime,
+            values=values,
+        )
+        fn.__petuh_source__ = source
+        fn = PetuhCompiledFunction(
+            fn,
+            definition=FunctionDefinition(
                 name=self.__fn_name__,
-                args=_build_function_args(self.__fn_args__),
-                fn_code=function_code,
+                args=tuple(self.__fn_args__),
+                body=function_code,
+                is_async=self.__is_async,
+                typecheck=typecheck,
+                optimize=optimize,
             ),
-            globals(),
-            locals(),
         )
-        fn = self.__init_args(eval(f"{self.__fn_name__}"))
-        global_[self.__fn_name__] = fn
+        runtime.bind(self.__fn_name__, fn)
         return fn
 
     def __getitem__(self, function_code: StringOr[typing.Any]):
         if isinstance(function_code, str):
-            return self.__compile_from_str(function_code)
+            return self._compile_from_str(
+                function_code, filename=sys._getframe(1).f_code.co_filename
+            )
         else:
-            global_[self.__fn_name__] = (obj := _Callable(function_code))
+            callable_type = _AsyncCallable if self.__is_async else _Callable
+            get_current_runtime().bind(
+                self.__fn_name__, obj := callable_type(function_code)
+            )
             return obj
 
 
 class PetuhFunction:
     """Preparing function."""
 
-    def __init__(self, fn_name: str, /) -> None:
+    def __init__(self, fn_name: str, /, *, is_async: bool = False) -> None:
         self.__fn_name__ = fn_name
+        self.__is_async = is_async
 
     def __call__(self, *function_args: ArgsType) -> FunctionInner:
         self.__function_arguments = function_args
         self.__check_call_args()
-        return FunctionInner(self.__fn_name__, function_args)
+        return FunctionInner(self.__fn_name__, function_args, is_async=self.__is_async)
 
     def __str__(self):
         return self.__fn_name__
@@ -121,8 +263,16 @@ class PetuhFunction:
         return f"<{self.__class__.__name__} object at {get_memory_location(self)}>"
 
     def __check_call_args(self) -> None:
+        default: MaybeNone[Kwarg] = None
         for arg in self.__function_arguments:
             if not isinstance(arg, (Arg, Kwarg)):
                 raise errors.BadFunctionArgError(
                     f"All function arguments must be instances of the 'arg' or 'kwarg' class, got {type(arg)}"
                 )
+            if isinstance(arg, Kwarg):
+                default = arg
+            elif default is not None:
+                raise errors.BadFunctionArgError(
+                    f"Argument {arg.name!r} of {self.__fn_name__} without a default value "
+                    f"follows argument {default.name!r} with a default value"
+                )
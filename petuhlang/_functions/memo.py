@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Memoization of petuh-functions (``memo >> function >> ...``)."""
+
+from __future__ import annotations
+
+import time
+import typing
+import threading
+import functools
+import collections
+import dataclasses
+
+if typing.TYPE_CHECKING:
+    from petuhlang.types import ArgsType, KwargsType, MaybeNone
+
+
+__all__: tuple[str, ...] = ("MemoizedFunction", "MemoInfo")
+
+
+_KWARGS_MARK: typing.Final[object] = object()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class MemoInfo:
+    """Memoization counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: MaybeNone[int]
+    currsize: int
+
+
+class MemoizedFunction:
+    """Thread-safe LRU (and optionally TTL) cache around petuh-function."""
+
+    def __init__(
+        self,
+        fn: typing.Callable[..., typing.Any],
+        /,
+        *,
+        maxsize: MaybeNone[int] = 128,
+        ttl: MaybeNone[float] = None,
+    ) -> None:
+        functools.update_wrapper(self, fn)
+        self.__fn = fn
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__cache: collections.OrderedDict[
+            typing.Hashable, tuple[typing.Any, float]
+        ] = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = self.__misses = self.__evictions = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.__fn!r}>"
+
+    def __call__(self, *args: ArgsType, **kwargs: KwargsType) -> typing.Any:
+        key = args if not kwargs else args + (_KWARGS_MARK,) + tuple(kwargs.items())
+        now = time.monotonic() if self.__ttl is not None else 0.0
+
+        with self.__lock:
+            if (entry := self.__cache.get(key)) is not None:
+                if self.__ttl is None or entry[1] > now:
+                    self.__cache.move_to_end(key)
+                    self.__hits += 1
+                    return entry[0]
+                del self.__cache[key]
+                self.__evictions += 1
+            self.__misses += 1
+
+        # Called without the lock, so slow functions don't block other keys.
+        value = self.__fn(*args, **kwargs)
+        if self.__maxsize is not None and self.__maxsize <= 0:
+            return value
+
+        expires = now + self.__ttl if self.__ttl is not None else 0.0
+        with self.__lock:
+            self.__cache[key] = (value, expires)
+            self.__cache.move_to_end(key)
+            if self.__maxsize is not None:
+                while len(self.__cache) > self.__maxsize:
+                    self.__cache.popitem(last=False)
+                    self.__evictions += 1
+        return value
+
+    def cache_info(self) -> MemoInfo:
+        """Returns hits, misses and evictions (LRU and expired) counters."""
+        with self.__lock:
+            return MemoInfo(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                maxsize=self.__maxsize,
+                currsize=len(self.__cache),
+            )
+
+    def cache_clear(self) -> None:
+        """Clearing the cache and counters."""
+        with self.__lock:
+            self.__cache.clear()
+            self.__hits = self.__misses = self.__evictions = 0
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Persistent cross-run results cache of petuh-functions (``persist >> function >> ...``)."""
+
+from __future__ import annotations
+
+import os
+import time
+import pickle
+import typing
+import hashlib
+import inspect
+import sqlite3
+import functools
+import threading
+import contextlib
+
+if typing.TYPE_CHECKING:
+    from petuhlang.types import ArgsType, KwargsType, MaybeNone
+
+
+__all__: tuple[str, ...] = ("PersistentFunction",)
+
+
+_SCHEMA: typing.Final[str] = """
+CREATE TABLE IF NOT EXISTS results (
+    name TEXT NOT NULL,
+    body TEXT NOT NULL,
+    key BLOB NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    UNIQUE (name, body, key)
+);
+CREATE INDEX IF NOT EXISTS results_name_created ON results (name, created);
+"""
+# Checking the total size on every write would cost a table scan.
+_EVICT_EVERY: typing.Final[int] = 64
+# Oldest rows of the function which have to go for the size to fit.
+_EVICT_OLDEST: typing.Final[str] = """
+DELETE FROM results WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, SUM(size) OVER (ORDER BY created, rowid) - size AS before
+        FROM results WHERE name = ?
+    ) WHERE before < ?
+)
+"""
+
+
+@contextlib.contextmanager
+def _immediate(connection: sqlite3.Connection, /) -> typing.Iterator[None]:
+    """Write transaction which takes the database lock at once (no upgrade deadlocks)."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+class PersistentFunction:
+    """Petuh-function whose results are stored in a local sqlite database.
+
+    Results are keyed by the function name, the hash of its source and
+    the pickled arguments bound to its signature (with defaults), so
+    changing the body or a default value invalidates them. The
+    database is safe for concurrent writers from several processes
+    (WAL journal, short immediate transactions).
+    """
+
+    def __init__(
+        self,
+        fn: typing.Callable[..., typing.Any],
+        /,
+        *,
+        path: str,
+        max_size: MaybeNone[int] = None,
+        max_age: MaybeNone[float] = None,
+    ) -> None:
+        functools.update_wrapper(self, fn)
+        self.__fn = fn
+        self.__path = path
+        self.__max_size = max_size
+        self.__max_age = max_age
+        self.__name = fn.__name__
+        self.__body = hashlib.sha256(
+            getattr(fn, "__petuh_source__", fn.__name__).encode("utf-8")
+        ).hexdigest()
+        try:
+            self.__signature: inspect.Signature | None = inspect.signature(fn)
+        except (TypeError, ValueError):
+            self.__signature = None
+        self.__local = threading.local()
+        self.hits = self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.__fn!r} path={self.__path!r}>"
+
+    def __connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread (sqlite connections are not shared)."""
+        if (connection := getattr(self.__local, "connection", None)) is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.__path)), exist_ok=True)
+            connection = sqlite3.connect(self.__path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            # Results of the previous versions of the function body.
+            with _immediate(connection):
+                connection.execute(
+                    "DELETE FROM results WHERE name = ? AND body != ?",
+                    (self.__name, self.__body),
+                )
+            self.__local.connection = connection
+            self.__local.writes = 0
+        return connection
+
+    def __call__(self, *args: ArgsType, **kwargs: KwargsType) -> typing.Any:
+        try:
+            key = pickle.dumps(
+                self.__arguments(args, kwargs), protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except Exception:
+            # Unpicklable (or wrong) arguments can't be a key.
+            return self.__fn(*args, **kwargs)
+
+        connection = self.__connection()
+        row = connection.execute(
+            "SELECT value, created FROM results WHERE name = ? AND body = ? AND key = ?",
+            (self.__name, self.__body, key),
+        ).fetchone()
+        if row is not None and (
+            self.__max_age is None or time.time() - row[1] <= self.__max_age
+        ):
+            self.hits += 1
+            return pickle.loads(row[0])
+
+        self.misses += 1
+        value = self.__fn(*args, **kwargs)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return value
+
+        self.__local.writes += 1
+        with _immediate(connection):
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (self.__name, self.__body, key, data, len(key) + len(data), time.time()),
+            )
+            if self.__local.writes % _EVICT_EVERY == 0:
+                self.__evict(connection)
+        return value
+
+    def __arguments(
+        self, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any], /
+    ) -> typing.Any:
+        """Arguments by name with defaults, `f(1)` and `f(x=1)` share the key."""
+        if self.__signature is None:
+            return args, kwargs
+
+        bound = self.__signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple(bound.arguments.items())
+
+    def evict(self) -> None:
+        """Removing expired results of the function and its oldest ones until the size fits.
+
+        Other functions sharing the database keep their results, `max_age`
+        and `max_size` are limits of this function only.
+        """
+        connection = self.__connection()
+        with _immediate(connection):
+            self.__evict(connection)
+
+    def __evict(self, connection: sqlite3.Connection, /) -> None:
+        if self.__max_age is not None:
+            connection.execute(
+                "DELETE FROM results WHERE name = ? AND created < ?",
+                (self.__name, time.time() - self.__max_age),
+            )
+        if self.__max_size is None:
+            return
+
+        total = connection.execute(
+            "SELECT TOTAL(size) FROM results WHERE name = ?", (self.__name,)
+        ).fetchone()[0]
+        if (excess := total - self.__max_size) > 0:
+            connection.execute(_EVICT_OLDEST, (self.__name, excess))
+
+    def cache_clear(self) -> None:
+        """Removing all stored results of the function."""
+        connection = self.__connection()
+        with _immediate(connection):
+            connection.execute("DELETE FROM results WHERE name = ?", (self.__name,))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Runtime validation of petuh-function arguments (``arg(...) >> type``)."""
+
+from __future__ import annotations
+
+import types
+import typing
+
+from petuhlang import errors
+
+from .arguments import Kwarg
+
+if typing.TYPE_CHECKING:
+    from petuhlang.__future__converters.abstract import ConverterABC
+    from petuhlang.types import MaybeNone
+
+    from .arguments import FnArgBase
+
+    TypecheckMode = typing.Literal["off", "check", "coerce"]
+    TargetType = type | tuple[type, ...]
+
+
+__all__: tuple[str, ...] = ("build_validation_prologue", "TYPECHECK_MODES")
+
+
+TYPECHECK_MODES: frozenset[str] = frozenset({"off", "check", "coerce"})
+
+
+def _isinstance_target(type_: typing.Any, /) -> MaybeNone[TargetType]:
+    """Returns what can be passed to `isinstance()` for the annotation (None for anything)."""
+    if type_ is None or type_ is typing.Any:
+        return None
+
+    origin = typing.get_origin(type_)
+    if origin is typing.Union or origin is types.UnionType:
+        targets: list[type] = []
+        for arg in typing.get_args(type_):
+            if (target := _isinstance_target(arg)) is None:
+                return None
+            targets.extend(target if isinstance(target, tuple) else (target,))
+        return tuple(targets)
+
+    if origin is not None:
+        return origin if isinstance(origin, type) else None
+
+    return type_ if isinstance(type_, type) else None
+
+
+def _bad_argument(
+    fn_name: str, arg_name: str, value: typing.Any, target: TargetType, /
+) -> typing.NoReturn:
+    raise errors.ArgumentTypeError(
+        f"Argument '{arg_name}' of '{fn_name}' must be {target}, got {type(value)}"
+    )
+
+
+def _make_coercer(
+    fn_name: str, arg_name: str, target: type, converter: ConverterABC, /
+) -> typing.Callable[[typing.Any], typing.Any]:
+    """Returns the function which converts the argument or raises an error."""
+    convert = converter.convert
+
+    def coerce(value: typing.Any) -> typing.Any:
+        if isinstance(value, target):
+            return value
+        if not isinstance(converted := convert(value), target):
+            _bad_argument(fn_name, arg_name, value, target)
+        return converted
+
+    return coerce
+
+
+def build_validation_prologue(
+    fn_name: str, args: typing.Sequence[FnArgBase], /, *, mode: TypecheckMode
+) -> tuple[str, dict[str, typing.Any]]:
+    """``function``
+
+    Generating code which validates the arguments at the beginning of
+    the function body, so nothing is walked on every call.
+    Returns the code and the names it uses (bound as closure variables).
+
+    fn_name: :class:`str` [Positional-only]
+        Function name.
+
+    args: :class:`typing.Sequence[FnArgBase]` [Positional-only]
+        Function arguments, the type is taken from ``arg(...) >> type``.
+
+    mode: :class:`typing.Literal["off", "check", "coerce"]` [Keyword-only]
+        "check" raises an error for the wrong type, "coerce" converts the
+        value via the converter registry first. Default values of kwargs
+        are passed as they are (``kwarg("x", value=None) >> int``).
+    """
+    if mode not in TYPECHECK_MODES:
+        raise ValueError(f"Typecheck mode must be one of {sorted(TYPECHECK_MODES)}")
+    if mode == "off":
+        return "", {}
+
+    lines: list[str] = []
+    names: dict[str, typing.Any] = {}
+    for index, arg in enumerate(args):
+        if (target := _isinstance_target(getattr(arg, "__type__", None))) is None:
+            continue
+
+        validator = f"__petuh_validate_{index}__"
+        converter = None
+        if mode == "coerce" and isinstance(target, type):
+            from petuhlang.__future__converters import get_converter
+
+            converter = get_converter(target)
+
+        condition = ""
+        if isinstance(arg, Kwarg):
+            default = f"__petuh_default_{index}__"
+            names[default] = arg.value
+            condition = f"{arg.name} is not {default}"
+
+        if converter is not None:
+            names[validator] = _make_coercer(fn_name, arg.name, target, converter)
+            lines.append(
+                f"if {condition}: {arg.name} = {validator}({arg.name})\n"
+                if condition
+                else f"{arg.name} = {validator}({arg.name})\n"
+            )
+        else:
+            names[validator] = target
+            names["__petuh_bad_argument__"] = _bad_argument
+            if condition:
+                condition += " and "
+            lines.append(
+                f"if {condition}not isinstance({arg.name}, {validator}): "
+                f"__petuh_bad_argument__({fn_name!r}, {arg.name!r}, {arg.name}, {validator})\n"
+            )
+
+    return "".join(lines), names
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Concurrent then-blocks (``then.parallel [...]``)."""
+
+from __future__ import annotations
+
+import typing
+import asyncio
+import inspect
+import threading
+import contextvars
+import concurrent.futures
+
+from petuhlang import errors
+from petuhlang.utils import OutputInterceptor
+
+if typing.TYPE_CHECKING:
+    from petuhlang.types import MaybeNone
+
+    Block = typing.Callable[[], typing.Any] | typing.Any
+    # Block value or exception and its output lines.
+    Outcome = tuple[typing.Any, MaybeNone[BaseException], list[str]]
+
+
+__all__: tuple[str, ...] = ("configure", "run_blocks", "run_blocks_async")
+
+
+_DEFAULT_WORKERS: typing.Final[int] = 8
+_THREAD_PREFIX: typing.Final[str] = "petuhlang-then"
+
+_pool: MaybeNone[concurrent.futures.ThreadPoolExecutor] = None
+_pool_workers = _DEFAULT_WORKERS
+_pool_lock = threading.Lock()
+
+
+def configure(*, workers: int = _DEFAULT_WORKERS) -> None:
+    """``function``
+
+    Changing the size of the thread pool shared by all `then.parallel` calls.
+
+    workers: :class:`int` = 8 [Keyword-only]
+        Number of threads.
+    """
+    global _pool, _pool_workers
+
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+
+    with _pool_lock:
+        old, _pool, _pool_workers = _pool, None, workers
+
+    if old is not None:
+        # Running blocks finish in the old pool.
+        old.shutdown(wait=False)
+
+
+def _shared_pool() -> concurrent.futures.ThreadPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_pool_workers, thread_name_prefix=_THREAD_PREFIX
+            )
+        return _pool
+
+
+async def _await(awaitable: typing.Awaitable[typing.Any], /) -> typing.Any:
+    return await awaitable
+
+
+def _run_block(block: Block, /) -> Outcome:
+    """Calling the block in a worker thread, its output is captured."""
+    with OutputInterceptor() as output:
+        try:
+            value = block() if callable(block) else block
+            if inspect.isawaitable(value):
+                value = asyncio.run(_await(value))
+        except Exception as exc:
+            return None, exc, output
+
+    return value, None, output
+
+
+async def _run_block_async(block: Block, /) -> Outcome:
+    """Running the block as a task, sync blocks are called in the shared pool."""
+    with OutputInterceptor() as output:
+        try:
+            if inspect.iscoroutinefunction(block):
+                value = await block()
+            elif callable(block):
+                context = contextvars.copy_context()
+                value = await asyncio.get_running_loop().run_in_executor(
+                    _shared_pool(), context.run, block
+                )
+                if inspect.isawaitable(value):
+                    value = await value
+            else:
+                value = await block if inspect.isawaitable(block) else block
+        except Exception as exc:
+            return None, exc, output
+
+    return value, None, output
+
+
+def _collect(outcomes: typing.Sequence[Outcome], /) -> list[typing.Any]:
+    """Replaying output of the blocks in their order, returns their values."""
+    for _, _, output in outcomes:
+        for text in output:
+            print(text)
+
+    if failed := [exc for _, exc, _ in outcomes if exc is not None]:
+        raise errors.ParallelBlocksError(
+            f"{len(failed)} of {len(outcomes)} then-blocks failed", exceptions=failed
+        )
+
+    return [value for value, _, _ in outcomes]
+
+
+def run_blocks(blocks: typing.Sequence[Block], /) -> list[typing.Any]:
+    """``function``
+
+    Running the blocks in the shared thread pool, returns their values in order.
+
+    blocks: :class:`typing.Sequence[Block]` [Positional-only]
+        Callables (or values) to run.
+    """
+    if threading.current_thread().name.startswith(_THREAD_PREFIX):
+        # Nested `then.parallel` waiting for the pool it runs in could deadlock.
+        return _collect([_run_block(block) for block in blocks])
+
+    pool = _shared_pool()
+    futures = [
+        pool.submit(contextvars.copy_context().run, _run_block, block)
+        for block in blocks
+    ]
+    return _collect([future.result() for future in futures])
+
+
+async def run_blocks_async(blocks: typing.Sequence[Block], /) -> list[typing.Any]:
+    """``function``
+
+    Running the blocks as tasks of the running loop, returns their values in order.
+
+    blocks: :class:`typing.Sequence[Block]` [Positional-only]
+        Callables, coroutine functions (or values) to run.
+    """
+    return _collect(await asyncio.gather(*map(_run_block_async, blocks)))
@@ -19,49 +19,541 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-"""Parsing any names from python file by regex."""
+"""Parsing petuhlang definitions from python file (regex scan, tokenizer for unusual ones)."""
 
+from __future__ import annotations
+
+import io
+import os
 import re
-import sys
+import ast
+import typing
+import tokenize
+import dataclasses
+
+from ._cache import parse_cache
+from ._dataclasses import (
+    ParsedFileContainer,
+    SymbolIndex,
+    Symbol,
+    SymbolSpan,
+    ArgumentSpec,
+)
+
+
+__all__: tuple[str, ...] = (
+    "parse_module",
+    "parse_source",
+    "parse_file",
+    "build_symbol_index",
+)
 
-from ._dataclasses import ParsedFileContainer
 
+_DEFINITION_KEYWORDS: dict[str, str] = {
+    "function": "functions",
+    "asyncfunction": "async_functions",
+    "pyclass": "classes",
+}
+_ARGUMENT_KEYWORDS: frozenset[str] = frozenset({"arg", "kwarg"})
 
-__all__: tuple[str, ...] = ("parse_current_file",)
+_OPENING: frozenset[str] = frozenset({"(", "[", "{"})
+_CLOSING: frozenset[str] = frozenset({")", "]", "}"})
+# Symbol indexes of the modules parsed in this process, keyed by source file.
+__parsed_modules__: dict[str, SymbolIndex] = {}
 
+_SKIPPED: frozenset[int] = frozenset(
+    {tokenize.COMMENT, tokenize.NL, tokenize.ENCODING}
+)
+_TAB_SIZE: typing.Final[int] = 8
 
-function_pattern: re.Pattern[str] = re.compile(
-    r"""^function >> ([a-zA-Z]*\w+)""", re.MULTILINE
+# Quick check if the source can have definitions at all.
+_CANDIDATE: typing.Final[re.Pattern[str]] = re.compile(
+    r"(?<![\w.])(?:function|asyncfunction|pyclass)\s*>>"
+)
+# Everything the scan needs to know about the source: strings and comments
+# (skipped), brackets, logical lines, python scopes and definition keywords.
+_LEXER: typing.Final[re.Pattern[str]] = re.compile(
+    r"""
+    (?P<string>
+        '''(?:\\[\s\S]|[^\\])*?'''
+        |\"\"\"(?:\\[\s\S]|[^\\])*?\"\"\"
+    )
+    |(?P<unterminated>'''|\"\"\")
+    |(?P<short_string>'(?:\\.|[^\\'\n])*'|"(?:\\.|[^\\"\n])*")
+    |(?P<comment>\#[^\n]*)
+    |(?P<continuation>\\\r?\n)
+    |(?P<newline>\r?\n[ \t\f]*)
+    # The whole line when it has no strings and keywords and its brackets
+    # (up to two levels) are closed, most lines take one match.
+    (?:
+        (?![^\n]*\b(?:def|class|function|asyncfunction|pyclass)\b)
+        (?P<line>
+            (?:
+                [^\n'"\#\\()\[\]{}]
+                |[(\[{]
+                    (?:[^\n'"\#\\()\[\]{}]|[(\[{][^\n'"\#\\()\[\]{}]*[)\]}])*
+                [)\]}]
+            )+
+            (?:\#[^\n]*)?
+            (?=\n|\Z)
+        )
+    )?
+    |(?P<open>[(\[{])
+    |(?P<close>[)\]}])
+    |(?<![\w.])(?:
+        (?P<block>(?:def|class)[ \t]+(?P<block_name>\w+))
+        |(?P<definition>function|asyncfunction|pyclass)
+    )(?!\w)
+    """,
+    re.VERBOSE,
 )
-class_pattern: re.Pattern[str] = re.compile(
-    r"""^pyclass >> ([a-zA-Z]*\w+)""", re.MULTILINE
+# One-line definitions with plain `arg`/`kwarg` arguments (the common case)
+# are read without tokenizing, anything else doesn't match.
+_SIMPLE_DEFINITION: typing.Final[re.Pattern[str]] = re.compile(
+    r"""
+    (?P<header>
+        (?P<keyword>asyncfunction|function|pyclass)[ \t]*>>[ \t]*(?P<name>[^\W\d]\w*)(?!\w)
+        (?:
+            [ \t]*\(
+            (?P<arguments>(?:
+                [^()'"\#\\\n]
+                |\((?:[^()'"\#\\\n]|'[^'\\\n]*'|"[^"\\\n]*")*\)
+            )*)
+            \)
+            |(?![ \t]*\()
+        )
+    )
+    [ \t]*(?:(?P<body>\[)|(?!\\))
+    """,
+    re.VERBOSE,
+)
+_SIMPLE_ARGUMENT: typing.Final[re.Pattern[str]] = re.compile(
+    r"""
+    [ \t]*(?P<kind>kwarg|arg)[ \t]*\([ \t]*
+    (?:"(?P<double>[^"\\\n]*)"|'(?P<single>[^'\\\n]*)')
+    (?:[ \t]*,[^()\[\]{}'"\#\\\n]*)?\)
+    (?:[ \t]*>>[ \t]*(?P<annotation>
+        [\w.]+(?:[ \t]*\[[\w.,|\ \t]*\])?
+        (?:[ \t]*\|[ \t]*[\w.]+(?:[ \t]*\[[\w.,|\ \t]*\])?)*
+    ))?
+    [ \t]*(?:,|$)
+    """,
+    re.VERBOSE,
 )
+_BLANKS: typing.Final[re.Pattern[str]] = re.compile(r"[ \t]+")
 
 
-def _extract_names_by(code: str, /, *, pattern: re.Pattern[str]) -> list[str]:
+def _read_simple_definition(
+    code: str, start: int, /, *, line: int, column: int, scope: tuple[str, ...]
+) -> tuple[Symbol, int, int] | None:
     """``function``
 
-    Extracting any names from python file by regex.
+    Reading ``function >> name(arg("x") >> int, ...)`` by a regex.
+    Returns the symbol, the offset of its end and the offset of its body
+    (-1 without a body), None if the definition must be tokenized.
 
     code: :class:`str` [Positional-only]
         Some python code.
 
-    pattern: :class:`re.Pattern` [Keyword-only]
-        The pattern by which the names will be extracted.
+    start: :class:`int` [Positional-only]
+        Offset of the definition keyword.
+
+    line: :class:`int` [Keyword-only]
+        Line of the definition keyword.
+
+    column: :class:`int` [Keyword-only]
+        Column of the definition keyword.
+
+    scope: :class:`tuple[str, ...]` [Keyword-only]
+        Names of the enclosing scopes.
+    """
+    if (match := _SIMPLE_DEFINITION.match(code, start)) is None:
+        return None
+
+    arguments: list[ArgumentSpec] = []
+    if text := match.group("arguments"):
+        position = 0
+        while position < len(text):
+            if (argument := _SIMPLE_ARGUMENT.match(text, position)) is None:
+                return None
+
+            name, annotation = argument.group("double", "annotation")
+            arguments.append(
+                ArgumentSpec(
+                    kind=argument.group("kind"),
+                    name=argument.group("single") if name is None else name,
+                    # Like tokens joined by the tokenizing reader.
+                    annotation=_BLANKS.sub("", annotation) if annotation else None,
+                )
+            )
+            position = argument.end()
+
+    end = match.end("header")
+    symbol = Symbol(
+        name=match.group("name"),
+        category=_DEFINITION_KEYWORDS[match.group("keyword")],
+        span=SymbolSpan(
+            line=line, column=column, end_line=line, end_column=column + end - start
+        ),
+        arguments=tuple(arguments),
+        scope=scope,
+    )
+    return symbol, end, match.start("body")
+
+
+def _definition_tokens(
+    readline: typing.Callable[[], str], /
+) -> list[tokenize.TokenInfo]:
+    """``function``
+
+    Tokenizing ``keyword >> name(...)`` and one token after it, the rest
+    of the statement (e.g. the body) isn't tokenized.
+
+    readline: :class:`typing.Callable[[], str]` [Positional-only]
+        Reads the source starting at the definition keyword.
     """
-    matches: list[str] = []
-    for match in pattern.findall(code):
-        matches.append(match)
+    tokens: list[tokenize.TokenInfo] = []
+    depth = 0
+    closed = False
+    try:
+        for token in tokenize.generate_tokens(readline):
+            if token.type in _SKIPPED:
+                continue
+
+            tokens.append(token)
+            if closed or token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                break
+            if len(tokens) == 3 and not _is_definition(tokens, 0):
+                break
+            if len(tokens) == 4 and not _is_op(tokens, 3, "("):
+                break
+            if len(tokens) >= 4 and token.type == tokenize.OP:
+                if token.string in _OPENING:
+                    depth += 1
+                elif token.string in _CLOSING:
+                    depth -= 1
+                    closed = depth == 0
+    except (tokenize.TokenError, SyntaxError):
+        # Unfinished code, everything before the error is still useful.
+        pass
+
+    return tokens
+
+
+def _moved(symbol: Symbol, line: int, column: int, /) -> Symbol:
+    """Moving the symbol tokenized from the middle of the line to its real position."""
+    span = symbol.span
+    return dataclasses.replace(
+        symbol,
+        span=SymbolSpan(
+            line=span.line + line - 1,
+            column=span.column + column,
+            end_line=span.end_line + line - 1,
+            end_column=span.end_column + column * (span.end_line == 1),
+        ),
+    )
+
+
+def _offset(code: str, offset: int, rows: int, column: int, /) -> int:
+    """Returns the offset of the column `rows` lines below the offset.
+
+    Like columns of tokens read from the offset, the column of the first
+    line is counted from the offset.
+    """
+    for _ in range(rows):
+        offset = code.index("\n", offset) + 1
+    return offset + column
+
+
+def _is_op(tokens: list[tokenize.TokenInfo], index: int, string: str, /) -> bool:
+    return index < len(tokens) and tokens[index].type == tokenize.OP and (
+        tokens[index].string == string
+    )
+
+
+def _is_definition(tokens: list[tokenize.TokenInfo], index: int, /) -> bool:
+    """Checks for ``function >> name`` / ``pyclass >> Name`` at the index."""
+    if index > 0 and _is_op(tokens, index - 1, "."):
+        return False
+
+    return (
+        _is_op(tokens, index + 1, ">>")
+        and index + 2 < len(tokens)
+        and tokens[index + 2].type == tokenize.NAME
+    )
+
+
+def _read_argument(
+    tokens: list[tokenize.TokenInfo], index: int, /
+) -> tuple[ArgumentSpec | None, int]:
+    """``function``
+
+    Reading ``arg("name") >> type`` starting at the index.
+    Returns the spec and the index of the token that ends the argument.
+
+    tokens: :class:`list[tokenize.TokenInfo]` [Positional-only]
+        Significant tokens.
+
+    index: :class:`int` [Positional-only]
+        Index of the ``arg``/``kwarg`` name.
+    """
+    kind = tokens[index].string
+    name: str | None = None
+    if index + 2 < len(tokens) and tokens[index + 2].type == tokenize.STRING:
+        try:
+            name = ast.literal_eval(tokens[index + 2].string)
+        except (ValueError, SyntaxError):
+            name = None
+
+    depth = 0
+    annotation: list[str] | None = None
+    position = index + 1
+    while position < len(tokens):
+        token = tokens[position]
+        if token.type == tokenize.OP:
+            if token.string in _OPENING:
+                depth += 1
+            elif token.string in _CLOSING:
+                if depth == 0:
+                    break
+                depth -= 1
+            elif depth == 0 and token.string == ",":
+                break
+            elif depth == 0 and token.string == ">>" and annotation is None:
+                annotation = []
+                position += 1
+                continue
+        elif token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            break
 
-    return matches
+        if annotation is not None:
+            annotation.append(token.string)
+        position += 1
 
+    if not isinstance(name, str):
+        return None, position
 
-def parse_current_file() -> ParsedFileContainer:
-    """Opening current file and returning object with parsed names."""
-    with open(sys.argv[0], "r", encoding="utf-8") as file:
-        code = file.read()
+    return (
+        ArgumentSpec(
+            kind=kind,
+            name=name,
+            annotation="".join(annotation) if annotation else None,
+        ),
+        position,
+    )
+
+
+def _read_definition(
+    tokens: list[tokenize.TokenInfo], index: int, /, *, scope: tuple[str, ...]
+) -> tuple[Symbol, int]:
+    """``function``
+
+    Reading ``function >> name(...)`` starting at the index.
+    Returns the symbol and the index of the first token after the definition.
+
+    tokens: :class:`list[tokenize.TokenInfo]` [Positional-only]
+        Significant tokens.
 
-    return ParsedFileContainer(
-        functions=_extract_names_by(code, pattern=function_pattern),
-        classes=_extract_names_by(code, pattern=class_pattern),
+    index: :class:`int` [Positional-only]
+        Index of the definition keyword.
+
+    scope: :class:`tuple[str, ...]` [Keyword-only]
+        Names of the enclosing scopes.
+    """
+    keyword, name = tokens[index], tokens[index + 2]
+    end = name.end
+    position = index + 3
+    arguments: list[ArgumentSpec] = []
+
+    if _is_op(tokens, position, "("):
+        depth = 1
+        position += 1
+        while position < len(tokens) and depth:
+            token = tokens[position]
+            if token.type == tokenize.OP:
+                if token.string in _OPENING:
+                    depth += 1
+                elif token.string in _CLOSING:
+                    depth -= 1
+                    end = token.end
+            elif (
+                depth == 1
+                and token.type == tokenize.NAME
+                and token.string in _ARGUMENT_KEYWORDS
+                and _is_op(tokens, position + 1, "(")
+            ):
+                spec, position = _read_argument(tokens, position)
+                if spec is not None:
+                    arguments.append(spec)
+                continue
+            elif token.type == tokenize.ENDMARKER:
+                break
+            position += 1
+
+    symbol = Symbol(
+        name=name.string,
+        category=_DEFINITION_KEYWORDS[keyword.string],
+        span=SymbolSpan(
+            line=keyword.start[0],
+            column=keyword.start[1],
+            end_line=end[0],
+            end_column=end[1],
+        ),
+        arguments=tuple(arguments),
+        scope=scope,
     )
+    return symbol, position
+
+
+def _enter_line(
+    blocks: list[tuple[str, int]],
+    pending_block: tuple[str, int] | None,
+    indentation: int,
+    /,
+) -> None:
+    """Leaving python scopes (and entering the pending one) by the line indentation."""
+    while blocks and blocks[-1][1] > indentation:
+        blocks.pop()
+    if pending_block is not None and indentation > pending_block[1]:
+        blocks.append((pending_block[0], indentation))
+
+
+def build_symbol_index(code: str, /) -> SymbolIndex:
+    """``function``
+
+    Finding every petuh-function and petuh-class definition in one pass.
+
+    Strings, comments, brackets and python scopes are found by one regex,
+    only definitions themselves (without bodies) are tokenized.
+
+    code: :class:`str` [Positional-only]
+        Some python code.
+    """
+    symbols: list[Symbol] = []
+    if _CANDIDATE.search(code) is None:
+        return SymbolIndex(symbols=symbols)
+
+    stream = io.StringIO(code)
+    # Python scopes (name, indentation) and petuh-bodies (name, nesting).
+    blocks: list[tuple[str, int]] = []
+    bodies: list[tuple[str, int]] = []
+    pending_block: tuple[str, int] | None = None
+    indentation = next_indentation = nesting = 0
+    # Offset of the next logical line (after the indentation), None inside it.
+    line_start: int | None = 0
+    # The body of the last definition starts with '['.
+    body_start = -1
+    body_name = ""
+    line, counted = 1, 0
+
+    position = 0
+    while (match := _LEXER.search(code, position)) is not None:
+        kind, start, position = match.lastgroup, match.start(), match.end()
+        if line_start is not None and (
+            start > line_start or kind not in ("newline", "line", "comment")
+        ):
+            # The first token of the logical line.
+            line_start = None
+            indentation = next_indentation
+            _enter_line(blocks, pending_block, indentation)
+            pending_block = None
+
+        if kind == "newline" or kind == "line":
+            if nesting <= 0:
+                line_start = match.end("newline")
+                next_indentation = len(
+                    match.group("newline").lstrip("\r\n").expandtabs(_TAB_SIZE)
+                )
+                if kind == "line":
+                    line_start = None
+                    indentation = next_indentation
+                    _enter_line(blocks, pending_block, indentation)
+                    pending_block = None
+        elif kind == "open":
+            if start == body_start:
+                bodies.append((body_name, nesting))
+            nesting += 1
+        elif kind == "close":
+            nesting -= 1
+            while bodies and bodies[-1][1] >= nesting:
+                bodies.pop()
+        elif kind == "unterminated":
+            # Like the tokenizer, everything after it is a string.
+            break
+        elif kind == "block":
+            pending_block = (match.group("block_name"), indentation)
+        elif kind == "definition":
+            line += code.count("\n", counted, start)
+            counted = start
+            column = start - code.rfind("\n", 0, start) - 1
+
+            scope = tuple(name for name, _ in blocks) + tuple(
+                name for name, _ in bodies
+            )
+            if (
+                simple := _read_simple_definition(
+                    code, start, line=line, column=column, scope=scope
+                )
+            ) is not None:
+                # Arguments are skipped (definitions inside them too).
+                symbol, position, body_start = simple
+                symbols.append(symbol)
+                body_name = symbol.name
+                continue
+
+            stream.seek(start)
+            tokens = _definition_tokens(stream.readline)
+            if not _is_definition(tokens, 0):
+                continue
+
+            symbol, index = _read_definition(tokens, 0, scope=scope)
+            symbols.append(_moved(symbol, line, column))
+
+            # Arguments are skipped, tokens are positioned relative to the keyword.
+            row, token_column = (
+                tokens[index].start if index < len(tokens) else tokens[-1].end
+            )
+            position = _offset(code, start, row - 1, token_column)
+            if _is_op(tokens, index, "["):
+                body_start, body_name = position, symbol.name
+
+    return SymbolIndex(symbols=symbols)
+
+
+def parse_file(filename: str, /) -> SymbolIndex:
+    """``function``
+
+    Returns the symbol index of the file (from the parse cache if possible).
+
+    filename: :class:`str` [Positional-only]
+        Path to the python file.
+    """
+    return parse_cache.parse(filename, parser=build_symbol_index)
+
+
+def parse_module(filename: str, /) -> ParsedFileContainer:
+    """``function``
+
+    Returns object with parsed names of the module, every module
+    is parsed only once per process.
+
+    filename: :class:`str` [Positional-only]
+        Source file of the module.
+    """
+    key = os.path.abspath(filename)
+    if (index := __parsed_modules__.get(key)) is None:
+        index = __parsed_modules__[key] = parse_file(key)
+
+    return ParsedFileContainer.from_index(index)
+
+
+def parse_source(source: str, /) -> ParsedFileContainer:
+    """``function``
+
+    Returns object with parsed names of the source which has no file
+    (e.g. executed by :meth:`petuhlang.Runtime.run_source`).
+
+    source: :class:`str` [Positional-only]
+        Source of the module.
+    """
+    return ParsedFileContainer.from_index(build_symbol_index(source))
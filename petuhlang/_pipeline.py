@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Lazy then-pipelines (``then >> step1 >> step2``)."""
+
+from __future__ import annotations
+
+import time
+import typing
+import inspect
+
+from petuhlang import errors, PetuhObject
+
+if typing.TYPE_CHECKING:
+    Step = typing.Callable[..., typing.Any] | typing.Iterable[typing.Any]
+
+
+__all__: tuple[str, ...] = ("Pipeline", "PipelineRun")
+
+
+class Pipeline(PetuhObject):
+    """Plan of then-steps, it runs only when it is consumed.
+
+    The first step is the source: a callable called without arguments or
+    an iterable. Every next step is called with each item, generators
+    (returned by any step) are streamed item by item through the rest of
+    the steps, so the pipeline holds one item at a time.
+
+    Example:
+    --------
+
+    ```py
+    pipeline = then >> read_lines >> parse >> store
+    for stored in pipeline:
+        ...
+    ```
+    """
+
+    def __init__(self, steps: tuple[Step, ...] = (), /) -> None:
+        if steps and not all(callable(step) for step in steps[1:]):
+            raise errors.BadPipelineStepError(
+                f"Pipeline steps after the source must be callable, got {steps}"
+            )
+        self.__steps = steps
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} steps={len(self.__steps)}>"
+
+    def __rshift__(self, step: Step) -> Pipeline:
+        """Returns new pipeline with the step appended."""
+        return self.__class__(self.__steps + (step,))
+
+    def __iter__(self) -> PipelineRun:
+        return PipelineRun(self.__steps)
+
+    @property
+    def steps(self) -> tuple[Step, ...]:
+        return self.__steps
+
+    def run(self, *, collect: bool = True) -> PipelineRun:
+        """``method``
+
+        Running the whole pipeline, returns the finished run.
+
+        collect: :class:`bool` = True [Keyword-only]
+            Whether to keep the results in `run.results`.
+        """
+        run = PipelineRun(self.__steps)
+        if collect:
+            run.results.extend(run)
+        else:
+            for _ in run:
+                pass
+        return run
+
+
+def _is_stream(value: typing.Any, /) -> bool:
+    return inspect.isgenerator(value)
+
+
+def _is_source_stream(value: typing.Any, /) -> bool:
+    return not isinstance(value, (str, bytes)) and isinstance(value, typing.Iterable)
+
+
+class PipelineRun:
+    """Iterator over results of the pipeline, time spent in every step is in `timings`."""
+
+    def __init__(self, steps: tuple[Step, ...], /) -> None:
+        self.steps = steps
+        self.timings = [0.0] * len(steps)
+        self.results: list[typing.Any] = []
+        self.__iterator = self.__source() if steps else iter(())
+
+    def __repr__(self) -> str:
+        timings = ", ".join(f"{i}: {timing:.6f}s" for i, timing in enumerate(self.timings))
+        return f"<{self.__class__.__name__} timings=[{timings}]>"
+
+    def __iter__(self) -> PipelineRun:
+        return self
+
+    def __next__(self) -> typing.Any:
+        return next(self.__iterator)
+
+    def __source(self) -> typing.Iterator[typing.Any]:
+        source = self.steps[0]
+        if callable(source):
+            started = time.perf_counter()
+            source = source()
+            self.timings[0] += time.perf_counter() - started
+            if not _is_stream(source):
+                yield from self.__feed(1, source)
+                return
+
+        if not _is_source_stream(source):
+            yield from self.__feed(1, source)
+            return
+
+        yield from self.__drain(0, iter(source))
+
+    def __feed(self, index: int, item: typing.Any, /) -> typing.Iterator[typing.Any]:
+        if index == len(self.steps):
+            yield item
+            return
+
+        started = time.perf_counter()
+        value = self.steps[index](item)
+        self.timings[index] += time.perf_counter() - started
+
+        if _is_stream(value):
+            yield from self.__drain(index, value)
+        else:
+            yield from self.__feed(index + 1, value)
+
+    def __drain(
+        self, index: int, items: typing.Iterator[typing.Any], /
+    ) -> typing.Iterator[typing.Any]:
+        """Passing the items of the step one by one to the next steps."""
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self.timings[index] += time.perf_counter() - started
+
+            yield from self.__feed(index + 1, item)
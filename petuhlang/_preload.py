@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Parallel pre-parsing of petuhlang modules."""
+
+from __future__ import annotations
+
+import os
+import typing
+
+from ._parser import parse_file, __parsed_modules__
+
+if typing.TYPE_CHECKING:
+    from ._dataclasses import SymbolIndex
+    from .types import MaybeNone
+
+    PathsType = typing.Iterable[str | os.PathLike[str]]
+
+
+__all__: tuple[str, ...] = ("preload", "find_petuhlang_modules")
+
+
+_USING_MARKERS: tuple[bytes, ...] = (b"using", b"petuhlang")
+
+
+def find_petuhlang_modules(paths: PathsType, /) -> list[str]:
+    """``function``
+
+    Returns python files (recursively for directories) which use petuhlang.
+
+    paths: :class:`typing.Iterable[str | os.PathLike[str]]` [Positional-only]
+        Files or directories to search.
+    """
+    candidates: list[str] = []
+    for path in map(os.fspath, paths):
+        if os.path.isdir(path):
+            for root, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+                candidates.extend(
+                    os.path.join(root, name) for name in filenames if name.endswith(".py")
+                )
+        else:
+            candidates.append(path)
+
+    modules: list[str] = []
+    for filename in candidates:
+        try:
+            with open(filename, "rb") as file:
+                source = file.read()
+        except OSError:
+            continue
+        if all(marker in source for marker in _USING_MARKERS):
+            modules.append(os.path.abspath(filename))
+
+    return modules
+
+
+def _parse(filename: str, /) -> tuple[str, MaybeNone[SymbolIndex]]:
+    """Worker function, the parse cache is written by the worker process."""
+    try:
+        return filename, parse_file(filename)
+    except (OSError, UnicodeDecodeError):
+        # Removed or not utf-8, it's reported when (if) the module is imported.
+        return filename, None
+
+
+def preload(
+    paths: PathsType, /, *, workers: MaybeNone[int] = None
+) -> dict[str, SymbolIndex]:
+    """``function``
+
+    Parses all modules which use petuhlang in a process pool and seeds
+    the per-module parse registry, so `using >>` doesn't parse them again.
+    Files which can't be read or decoded are skipped.
+
+    paths: :class:`typing.Iterable[str | os.PathLike[str]]` [Positional-only]
+        Files or directories to search.
+
+    workers: :class:`MaybeNone[int]` = None [Keyword-only]
+        Number of worker processes, `os.cpu_count()` if None.
+    """
+    modules = [
+        filename
+        for filename in find_petuhlang_modules(paths)
+        if filename not in __parsed_modules__
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(modules) < 2:
+        results = dict(map(_parse, modules))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(modules) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(modules))) as executor:
+            results = dict(executor.map(_parse, modules, chunksize=chunksize))
+
+    parsed = {
+        filename: index for filename, index in results.items() if index is not None
+    }
+    __parsed_modules__.update(parsed)
+    return parsed
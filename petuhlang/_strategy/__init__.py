@@ -20,7 +20,19 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .impl import *
+import typing
 
+from .lazy import *
 
-__all__: tuple[str, ...] = ("Strategy",)
+
+__all__: tuple[str, ...] = ("Strategy", "LazyDefault")
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Importing strategies only when it is used."""
+    if name == "Strategy":
+        from .impl import Strategy
+
+        return Strategy
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
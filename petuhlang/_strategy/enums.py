@@ -30,3 +30,4 @@ __all__: tuple[str, ...] = ("CategoryEnum",)
 class CategoryEnum(str, enum.Enum):
     strategy_functions = "functions"
     strategy_classes = "classes"
+    strategy_async_functions = "async_functions"
@@ -31,7 +31,9 @@ from petuhlang._functions import PetuhFunction
 from petuhlang._classes import PetuhClass
 
 if typing.TYPE_CHECKING:
-    CategoryType = typing.Literal["functions", "classes"] | CategoryEnum
+    CategoryType = (
+        typing.Literal["functions", "classes", "async_functions"] | CategoryEnum
+    )
 
 
 __all__: tuple[str, ...] = ("Strategy",)
@@ -40,17 +42,15 @@ __all__: tuple[str, ...] = ("Strategy",)
 class Strategy:
     """The class that defines the strategy."""
 
-    def __init__(self, category: CategoryType, /) -> None:
-        self.__category = category
+    if typing.TYPE_CHECKING:
+        __categories__: dict[str, typing.Type[StrategyABC]]
 
-        self.__categories: dict[str, type] = {
-            CategoryEnum.strategy_functions: Functions,
-            CategoryEnum.strategy_classes: Classes,
-        }
+    def __init__(self, category: CategoryType, /) -> None:
+        self.__strategy = self.__categories__[category]
 
     def get_default(self, name: str, /) -> typing.Any:
         """Returns default value for certain strategy."""
-        return self.__categories[self.__category](name).default
+        return self.__strategy(name).default
 
 
 class Functions(StrategyABC):
@@ -61,9 +61,25 @@ class Functions(StrategyABC):
         return PetuhFunction(self._obj_name)
 
 
+class AsyncFunctions(StrategyABC):
+    """Async function strategy."""
+
+    @property
+    def default(self) -> typing.Any:
+        return PetuhFunction(self._obj_name, is_async=True)
+
+
 class Classes(StrategyABC):
     """Classes strategy."""
 
     @property
     def default(self) -> typing.Any:
         return PetuhClass(self._obj_name)
+
+
+# Dispatch table is built once, not for every strategy.
+Strategy.__categories__ = {
+    CategoryEnum.strategy_functions: Functions,
+    CategoryEnum.strategy_classes: Classes,
+    CategoryEnum.strategy_async_functions: AsyncFunctions,
+}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Lazy strategy defaults."""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from petuhlang.runtime import Runtime
+    from petuhlang.types import ArgsType, KwargsType
+
+    from .impl import CategoryType
+
+
+__all__: tuple[str, ...] = ("LazyDefault",)
+
+
+class LazyDefault:
+    """Placeholder which becomes the strategy default on first use."""
+
+    __slots__ = ("__name", "__category", "__runtime")
+
+    def __init__(
+        self, category: CategoryType, name: str, /, *, runtime: Runtime
+    ) -> None:
+        self.__category = category
+        self.__name = name
+        self.__runtime = runtime
+
+    def __call__(self, *args: ArgsType, **kwargs: KwargsType) -> typing.Any:
+        return self.materialize()(*args, **kwargs)
+
+    def __getattr__(self, item: str) -> typing.Any:
+        return getattr(self.materialize(), item)
+
+    def __str__(self) -> str:
+        return self.__name
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.__category}:{self.__name}>"
+
+    def materialize(self) -> typing.Any:
+        """Creating the default value and replacing the placeholder with it."""
+        from .impl import Strategy
+
+        default = Strategy(self.__category).get_default(self.__name)
+        if self.__runtime.namespace.get(self.__name) is self:
+            self.__runtime.bind(self.__name, default)
+        return default
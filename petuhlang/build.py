@@ -23,18 +23,28 @@
 
 from __future__ import annotations
 
+import os
 import sys
 import typing
 import dataclasses
 
-from ._strategy import Strategy
+from ._strategy import LazyDefault
 from ._enums import PetuhLangEnum
-from ._parser import parse_current_file
+from ._cache import parse_cache, code_cache
+from ._parser import parse_module, parse_source
 from ._functions import Arg, Kwarg
+from ._functions.validation import TYPECHECK_MODES
 from .cli.console import console, _Console
+from .runtime import get_current_runtime
 from .pkeywords import (
     function,
     _Function,
+    asyncfunction,
+    _AsyncFunction,
+    memo,
+    _Memo,
+    persist,
+    _Persist,
     then,
     _Then,
     pyclass,
@@ -45,19 +55,25 @@ from .pkeywords import (
 
 
 if typing.TYPE_CHECKING:
+    import types
+
+    from .types import MaybeNone
+    from ._functions.validation import TypecheckMode
+
     BuiltinsType = dict[str, type]
-    UsingType = typing.Literal["petuhlang"]
+    LangNameType = typing.Literal["petuhlang"]
+    UsingType = LangNameType | tuple[LangNameType, str]
 
 
 __all__: tuple[str, ...] = (
     "using",
+    "preload",
+    "parse_cache",
+    "code_cache",
     "__pbuiltins__",
 )
 
 
-global_ = sys.modules["builtins"].__dict__
-
-
 class _Unprintable:
     """Makes object unprintable."""
 
@@ -65,33 +81,124 @@ class _Unprintable:
         raise TypeError("Unprintable object.")
 
 
+def _find_module_file(
+    module_name: MaybeNone[str], frame: types.FrameType, /
+) -> MaybeNone[str]:
+    """``function``
+
+    Returns the source file of the module which uses petuhlang.
+
+    module_name: :class:`MaybeNone[str]` [Positional-only]
+        Explicitly passed module name, the caller frame is used if None.
+
+    frame: :class:`types.FrameType` [Positional-only]
+        Caller frame.
+    """
+    if module_name is not None:
+        module_globals = vars(sys.modules[module_name])
+    else:
+        module_globals = frame.f_globals
+
+    return module_globals.get("__file__")
+
+
 class _Using:
-    """'using' keyword in petuhlang (init petuhlang)."""
+    """'using' keyword in petuhlang (init petuhlang).
+
+    Everything is bound into the current :class:`petuhlang.Runtime`.
+
+    ``using(lazy=True) >> "petuhlang"`` creates petuh-functions and
+    petuh-classes placeholders only when they are used.
+
+    ``using(optimize=True) >> "petuhlang"`` binds petuh-names used by
+    string-bodied functions as closure cells (see :class:`petuhlang.Runtime`).
+
+    ``using(typecheck="check") >> "petuhlang"`` validates ``arg(...) >> type``
+    ("coerce" converts values via the converter registry, "off" by default).
+
+    Both modes apply to functions defined in the calling file only, modes
+    which aren't passed are the ones of the runtime.
+    """
+
+    def __init__(
+        self,
+        *,
+        lazy: bool = False,
+        optimize: MaybeNone[bool] = None,
+        typecheck: MaybeNone[TypecheckMode] = None,
+    ) -> None:
+        self.__lazy = lazy
+        self.__optimize = optimize
+        self.__typecheck = typecheck
+
+    def __call__(
+        self,
+        *,
+        lazy: bool = False,
+        optimize: MaybeNone[bool] = None,
+        typecheck: MaybeNone[TypecheckMode] = None,
+    ) -> _Using:
+        """Returns configured 'using' keyword."""
+        return self.__class__(lazy=lazy, optimize=optimize, typecheck=typecheck)
 
     def __rshift__(self, lname: UsingType) -> _Unprintable:
-        """Initializing petuhlang (unprintable)."""
+        """Initializing petuhlang (unprintable).
+
+        The module is found by the caller frame, or can be passed
+        explicitly: ``using >> ("petuhlang", __name__)``.
+        """
+        module_name: MaybeNone[str] = None
+        if isinstance(lname, tuple):
+            lname, module_name = lname
+
         self.__check_using(lname)
+        if self.__typecheck is not None and self.__typecheck not in TYPECHECK_MODES:
+            raise ValueError(f"Typecheck mode must be one of {sorted(TYPECHECK_MODES)}")
+        frame = sys._getframe(1)
+        # Only functions of the calling file, `using >>` again resets them.
+        get_current_runtime().set_modes(
+            frame.f_code.co_filename,
+            optimize=self.__optimize,
+            typecheck=self.__typecheck,
+        )
         self.__setup_builtins()
-        self.__add_missing_objects()
+        if (filename := _find_module_file(module_name, frame)) is not None:
+            self.__add_missing_objects(filename)
         return _Unprintable()
 
     def __setup_builtins(self):
         """Adding petuh-builtins to python builtins."""
-        for bname, bvalue in __pbuiltins__.items():
-            global_.update({bname: bvalue})
+        get_current_runtime().bind_many(__pbuiltins__.items())
 
     def __check_using(self, lname: UsingType, /) -> None:
         """Checking for `using` name."""
         if lname.lower() != PetuhLangEnum.name:
             raise TypeError(f"{PetuhLangEnum.name} expected, got {lname}")
 
-    def __add_missing_objects(self) -> None:
+    def __add_missing_objects(self, filename: str, /) -> None:
         """Adding petuh-functions and petuh-classes to python builtins."""
-        parsed_objects = dataclasses.asdict(parse_current_file())
+        runtime = get_current_runtime()
+        if os.path.isfile(filename):
+            parsed_objects = vars(parse_module(filename))
+        elif (source := runtime.source(filename)) is not None:
+            # Scripts without a file, run by ``Runtime.run_source``.
+            parsed_objects = vars(parse_source(source))
+        else:
+            return
         for obj_category in parsed_objects:
-            strategy = Strategy(obj_category)
-            for item in parsed_objects[obj_category]:
-                global_[item] = strategy.get_default(item)
+            if self.__lazy:
+                runtime.bind_many(
+                    (item, LazyDefault(obj_category, item, runtime=runtime))
+                    for item in parsed_objects[obj_category]
+                )
+            else:
+                from ._strategy import Strategy
+
+                strategy = Strategy(obj_category)
+                runtime.bind_many(
+                    (item, strategy.get_default(item))
+                    for item in parsed_objects[obj_category]
+                )
 
 
 @dataclasses.dataclass()
@@ -99,6 +206,9 @@ class Builtins:
     """petuhlang builtins."""
 
     function: _Function = dataclasses.field(default=function)
+    asyncfunction: _AsyncFunction = dataclasses.field(default=asyncfunction)
+    memo: _Memo = dataclasses.field(default=memo)
+    persist: _Persist = dataclasses.field(default=persist)
     pyclass: _PyClass = dataclasses.field(default=pyclass)
     arg: Arg = dataclasses.field(default=Arg)
     then: _Then = dataclasses.field(default=then)
@@ -107,6 +217,19 @@ class Builtins:
     retrieve: _Retrieve = dataclasses.field(default=retrieve)
 
 
+def __getattr__(name: str) -> typing.Any:
+    """Importing preload only when it is used."""
+    if name == "preload":
+        from ._preload import preload
+
+        return preload
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 using = _Using()
 
-__pbuiltins__: BuiltinsType = dataclasses.asdict(Builtins())
+# Not `dataclasses.asdict`, builtins must be the same objects (not deep copies).
+__pbuiltins__: BuiltinsType = {
+    field.name: field.default for field in dataclasses.fields(Builtins)
+}
@@ -21,6 +21,8 @@
 # SOFTWARE.
 """Enumerations for ANSI codes."""
 
+import sys
+
 from petuhlang.enum import Enum, only
 
 
@@ -34,9 +36,18 @@ class AnsiBase(Enum):
     CSI = "\033["
 
     def __getitem__(self, item: str) -> str:
-        return to_ansi(self.__members__[item])
+        return self.__codes__[item]
+
+
+def _with_codes(cls: type) -> type:
+    """Building escape sequences of all members once, when the enum is created."""
+    cls.__codes__ = {
+        name: sys.intern(to_ansi(code)) for name, code in cls.__members__.items()
+    }
+    return cls
 
 
+@_with_codes
 @only(int)
 class ColorEnum(AnsiBase):
     BLACK = 30
@@ -59,6 +70,7 @@ class ColorEnum(AnsiBase):
     LIGHT_WHITE = 97
 
 
+@_with_codes
 @only(int)
 class BackgroundEnum(AnsiBase):
     BLACK = 40
@@ -81,6 +93,7 @@ class BackgroundEnum(AnsiBase):
     LIGHT_WHITE = 107
 
 
+@_with_codes
 @only(int)
 class EffectEnum(AnsiBase):
     RESET = 0
@@ -23,7 +23,9 @@
 
 from __future__ import annotations
 
+import sys
 import typing
+import itertools
 
 from .enums import (
     AnsiBase,
@@ -31,7 +33,7 @@ from .enums import (
     background as background_,
     effect as effect_,
 )
-from petuhlang.utils import on_windows
+from . import terminal
 
 if typing.TYPE_CHECKING:
     from petuhlang.types.maybe import MaybeNone
@@ -62,14 +64,71 @@ if typing.TYPE_CHECKING:
     color_: AnsiBase
 
 
-__all__: tuple[str, ...] = ("cprint",)
+__all__: tuple[str, ...] = ("cprint", "cprint_many", "Style")
 
 
-if on_windows():
-    import ctypes
+_RESET: typing.Final[str] = effect_["RESET"]
+# Prefix of every (color, background, effect) combination, built once.
+_PREFIXES: typing.Final[dict[tuple[str, MaybeNone[str], MaybeNone[str]], str]] = {
+    (color, background, effect): sys.intern(
+        _RESET
+        + color_[color]
+        + (background_[background] if background is not None else "")
+        + (effect_[effect] if effect is not None else "")
+    )
+    for color, background, effect in itertools.product(
+        color_.__codes__,
+        (None, *background_.__codes__),
+        (None, *(name for name in effect_.__codes__ if name != "RESET")),
+    )
+}
 
-    kernel32 = ctypes.windll.kernel32
-    kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), 7)
+
+def _render_ansi(prefix: str, message: str, /) -> str:
+    return prefix + message + _RESET
+
+
+def _render_plain(prefix: str, message: str, /) -> str:
+    return message
+
+
+def _render_detect(prefix: str, message: str, /) -> str:
+    # The terminal is checked on first use, not when petuhlang is imported.
+    _select_renderer()
+    return _render(prefix, message)
+
+
+_render: typing.Callable[[str, str], str] = _render_detect
+
+
+def _select_renderer() -> None:
+    """Choosing the renderer by the color level (see :mod:`terminal`)."""
+    global _render
+
+    _render = _render_ansi if terminal.get_color_level() else _render_plain
+
+
+class Style:
+    """Reusable combination of color, background and effect."""
+
+    __slots__ = ("prefix",)
+
+    def __init__(
+        self,
+        color: _AllowedColorsType,
+        /,
+        *,
+        effect: MaybeNone[_EffectType] = None,
+        background: MaybeNone[_AllowedColorsType] = None,
+    ) -> None:
+        self.prefix = _PREFIXES[(color, background, effect)]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.prefix!r}>"
+
+    def render(self, message: str, /) -> str:
+        """Returns the styled message (plain, if colors are disabled)."""
+        return _render(self.prefix, message)
 
 
 def cprint(
@@ -81,14 +140,43 @@ def cprint(
     effect: MaybeNone[_EffectType] = None,
     background: MaybeNone[_AllowedColorsType] = None,
 ) -> MaybeNone[str]:
-    to_print = effect_["RESET"] + color_[color]
-    if background is not None:
-        to_print += background_[background]
+    final = _render(_PREFIXES[(color, background, effect)], message)
+    if return_str:
+        return final
+
+    print(final)
+
+
+def cprint_many(
+    segments: typing.Iterable[tuple[str, MaybeNone[Style]]],
+    /,
+    *,
+    sep: str = "",
+    return_str: bool = False,
+) -> MaybeNone[str]:
+    """``function``
+
+    Printing many styled segments at once (with a single join).
+
+    segments: :class:`typing.Iterable[tuple[str, MaybeNone[Style]]]` [Positional-only]
+        Messages and their styles, messages without style are not colored.
+
+    sep: :class:`str` = "" [Keyword-only]
+        Separator of the segments.
 
-    if effect is not None:
-        to_print += effect_[effect]
+    return_str: :class:`bool` = False [Keyword-only]
+        Whether to return the string instead of printing it.
+    """
+    if _render is _render_detect:
+        _select_renderer()
 
-    final = to_print + message + effect_["RESET"]
+    if _render is _render_plain:
+        final = sep.join(message for message, _ in segments)
+    else:
+        final = sep.join(
+            message if style is None else style.prefix + message + _RESET
+            for message, style in segments
+        )
     if return_str:
         return final
 
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Terminal color capabilities."""
+
+from __future__ import annotations
+
+import os
+import sys
+import enum
+import typing
+
+from petuhlang.utils import on_windows
+
+if typing.TYPE_CHECKING:
+    from petuhlang.types import MaybeNone
+
+
+__all__: tuple[str, ...] = (
+    "ColorLevelEnum",
+    "detect_color_level",
+    "get_color_level",
+    "set_color_level",
+)
+
+
+class ColorLevelEnum(int, enum.Enum):
+    none = 0
+    basic = 1
+    ansi256 = 2
+    truecolor = 3
+
+
+_FORCE_COLOR_LEVELS: typing.Final[dict[str, ColorLevelEnum]] = {
+    "0": ColorLevelEnum.none,
+    "false": ColorLevelEnum.none,
+    "": ColorLevelEnum.basic,
+    "1": ColorLevelEnum.basic,
+    "true": ColorLevelEnum.basic,
+    "2": ColorLevelEnum.ansi256,
+    "3": ColorLevelEnum.truecolor,
+}
+
+_color_level: MaybeNone[ColorLevelEnum] = None
+
+
+def _enable_windows_vt(stream: typing.TextIO, /) -> bool:
+    """Enabling ANSI escape sequences in the Windows console."""
+    import ctypes
+
+    try:
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-12 if stream is sys.stderr else -11)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+def detect_color_level(
+    stream: MaybeNone[typing.TextIO] = None,
+    /,
+    *,
+    environ: MaybeNone[typing.Mapping[str, str]] = None,
+) -> ColorLevelEnum:
+    """``function``
+
+    Detecting colors supported by the terminal of the stream.
+
+    `NO_COLOR` disables colors, `FORCE_COLOR` (0-3, "true", "false" or
+    empty) enables them even for files and pipes, `TERM=dumb` and streams
+    which aren't terminals get no colors.
+
+    stream: :class:`MaybeNone[typing.TextIO]` = None [Positional-only]
+        Stream to check, `sys.stdout` by default.
+
+    environ: :class:`MaybeNone[typing.Mapping[str, str]]` = None [Keyword-only]
+        Environment variables, `os.environ` by default.
+    """
+    stream = sys.stdout if stream is None else stream
+    environ = os.environ if environ is None else environ
+
+    if environ.get("NO_COLOR"):
+        return ColorLevelEnum.none
+
+    if (force := environ.get("FORCE_COLOR")) is not None:
+        return _FORCE_COLOR_LEVELS.get(force.strip().lower(), ColorLevelEnum.basic)
+
+    term = environ.get("TERM", "")
+    if term == "dumb":
+        return ColorLevelEnum.none
+
+    try:
+        if stream is None or not stream.isatty():
+            return ColorLevelEnum.none
+    except (AttributeError, ValueError):
+        return ColorLevelEnum.none
+
+    if on_windows() and not _enable_windows_vt(stream):
+        return ColorLevelEnum.none
+
+    if environ.get("COLORTERM", "").lower() in {"truecolor", "24bit"}:
+        return ColorLevelEnum.truecolor
+
+    if "256" in term:
+        return ColorLevelEnum.ansi256
+
+    return ColorLevelEnum.basic
+
+
+def get_color_level() -> ColorLevelEnum:
+    """``function``
+
+    Returns the color level of stdout (detected once, see :func:`set_color_level`).
+    """
+    global _color_level
+
+    if _color_level is None:
+        _color_level = detect_color_level()
+    return _color_level
+
+
+def set_color_level(level: MaybeNone[ColorLevelEnum | int]) -> None:
+    """``function``
+
+    Overriding the detected color level.
+
+    level: :class:`MaybeNone[ColorLevelEnum | int]`
+        New color level, None to detect it again on next use.
+    """
+    global _color_level
+
+    from . import impl
+
+    if level is None:
+        _color_level = None
+        impl._render = impl._render_detect
+    else:
+        _color_level = ColorLevelEnum(level)
+        impl._select_renderer()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Command line interface of petuhlang."""
+
+from __future__ import annotations
+
+import typing
+import argparse
+
+if typing.TYPE_CHECKING:
+    from petuhlang.types import MaybeNone
+
+
+__all__: tuple[str, ...] = ("main",)
+
+
+def _preload_command(arguments: argparse.Namespace, /) -> int:
+    from petuhlang._preload import preload
+
+    modules = preload(arguments.paths, workers=arguments.workers)
+    symbols = sum(len(index.symbols) for index in modules.values())
+    print(f"Preloaded {len(modules)} petuhlang modules ({symbols} definitions).")
+    return 0
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="petuhlang")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    preload_parser = commands.add_parser(
+        "preload", help="parse petuhlang modules ahead of time and fill the parse cache"
+    )
+    preload_parser.add_argument("paths", nargs="+", help="files or directories")
+    preload_parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="number of worker processes"
+    )
+    preload_parser.set_defaults(handler=_preload_command)
+
+    return parser
+
+
+def main(argv: MaybeNone[typing.Sequence[str]] = None) -> int:
+    """``function``
+
+    Entry point of ``python -m petuhlang``.
+
+    argv: :class:`MaybeNone[typing.Sequence[str]]` = None
+        Command line arguments, `sys.argv[1:]` if None.
+    """
+    arguments = _make_parser().parse_args(argv)
+    return arguments.handler(arguments)
@@ -24,20 +24,143 @@ from __future__ import annotations
 
 import typing
 
+from .writers import WriterABC, DirectWriter, BufferedWriter, AsyncWriter
+from .formatters import LevelEnum, FormatterABC, TextFormatter, JsonLinesFormatter
+
 if typing.TYPE_CHECKING:
+    from petuhlang.types import MaybeNone
+
+    from .writers import QueuePolicy
+    from .formatters import LevelType
+
     T = typing.TypeVar("T")
+    ConsoleMode = typing.Literal["direct", "buffered", "async"]
+    FormatType = typing.Literal["text", "json"]
 
 
 __all__: tuple[str, ...] = ("console",)
 
 
+def _disabled(*args: typing.Any, **kwargs: typing.Any) -> None:
+    """Method of the disabled level, nothing is formatted."""
+
+
 class _Console:
     """All available actions with the console in petuhlang."""
 
+    def __init__(self) -> None:
+        self.__writer: WriterABC = DirectWriter()
+        self.__formatter: FormatterABC = TextFormatter()
+        self.set_level("info")
+
+    def debug(self, message: typing.Any, /, **context: typing.Any) -> None:
+        """Printing the debug record (with key/value context)."""
+        self.__writer.write(self.__formatter.format(LevelEnum.debug, message, context))
+
+    def info(self, message: typing.Any, /, **context: typing.Any) -> None:
+        """Printing the info record (with key/value context)."""
+        self.__writer.write(self.__formatter.format(LevelEnum.info, message, context))
+
+    def warn(self, message: typing.Any, /, **context: typing.Any) -> None:
+        """Printing the warning record (with key/value context)."""
+        self.__writer.write(self.__formatter.format(LevelEnum.warn, message, context))
+
+    def error(self, message: typing.Any, /, **context: typing.Any) -> None:
+        """Printing the error record (with key/value context)."""
+        self.__writer.write(self.__formatter.format(LevelEnum.error, message, context))
+
+    def set_level(self, level: LevelType, /) -> None:
+        """``method``
+
+        Setting the lowest printed level for the whole process.
+
+        level: :class:`typing.Literal["debug", "info", "warn", "error"]` [Positional-only]
+            Records of lower levels are skipped before formatting.
+        """
+        threshold = LevelEnum[level]
+        for item in LevelEnum:
+            if item >= threshold:
+                # Back to the class method.
+                self.__dict__.pop(item.name, None)
+            else:
+                setattr(self, item.name, _disabled)
+
+    def set_format(self, format_: FormatType, /) -> None:
+        """``method``
+
+        Setting the format of leveled records.
+
+        format_: :class:`typing.Literal["text", "json"]` [Positional-only]
+            "text" prints ``[INFO] message key='value'``, "json" prints
+            JSON lines (see :class:`JsonLinesFormatter`).
+        """
+        if format_ == "text":
+            self.__formatter = TextFormatter()
+        elif format_ == "json":
+            self.__formatter = JsonLinesFormatter()
+        else:
+            raise ValueError(f"Unknown console format {format_!r}")
+
     def log(self, *values: typing.Sequence[T]) -> None:
         """Printing any values."""
-        for val in values:
-            print(val)
+        self.__writer.write("".join(f"{val}\n" for val in values))
+
+    async def alog(self, *values: typing.Sequence[T]) -> None:
+        """Printing any values in a worker thread, so slow stdout doesn't block the event loop."""
+        import asyncio
+
+        await asyncio.to_thread(self.log, *values)
+
+    def flush(self) -> None:
+        """Writing everything which is held by the console writer."""
+        self.__writer.flush()
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped by the "async" writer with a full queue."""
+        return self.__writer.dropped
+
+    def configure(
+        self,
+        *,
+        mode: ConsoleMode = "direct",
+        buffer_size: int = 65536,
+        interval: MaybeNone[float] = None,
+        maxsize: int = 10000,
+        policy: QueuePolicy = "block",
+    ) -> None:
+        """``method``
+
+        Changing how the console output is written.
+
+        mode: :class:`typing.Literal["direct", "buffered", "async"]` = "direct" [Keyword-only]
+            "direct" writes every `log` call at once, "buffered" joins
+            them and writes in bulk (see :class:`BufferedWriter`), "async"
+            queues them for a writer thread (see :class:`AsyncWriter`).
+
+        buffer_size: :class:`int` = 65536 [Keyword-only]
+            Characters held by the buffered writer before writing.
+
+        interval: :class:`MaybeNone[float]` = None [Keyword-only]
+            Seconds after which the buffered writer writes anyway.
+
+        maxsize: :class:`int` = 10000 [Keyword-only]
+            Records queued by the async writer.
+
+        policy: :class:`typing.Literal["block", "drop-oldest", "drop-newest"]` = "block" [Keyword-only]
+            What the async writer does with a full queue.
+        """
+        if mode == "direct":
+            writer: WriterABC = DirectWriter()
+        elif mode == "buffered":
+            writer = BufferedWriter(buffer_size=buffer_size, interval=interval)
+        elif mode == "async":
+            writer = AsyncWriter(maxsize=maxsize, policy=policy)
+        else:
+            raise ValueError(f"Unknown console mode {mode!r}")
+
+        old, self.__writer = self.__writer, writer
+        old.close()
 
 
 console = _Console()
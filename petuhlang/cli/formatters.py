@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Console record formatters (plain text and JSON lines)."""
+
+from __future__ import annotations
+
+import abc
+import enum
+import math
+import time
+import typing
+import threading
+
+if typing.TYPE_CHECKING:
+    LevelType = typing.Literal["debug", "info", "warn", "error"]
+
+
+__all__: tuple[str, ...] = (
+    "LevelEnum",
+    "FormatterABC",
+    "TextFormatter",
+    "JsonLinesFormatter",
+)
+
+
+class LevelEnum(int, enum.Enum):
+    debug = 10
+    info = 20
+    warn = 30
+    error = 40
+
+
+class FormatterABC(metaclass=abc.ABCMeta):
+    """Base console record formatter."""
+
+    @abc.abstractmethod
+    def format(
+        self, level: LevelEnum, message: typing.Any, context: dict[str, typing.Any], /
+    ) -> str:
+        """Returns the record line (with the line break)."""
+
+
+class TextFormatter(FormatterABC):
+    """``[INFO] message key=value``"""
+
+    def format(
+        self, level: LevelEnum, message: typing.Any, context: dict[str, typing.Any], /
+    ) -> str:
+        if not context:
+            return f"[{level.name.upper()}] {message}\n"
+
+        fields = " ".join(f"{key}={value!r}" for key, value in context.items())
+        return f"[{level.name.upper()}] {message} {fields}\n"
+
+
+# Keys of every JSON record, context keys with these names are prefixed.
+_RESERVED_KEYS: typing.Final[frozenset[str]] = frozenset({"time", "level", "message"})
+_CONTEXT_PREFIX: typing.Final[str] = "context."
+# Fragments of this many key orders are kept, others are built per record.
+_MAX_FRAGMENTS: typing.Final[int] = 1024
+
+# Bound by the first JsonLinesFormatter, text output doesn't import `json`.
+_encode_string: typing.Callable[[str], str]
+_dumps: typing.Callable[..., str]
+
+
+def _import_json() -> None:
+    global _encode_string, _dumps
+
+    import json
+
+    _encode_string = json.encoder.encode_basestring_ascii
+    _dumps = json.dumps
+
+
+def _encode_value(value: typing.Any, /) -> str:
+    """JSON of the value, common types don't go through `json.dumps`."""
+    value_type = type(value)
+    if value_type is str:
+        return _encode_string(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is float:
+        # NaN and Infinity aren't valid JSON, they are written as strings.
+        if math.isfinite(value):
+            return float.__repr__(value)
+        return _encode_string(float.__repr__(value))
+    if value is None:
+        return "null"
+    if value_type is bool:
+        return "true" if value else "false"
+    try:
+        return _dumps(value, default=str, allow_nan=False)
+    except (TypeError, ValueError, RecursionError):
+        # Non-finite floats or non-string keys inside the value, circular
+        # references, too deep nesting: written as the str() of the value.
+        pass
+    try:
+        return _encode_string(str(value))
+    except Exception:
+        return _encode_string(object.__repr__(value))
+
+
+class JsonLinesFormatter(FormatterABC):
+    """``{"time": ..., "level": "info", "message": ..., "key": value}``
+
+    Fragments of the keys (``,"key":``) are built once for every order of
+    context keys (up to 1024 orders) and then reused, only the values are
+    encoded per record.
+    Context keys named "time", "level" or "message" are written with the
+    "context." prefix, non-finite floats are written as strings.
+    """
+
+    def __init__(self) -> None:
+        _import_json()
+        self.__prefixes = {
+            level: f',"level":"{level.name}","message":' for level in LevelEnum
+        }
+        self.__fragments: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self.__lock = threading.Lock()
+
+    def format(
+        self, level: LevelEnum, message: typing.Any, context: dict[str, typing.Any], /
+    ) -> str:
+        parts = [
+            '{"time":',
+            float.__repr__(time.time()),
+            self.__prefixes[level],
+            _encode_value(message if type(message) is str else str(message)),
+        ]
+        if context:
+            keys = tuple(context)
+            if (fragments := self.__fragments.get(keys)) is None:
+                fragments = self.__fragments_of(keys)
+
+            for fragment, value in zip(fragments, context.values()):
+                parts.append(fragment)
+                parts.append(_encode_value(value))
+
+        parts.append("}\n")
+        return "".join(parts)
+
+    def __fragments_of(self, keys: tuple[str, ...], /) -> tuple[str, ...]:
+        fragments = tuple(
+            f",{_encode_string(_CONTEXT_PREFIX + key)}:"
+            if key in _RESERVED_KEYS
+            else f",{_encode_string(key)}:"
+            for key in keys
+        )
+        with self.__lock:
+            if len(self.__fragments) >= _MAX_FRAGMENTS:
+                # Call sites with varying keys, the cache doesn't grow forever.
+                return fragments
+            return self.__fragments.setdefault(keys, fragments)
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Console writers (where and when ``console`` output is written)."""
+
+from __future__ import annotations
+
+import os
+import abc
+import sys
+import time
+import atexit
+import typing
+import weakref
+import threading
+import collections
+
+from petuhlang.utils import capture_active, real_stdout
+
+if typing.TYPE_CHECKING:
+    from types import TracebackType
+
+    from petuhlang.types import MaybeNone
+
+    ExcType = typing.Type[BaseException]
+    QueuePolicy = typing.Literal["block", "drop-oldest", "drop-newest"]
+
+
+__all__: tuple[str, ...] = ("WriterABC", "DirectWriter", "BufferedWriter", "AsyncWriter")
+
+QUEUE_POLICIES: typing.Final[frozenset[str]] = frozenset(
+    {"block", "drop-oldest", "drop-newest"}
+)
+
+
+class WriterABC(metaclass=abc.ABCMeta):
+    """Base console writer."""
+
+    @abc.abstractmethod
+    def write(self, text: str, /) -> None:
+        """Writing the formatted record."""
+
+    def flush(self) -> None:
+        """Writing everything which is held by the writer."""
+
+    def close(self) -> None:
+        """Flushing, the writer isn't used anymore."""
+        self.flush()
+
+    @property
+    def dropped(self) -> int:
+        """Number of records which were never written."""
+        return 0
+
+    def _reset_after_fork(self) -> None:
+        """Dropping threads, locks and records inherited by the forked child."""
+
+
+class DirectWriter(WriterABC):
+    """Writes every record with one write call (`print` makes one per value)."""
+
+    def write(self, text: str, /) -> None:
+        sys.stdout.write(text)
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+
+class BufferedWriter(WriterABC):
+    """Joins records and writes them in bulk.
+
+    The buffer is written when it holds `buffer_size` characters, when
+    `interval` seconds passed since the last write (a background thread
+    writes records of an idle program), on :meth:`flush`, at exit and
+    before an uncaught exception is printed. Records of intercepted
+    blocks (``then [...]``) are written through.
+    """
+
+    def __init__(
+        self, *, buffer_size: int = 65536, interval: MaybeNone[float] = None
+    ) -> None:
+        if interval is not None and interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+
+        self.__buffer_size = buffer_size
+        self.__interval = interval
+        self.__records: list[str] = []
+        self.__size = 0
+        self.__flushed_at = time.monotonic()
+        self.__condition = threading.Condition()
+        self.__closed = False
+        self.__timer: MaybeNone[threading.Thread] = None
+        _register_exit_flush(self)
+        _fork_writers.add(self)
+
+    def write(self, text: str, /) -> None:
+        if capture_active():
+            sys.stdout.write(text)
+            return
+
+        with self.__condition:
+            self.__records.append(text)
+            self.__size += len(text)
+            if self.__size < self.__buffer_size and (
+                self.__interval is None
+                or time.monotonic() - self.__flushed_at < self.__interval
+            ):
+                if self.__interval is not None and not self.__closed:
+                    if self.__timer is None:
+                        self.__start()
+                    elif len(self.__records) == 1:
+                        # The timer sleeps without a deadline while empty.
+                        self.__condition.notify()
+                return
+
+            self.__write()
+
+    def flush(self) -> None:
+        with self.__condition:
+            self.__write()
+
+    def close(self) -> None:
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        if self.__timer is not None and self.__timer is not threading.current_thread():
+            self.__timer.join()
+        self.flush()
+        _unregister_exit_flush(self)
+
+    def _reset_after_fork(self) -> None:
+        # The timer doesn't exist in the child, buffered records are the parent's.
+        self.__records = []
+        self.__size = 0
+        self.__condition = threading.Condition()
+        self.__timer = None
+
+    def __start(self) -> None:
+        self.__timer = threading.Thread(
+            target=self.__tick, name="petuhlang-console-flush", daemon=True
+        )
+        self.__timer.start()
+
+    def __tick(self) -> None:
+        interval = typing.cast(float, self.__interval)
+        with self.__condition:
+            while not self.__closed:
+                if not self.__records:
+                    self.__condition.wait()
+                elif (timeout := self.__flushed_at + interval - time.monotonic()) > 0:
+                    self.__condition.wait(timeout)
+                else:
+                    try:
+                        self.__write()
+                    except Exception:
+                        # Retried at the next interval.
+                        self.__flushed_at = time.monotonic()
+
+    def __write(self) -> None:
+        if self.__records:
+            stdout = real_stdout()
+            stdout.write("".join(self.__records))
+            stdout.flush()
+            self.__records.clear()
+            self.__size = 0
+        self.__flushed_at = time.monotonic()
+
+
+class AsyncWriter(WriterABC):
+    """Queues records, one background thread writes them.
+
+    Writing a record only appends it to a bounded queue, so a slow stdout
+    doesn't slow down the code which logs. When the queue is full, the
+    `policy` decides: "block" waits for space, "drop-oldest" replaces the
+    oldest queued record, "drop-newest" discards the new one (both are
+    counted in :attr:`dropped`). The queue is drained by :meth:`flush`,
+    at exit and before an uncaught exception is printed.
+    """
+
+    def __init__(self, *, maxsize: int = 10000, policy: QueuePolicy = "block") -> None:
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"policy must be one of {sorted(QUEUE_POLICIES)}, got {policy!r}")
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+
+        self.__maxsize = maxsize
+        self.__policy = policy
+        self.__queue: collections.deque[str] = collections.deque()
+        self.__condition = threading.Condition()
+        self.__writing = self.__closed = False
+        self.__dropped_oldest = self.__dropped_newest = 0
+        self.__thread: MaybeNone[threading.Thread] = None
+        _register_exit_flush(self)
+        _fork_writers.add(self)
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped_oldest + self.__dropped_newest
+
+    @property
+    def dropped_oldest(self) -> int:
+        return self.__dropped_oldest
+
+    @property
+    def dropped_newest(self) -> int:
+        return self.__dropped_newest
+
+    def write(self, text: str, /) -> None:
+        if capture_active() or self.__closed:
+            sys.stdout.write(text)
+            return
+
+        with self.__condition:
+            if self.__thread is None:
+                self.__start()
+
+            if len(self.__queue) >= self.__maxsize:
+                if self.__policy == "drop-newest":
+                    self.__dropped_newest += 1
+                    return
+                if self.__policy == "drop-oldest":
+                    self.__queue.popleft()
+                    self.__dropped_oldest += 1
+                else:
+                    self.__condition.wait_for(
+                        lambda: len(self.__queue) < self.__maxsize
+                    )
+
+            self.__queue.append(text)
+            self.__condition.notify_all()
+
+    def flush(self) -> None:
+        with self.__condition:
+            if self.__thread is None or self.__thread is threading.current_thread():
+                return
+            self.__condition.wait_for(lambda: not self.__queue and not self.__writing)
+
+    def close(self) -> None:
+        self.flush()
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+        _unregister_exit_flush(self)
+
+    def _reset_after_fork(self) -> None:
+        # The thread doesn't exist in the child, queued records are the parent's.
+        self.__queue = collections.deque()
+        self.__condition = threading.Condition()
+        self.__writing = False
+        self.__dropped_oldest = self.__dropped_newest = 0
+        self.__thread = None
+
+    def __start(self) -> None:
+        self.__thread = threading.Thread(
+            target=self.__run, name="petuhlang-console", daemon=True
+        )
+        self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__queue or self.__closed)
+                if not self.__queue:
+                    return
+
+                records = "".join(self.__queue)
+                self.__queue.clear()
+                self.__writing = True
+                # Producers blocked by the full queue.
+                self.__condition.notify_all()
+
+            try:
+                stdout = real_stdout()
+                stdout.write(records)
+                stdout.flush()
+            except Exception:
+                pass
+            finally:
+                with self.__condition:
+                    self.__writing = False
+                    self.__condition.notify_all()
+
+
+# Writers which hold records, flushed at exit and on uncaught exceptions.
+_exit_writers: list[WriterABC] = []
+_excepthook_installed = False
+# Writers with background threads, reset in forked children.
+_fork_writers: weakref.WeakSet[WriterABC] = weakref.WeakSet()
+
+
+def _reset_fork_writers() -> None:
+    for writer in tuple(_fork_writers):
+        writer._reset_after_fork()
+
+
+def _flush_exit_writers() -> None:
+    for writer in tuple(_exit_writers):
+        try:
+            writer.flush()
+        except Exception:
+            pass
+
+
+def _excepthook(
+    exc_type: ExcType, exc_val: BaseException, exc_tb: MaybeNone[TracebackType]
+) -> None:
+    # Records written before the error are printed before the traceback.
+    _flush_exit_writers()
+    _previous_excepthook(exc_type, exc_val, exc_tb)
+
+
+def _register_exit_flush(writer: WriterABC, /) -> None:
+    global _excepthook_installed, _previous_excepthook
+
+    _exit_writers.append(writer)
+    if not _excepthook_installed:
+        _excepthook_installed = True
+        _previous_excepthook = sys.excepthook
+        sys.excepthook = _excepthook
+        atexit.register(_flush_exit_writers)
+
+
+def _unregister_exit_flush(writer: WriterABC, /) -> None:
+    if writer in _exit_writers:
+        _exit_writers.remove(writer)
+
+
+_previous_excepthook = sys.excepthook
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_fork_writers)
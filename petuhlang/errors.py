@@ -23,7 +23,6 @@
 
 import typing
 
-import petuhlang.cli.colors.impl as cli  # circular
 from petuhlang.types import ClsDecoratorT
 
 
@@ -42,6 +41,12 @@ __all__: tuple[str, ...] = (
     # Function errors.
     "FunctionError",
     "BadFunctionArgError",
+    "ArgumentTypeError",
+    "UnsupportedFunctionError",
+    # Then errors.
+    "ThenError",
+    "ParallelBlocksError",
+    "BadPipelineStepError",
     # Class errors.
     "ClassError",
     "BadParentClassPassedError",
@@ -62,15 +67,23 @@ def _with_error_manipulator(*, template: str = _DEFAULT_TEMPLATE) -> ClsDecorato
         Default error template.
     """
 
-    def inner(cls: type) -> type:
-        cls.__str__ = lambda self: (
-            cli.cprint(
+    style = None
+
+    def __str__(self: Exception) -> str:
+        nonlocal style
+
+        if style is None:
+            # Colors are imported on demand (circular, and most errors are never printed).
+            import petuhlang.cli.colors.impl as cli
+
+            style = cli.Style("LIGHT_WHITE")
+
+        return (
+            style.render(
                 f"\n"
                 # Skipping to new line.
-                f"{template}",
+                f"{template}"
                 # Using template in at the beginning of the error message.
-                color="LIGHT_WHITE",
-                return_str=True,
             )
             # Making the beginning of the error message of a different color.
             + f"{self.args[0]}\n"
@@ -81,6 +94,9 @@ def _with_error_manipulator(*, template: str = _DEFAULT_TEMPLATE) -> ClsDecorato
             + ("^" * len(self.args[0]))
             # Creating arrows to highlight the error.
         )
+
+    def inner(cls: type) -> type:
+        cls.__str__ = __str__
         return cls
 
     return inner
@@ -128,6 +144,33 @@ class BadFunctionArgError(FunctionError):
     """Raised when bad function argument passed."""
 
 
+class ArgumentTypeError(FunctionError):
+    """Raised when the function is called with an argument of the wrong type."""
+
+
+class UnsupportedFunctionError(FunctionError):
+    """Raised when the keyword can't be applied to the petuh-function."""
+
+
+# then
+class ThenError(PetuhError):
+    """Base then error."""
+
+
+class ParallelBlocksError(ThenError):
+    """Raised when blocks of `then.parallel [...]` failed, all errors are in `exceptions`."""
+
+    def __init__(
+        self, message: str, /, *, exceptions: typing.Sequence[BaseException]
+    ) -> None:
+        super().__init__(message)
+        self.exceptions = tuple(exceptions)
+
+
+class BadPipelineStepError(ThenError):
+    """Raised when non-callable step is added to the then-pipeline."""
+
+
 # classes
 class ClassError(PetuhError):
     """Base class error."""
@@ -23,13 +23,31 @@
 
 from __future__ import annotations
 
+import os
+import abc
+import sys
 import typing
+import inspect
 
-from petuhlang import PetuhObject
-from .utils import OutputInterceptor
+from petuhlang import errors, PetuhObject
+from .utils import StreamingInterceptor
+from ._functions.compiled import PetuhCompiledFunction
 
+if typing.TYPE_CHECKING:
+    import asyncio
 
-__all__: tuple[str, ...] = ("then", "function", "pyclass", "retrieve")
+    from .types import MaybeNone
+
+
+__all__: tuple[str, ...] = (
+    "then",
+    "function",
+    "asyncfunction",
+    "pyclass",
+    "retrieve",
+    "memo",
+    "persist",
+)
 
 
 class _KeywordBase(PetuhObject):
@@ -40,19 +58,97 @@ class _KeywordBase(PetuhObject):
         return self
 
 
+def _running_loop() -> MaybeNone[asyncio.AbstractEventLoop]:
+    # No loop is running if `asyncio` wasn't imported, it isn't imported for that.
+    if (asyncio := sys.modules.get("asyncio")) is None:
+        return None
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _await(awaitable: typing.Awaitable[typing.Any], /) -> typing.Any:
+    return await awaitable
+
+
+class _Parallel(PetuhObject):
+    """'then.parallel' ('then.all') keyword
+
+    ``then.parallel [fetch_a, fetch_b, fetch_c]`` runs the blocks in a
+    shared thread pool (or as tasks inside an event loop, awaited with
+    ``await then.parallel [...]``). Values are returned in order, output
+    of every block is printed after all of them, in order too.
+    """
+
+    def __getitem__(self, blocks: typing.Any) -> _Then:
+        """Overload [] operator for 'then.parallel' keyword."""
+        from . import _parallel
+
+        blocks = blocks if isinstance(blocks, tuple) else (blocks,)
+        result = _Then()
+        if _running_loop() is None:
+            result.__to_compile__ = _parallel.run_blocks(blocks)
+        else:
+            import asyncio
+
+            result.__to_compile__ = asyncio.ensure_future(
+                _parallel.run_blocks_async(blocks)
+            )
+        return result
+
+    def configure(self, *, workers: int = 8) -> None:
+        """Changing the size of the thread pool shared by all blocks."""
+        from . import _parallel
+
+        _parallel.configure(workers=workers)
+
+
 class _Then(PetuhObject):
-    """'then' keyword"""
+    """'then' keyword
+
+    ``then [...]`` runs the block at once and returns a new object with
+    the result. Awaitable blocks are awaited: with ``asyncio.run`` outside
+    an event loop, or scheduled as a task inside one (``await then[...]``).
+    ``then >> step1 >> step2`` builds a lazy pipeline (see :class:`Pipeline`).
+    """
+
+    parallel = all = _Parallel()
+
+    def __rshift__(self, other: typing.Any) -> typing.Any:
+        """Overload >> operator."""
+        if isinstance(other, _Then):
+            # `... >> then [...] >> then [...]`
+            return other
+
+        from ._pipeline import Pipeline
+
+        return Pipeline((other,))
 
     def __getitem__(self, smth: typing.Any) -> _Then:
         """Overload [] operator for 'then' keyword."""
-        with OutputInterceptor() as output:
+        # Not stored in the shared `then`, concurrent blocks would overwrite it.
+        result = self.__class__()
+        with StreamingInterceptor():
             ret = smth() if callable(smth) else smth
 
-        self.__to_compile__ = ret
+            if inspect.isawaitable(ret):
+                import asyncio
+
+                if _running_loop() is None:
+                    ret = asyncio.run(_await(ret))
+                else:
+                    # Blocking here would block the loop, the caller awaits `then`.
+                    ret = asyncio.ensure_future(ret)
+
+        result.__to_compile__ = ret
+        return result
 
-        for text in output:
-            __builtins__.print(text)
+    def __await__(self) -> typing.Generator[typing.Any, None, _Then]:
+        import asyncio
 
+        if isinstance(pending := getattr(self, "__to_compile__", None), asyncio.Future):
+            self.__to_compile__ = yield from pending
         return self
 
 
@@ -60,6 +156,107 @@ class _Function(_KeywordBase):
     """'function' keyword."""
 
 
+class _AsyncFunction(_Function):
+    """'asyncfunction' keyword."""
+
+
+class _FunctionWrapperKeyword(PetuhObject, metaclass=abc.ABCMeta):
+    """Base for keywords which wrap the petuh-function defined after them."""
+
+    def __rshift__(self, other: typing.Any) -> typing.Any:
+        """Overload >> operator."""
+        if isinstance(other, _Function):
+            # `keyword >> function`, the definition comes next.
+            return self
+
+        if not isinstance(other, PetuhCompiledFunction):
+            # Constant body (`function >> name() [value]`) needs no wrapping.
+            return other
+
+        if inspect.iscoroutinefunction(other):
+            raise errors.UnsupportedFunctionError(
+                f"{self.__class__.__name__.lstrip('_').lower()} can't be applied to async petuh-functions"
+            )
+
+        from .runtime import get_current_runtime
+
+        wrapped = self._wrap(other, filename=sys._getframe(1).f_code.co_filename)
+        get_current_runtime().bind(other.__name__, wrapped)
+        return wrapped
+
+    @abc.abstractmethod
+    def _wrap(self, fn: PetuhCompiledFunction, /, *, filename: str) -> typing.Any:
+        """Returns the wrapped petuh-function (`filename` is the defining file)."""
+
+
+class _Memo(_FunctionWrapperKeyword):
+    """'memo' keyword (memoization of petuh-functions).
+
+    ``memo(maxsize=4096, ttl=30) >> function >> name(...) [...]``
+    """
+
+    def __init__(
+        self, *, maxsize: MaybeNone[int] = 128, ttl: MaybeNone[float] = None
+    ) -> None:
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+
+    def __call__(
+        self, *, maxsize: MaybeNone[int] = 128, ttl: MaybeNone[float] = None
+    ) -> _Memo:
+        """Returns configured 'memo' keyword."""
+        return self.__class__(maxsize=maxsize, ttl=ttl)
+
+    def _wrap(self, fn: PetuhCompiledFunction, /, *, filename: str) -> typing.Any:
+        from ._functions.memo import MemoizedFunction
+
+        return MemoizedFunction(fn, maxsize=self.__maxsize, ttl=self.__ttl)
+
+
+class _Persist(_FunctionWrapperKeyword):
+    """'persist' keyword (results of petuh-functions stored between runs).
+
+    ``persist(max_age=86400, max_size=2**20) >> function >> name(...) [...]``
+
+    Results are stored in ``__petuhcache__/persist/persist.sqlite3`` next to the
+    script unless `path` is passed, the limits apply to each function.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: MaybeNone[str] = None,
+        max_size: MaybeNone[int] = None,
+        max_age: MaybeNone[float] = None,
+    ) -> None:
+        self.__path = path
+        self.__max_size = max_size
+        self.__max_age = max_age
+
+    def __call__(
+        self,
+        *,
+        path: MaybeNone[str] = None,
+        max_size: MaybeNone[int] = None,
+        max_age: MaybeNone[float] = None,
+    ) -> _Persist:
+        """Returns configured 'persist' keyword."""
+        return self.__class__(path=path, max_size=max_size, max_age=max_age)
+
+    def _wrap(self, fn: PetuhCompiledFunction, /, *, filename: str) -> typing.Any:
+        from ._cache import PERSIST_DIRNAME
+        from ._functions.persist import PersistentFunction
+
+        path = self.__path
+        if path is None:
+            directory = os.path.dirname(filename) if os.path.isfile(filename) else ""
+            path = os.path.join(directory, PERSIST_DIRNAME, "persist.sqlite3")
+
+        return PersistentFunction(
+            fn, path=path, max_size=self.__max_size, max_age=self.__max_age
+        )
+
+
 class _PyClass(_KeywordBase):
     """'pyclass' keyword."""
 
@@ -74,5 +271,8 @@ class _Retrieve(PetuhObject):
 
 then = _Then()
 function = _Function()
+asyncfunction = _AsyncFunction()
 pyclass = _PyClass()
 retrieve = _Retrieve()
+memo = _Memo()
+persist = _Persist()
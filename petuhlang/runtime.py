@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Isolated namespaces for petuhlang scripts."""
+
+from __future__ import annotations
+
+import os
+import types
+import typing
+import weakref
+import builtins
+import itertools
+import contextlib
+import contextvars
+
+if typing.TYPE_CHECKING:
+    from types import TracebackType
+
+    from petuhlang.types import MaybeNone
+    from petuhlang._functions.validation import TypecheckMode
+
+    ExcType = typing.Type[BaseException]
+
+
+__all__: tuple[str, ...] = ("Runtime", "get_current_runtime")
+
+
+class Runtime:
+    """Namespace which petuh-builtins, functions, classes and instances are bound into.
+
+    Scripts executed by the runtime see its namespace as their builtins, so
+    several runtimes can live (and run concurrently) in one process.
+    The default runtime uses python `builtins` itself.
+
+    With ``optimize`` enabled, string-bodied functions get the bound names
+    they use as closure cells, so rebinding must go through :meth:`bind`.
+    ``typecheck`` ("off", "check" or "coerce") enables validation of
+    ``arg(...) >> type`` for functions defined afterwards. Both are defaults
+    for the whole runtime, ``using(optimize=..., typecheck=...) >>`` sets
+    them only for the file which calls it (see :meth:`set_modes`).
+
+    Example:
+    --------
+
+    ```py
+    with Runtime() as runtime:
+        runtime.run("script.py")
+    ```
+    """
+
+    def __init__(self, *, namespace: MaybeNone[dict[str, typing.Any]] = None) -> None:
+        self.namespace = dict(builtins.__dict__) if namespace is None else namespace
+        self.globals: dict[str, typing.Any] = {
+            "__name__": "__petuhlang__",
+            "__builtins__": self.namespace,
+        }
+        self.optimize = False
+        self.typecheck = "off"
+        self.__bound: set[str] = set()
+        self.__cells: dict[str, types.CellType] = {}
+        # Sources of scripts without a file, while they are running.
+        self.__sources: dict[str, str] = {}
+        self.__registries: dict[str, weakref.WeakValueDictionary] = {}
+        # Modes set by `using(...) >>`, by the file which called it.
+        self.__modes: dict[str, tuple[MaybeNone[bool], MaybeNone[TypecheckMode]]] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} definitions={len(self.__bound)}>"
+
+    def __enter__(self) -> Runtime:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: ExcType | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def bind(self, name: str, value: typing.Any, /) -> None:
+        """Binding the name in the runtime namespace."""
+        self.namespace[name] = value
+        self.__bound.add(name)
+        if (cell := self.__cells.get(name)) is not None:
+            cell.cell_contents = value
+
+    def bind_many(self, items: typing.Iterable[tuple[str, typing.Any]], /) -> None:
+        """Binding many names in the runtime namespace."""
+        items = dict(items)
+        self.namespace.update(items)
+        self.__bound.update(items)
+        for name in self.__cells.keys() & items.keys():
+            self.__cells[name].cell_contents = items[name]
+
+    def is_bound(self, name: str, /) -> bool:
+        """Checks if the name was bound by the runtime."""
+        return name in self.__bound
+
+    def cell(self, name: str, /) -> types.CellType:
+        """Returns the cell which always holds the current value of the bound name."""
+        if (cell := self.__cells.get(name)) is None:
+            cell = self.__cells[name] = types.CellType(self.namespace[name])
+        return cell
+
+    def set_modes(
+        self,
+        filename: str,
+        /,
+        *,
+        optimize: MaybeNone[bool] = None,
+        typecheck: MaybeNone[TypecheckMode] = None,
+    ) -> None:
+        """``method``
+
+        Setting compile modes of functions defined in the file afterwards,
+        other files keep the modes of the runtime.
+
+        filename: :class:`str` [Positional-only]
+            File (code filename) where the functions are defined.
+
+        optimize: :class:`MaybeNone[bool]` = None [Keyword-only]
+            Binding petuh-names as closure cells, the runtime mode if None.
+
+        typecheck: :class:`MaybeNone[TypecheckMode]` = None [Keyword-only]
+            Validation of ``arg(...) >> type``, the runtime mode if None.
+        """
+        if optimize is None and typecheck is None:
+            self.__modes.pop(filename, None)
+        else:
+            self.__modes[filename] = (optimize, typecheck)
+
+    def modes(self, filename: MaybeNone[str], /) -> tuple[bool, TypecheckMode]:
+        """Returns optimize and typecheck modes of functions defined in the file."""
+        optimize, typecheck = self.__modes.get(filename, (None, None))
+        return (
+            self.optimize if optimize is None else optimize,
+            self.typecheck if typecheck is None else typecheck,
+        )
+
+    def registry(self, name: str, /) -> weakref.WeakValueDictionary:
+        """Returns the named registry of the runtime (e.g. unpickled petuh-classes).
+
+        Objects are held weakly, so they are freed with the namespace
+        they are bound into.
+        """
+        if (registry := self.__registries.get(name)) is None:
+            registry = self.__registries.setdefault(
+                name, weakref.WeakValueDictionary()
+            )
+        return registry
+
+    @contextlib.contextmanager
+    def activate(self) -> typing.Iterator[Runtime]:
+        """Making the runtime current for the running thread or task."""
+        token = _current_runtime.set(self)
+        try:
+            yield self
+        finally:
+            _current_runtime.reset(token)
+
+    def run_source(
+        self, source: str, /, *, filename: MaybeNone[str] = None
+    ) -> dict[str, typing.Any]:
+        """``method``
+
+        Executing the script in the runtime, returns the script globals.
+
+        source: :class:`str` [Positional-only]
+            Script source.
+
+        filename: :class:`MaybeNone[str]` = None [Keyword-only]
+            Script filename (used by `using >>` to find definitions),
+            a unique ``<petuhlang-N>`` name if None.
+        """
+        if filename is None:
+            filename = f"<petuhlang-{next(_script_numbers)}>"
+        code = compile(source, filename, "exec")
+        module_globals: dict[str, typing.Any] = {
+            "__name__": "__main__",
+            "__file__": filename,
+            "__builtins__": self.namespace,
+        }
+        without_file = not os.path.isfile(filename)
+        if without_file:
+            # Found by `using >>` of this runtime only, and only while running.
+            self.__sources[filename] = source
+        try:
+            with self.activate():
+                exec(code, module_globals)
+        finally:
+            if without_file:
+                self.__sources.pop(filename, None)
+
+        return module_globals
+
+    def source(self, filename: str, /) -> MaybeNone[str]:
+        """Returns the source of the running script which has no file."""
+        return self.__sources.get(filename)
+
+    def run(self, filename: str, /) -> dict[str, typing.Any]:
+        """Executing the script file in the runtime, returns the script globals."""
+        with open(filename, "r", encoding="utf-8") as file:
+            source = file.read()
+
+        return self.run_source(source, filename=filename)
+
+    def close(self) -> None:
+        """Freeing all definitions bound in the runtime."""
+        for name in self.__bound:
+            self.namespace.pop(name, None)
+        self.__bound.clear()
+
+        for cell in self.__cells.values():
+            del cell.cell_contents
+        self.__cells.clear()
+        self.__sources.clear()
+        self.__registries.clear()
+        self.__modes.clear()
+
+
+_script_numbers = itertools.count(1)
+_default_runtime = Runtime(namespace=builtins.__dict__)
+_current_runtime: contextvars.ContextVar[Runtime] = contextvars.ContextVar(
+    "petuhlang_runtime", default=_default_runtime
+)
+
+
+def get_current_runtime() -> Runtime:
+    """``utility function``
+
+    Returns the runtime of the running thread or task.
+    """
+    return _current_runtime.get()
@@ -27,10 +27,14 @@ import io
 import os
 import sys
 import typing
+import threading
+import contextvars
 
 if typing.TYPE_CHECKING:
     from types import TracebackType
 
+    from petuhlang.types import MaybeNone
+
     ExcType = typing.Type[BaseException]
 
 
@@ -40,6 +44,9 @@ __all__: tuple[str, ...] = (
     "is_builtin",
     "get_current_filename",
     "OutputInterceptor",
+    "StreamingInterceptor",
+    "capture_active",
+    "real_stdout",
 )
 
 
@@ -77,6 +84,13 @@ def is_builtin(name: str, /) -> bool:
     }
 
 
+def _isatty(stream: typing.Any, /) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
 def get_current_filename() -> str:
     """``utility function``
 
@@ -86,12 +100,88 @@ def get_current_filename() -> str:
     return __file__.split(_split_by)[-1]
 
 
+# Stream which receives stdout writes of the current thread or task.
+_capture_target: contextvars.ContextVar[MaybeNone[typing.TextIO]] = (
+    contextvars.ContextVar("petuhlang_capture_target", default=None)
+)
+_dispatcher_lock = threading.Lock()
+
+
+class _DispatchingStream(io.TextIOBase):
+    """Installed as `sys.stdout` once, routes writes by :data:`_capture_target`."""
+
+    def __init__(self, stream: typing.TextIO, /) -> None:
+        self.stream = stream
+
+    def __getattr__(self, item: str) -> typing.Any:
+        # `encoding`, `fileno`, `buffer`, ... of the real stream.
+        return getattr(self.stream, item)
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self) -> str:
+        return self.stream.encoding
+
+    @property
+    def errors(self) -> MaybeNone[str]:
+        return self.stream.errors
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def isatty(self) -> bool:
+        return _isatty(self.stream)
+
+    def write(self, text: str, /) -> int:
+        return (_capture_target.get() or self.stream).write(text)
+
+    def flush(self) -> None:
+        (_capture_target.get() or self.stream).flush()
+
+
+def _install_dispatcher() -> _DispatchingStream:
+    """Returns the stdout dispatcher, installing it if `sys.stdout` isn't one."""
+    with _dispatcher_lock:
+        if not isinstance(stdout := sys.stdout, _DispatchingStream):
+            stdout = sys.stdout = _DispatchingStream(stdout)
+        return stdout
+
+
+def real_stdout() -> typing.TextIO:
+    """``utility function``
+
+    Returns stdout without the interception (writes of any thread go there).
+    """
+    stdout = sys.stdout
+    return stdout.stream if isinstance(stdout, _DispatchingStream) else stdout
+
+
+def _current_output() -> typing.TextIO:
+    """Returns the stream stdout writes of the current context go to."""
+    return _capture_target.get() or _install_dispatcher().stream
+
+
+def capture_active() -> bool:
+    """``utility function``
+
+    Checks if stdout of the current thread or task is intercepted.
+    """
+    return _capture_target.get() is not None
+
+
 class OutputInterceptor(list):
-    """Context manager-interceptor of console output."""
+    """Context manager-interceptor of console output.
+
+    Only output of the current thread or task is intercepted (`sys.stdout`
+    isn't swapped, see :func:`capture_active`).
+    """
 
     def __enter__(self) -> OutputInterceptor:
-        self._stdout = sys.stdout
-        sys.stdout = self._stringio = io.StringIO()
+        _install_dispatcher()
+        self._stringio = io.StringIO()
+        self._token = _capture_target.set(self._stringio)
         return self
 
     def __exit__(
@@ -100,6 +190,114 @@ class OutputInterceptor(list):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
+        _capture_target.reset(self._token)
         self.extend(self._stringio.getvalue().splitlines())
         del self._stringio
-        sys.stdout = self._stdout
+
+
+class _InterceptedStream(io.TextIOBase):
+    """Stream which passes writes to :class:`StreamingInterceptor`."""
+
+    def __init__(self, interceptor: StreamingInterceptor, /) -> None:
+        # Bound method instead of a wrapper, `print` makes a write per value.
+        self.write = interceptor._write
+        self.flush = interceptor._flush
+
+    def writable(self) -> bool:
+        return True
+
+
+class StreamingInterceptor(list):
+    """Context manager-interceptor of console output which forwards it line by line.
+
+    Like :class:`OutputInterceptor` only output of the current thread or
+    task is intercepted. Unlike it nothing is held until the block ends:
+    complete lines go to the original stdout as soon as they are written
+    (a terminal) or in `buffer_size` batches (a file or a pipe, which buffer
+    anyway), only the unfinished line is held (up to `max_line` characters).
+    With ``capture=True`` the lines are also collected into the interceptor
+    (a list), ``forward=False`` only collects them.
+    """
+
+    def __init__(
+        self,
+        *,
+        capture: bool = False,
+        forward: bool = True,
+        max_line: int = 65536,
+        buffer_size: int = 8192,
+    ) -> None:
+        super().__init__()
+        self.__capture = capture
+        self.__forward = forward
+        self.__max_line = max_line
+        self.__buffer_size = buffer_size
+        self.__pending = ""
+        self.__buffer: list[str] = []
+        self.__buffered = 0
+        self.__continued = False
+
+    def __enter__(self) -> StreamingInterceptor:
+        # Forwarding to the outer interceptor (if any) or to the real stdout.
+        self._stdout = _current_output()
+        if _isatty(self._stdout):
+            self.__buffer_size = 0
+        self._token = _capture_target.set(_InterceptedStream(self))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: ExcType | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        _capture_target.reset(self._token)
+        if self.__pending:
+            # The last line ends like lines printed by `OutputInterceptor` users.
+            self.__emit(self.__pending + "\n")
+            self.__pending = ""
+        self.__flush()
+
+    def _write(self, text: str, /) -> int:
+        end = text.rfind("\n")
+        if end == -1:
+            self.__pending += text
+            if len(self.__pending) >= self.__max_line:
+                # Too long line, it's forwarded in parts.
+                self.__emit(self.__pending, complete=False)
+                self.__pending = ""
+        else:
+            self.__emit(self.__pending + text[: end + 1])
+            self.__pending = text[end + 1 :]
+        return len(text)
+
+    def _flush(self) -> None:
+        """``sys.stdout.flush()`` in the block: forwarding everything written so far."""
+        if not self.__forward:
+            return
+
+        if self.__pending:
+            self.__emit(self.__pending, complete=False)
+            self.__pending = ""
+        self.__flush()
+        self._stdout.flush()
+
+    def __flush(self) -> None:
+        if self.__buffer:
+            self._stdout.write("".join(self.__buffer))
+            self.__buffer.clear()
+            self.__buffered = 0
+
+    def __emit(self, text: str, /, *, complete: bool = True) -> None:
+        if self.__forward:
+            self.__buffer.append(text)
+            self.__buffered += len(text)
+            if self.__buffered >= self.__buffer_size:
+                self.__flush()
+        if self.__capture:
+            lines = text.splitlines()
+            if self.__continued and self:
+                # Continuation of the line which was forwarded in parts.
+                self[-1] += lines.pop(0) if lines else ""
+            self.extend(lines)
+            self.__continued = not complete
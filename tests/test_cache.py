@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of the parse cache (``__petuhcache__``)."""
+
+from __future__ import annotations
+
+import os
+import struct
+import pickle
+import pathlib
+import operator
+import threading
+
+import pytest
+
+from petuhlang import _cache
+from petuhlang._parser import build_symbol_index
+from petuhlang._cache import CACHE_DIRNAME, ParseCache
+
+SOURCE = 'from petuhlang import build\nbuild.using >> "petuhlang"\n\nfunction >> f() [1]\n'
+
+
+class CountingParser:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, source: str):
+        with self.lock:
+            self.calls += 1
+        return build_symbol_index(source)
+
+
+class Rebuilt:
+    """Entry whose object fails to rebuild, like one of another petuhlang version."""
+
+    def __init__(self, function, *args) -> None:
+        self.reduced = (function, args)
+
+    def __reduce__(self):
+        return self.reduced
+
+
+@pytest.fixture()
+def script(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "script.py"
+    path.write_text(SOURCE)
+    return path
+
+
+def _entries(directory: pathlib.Path) -> list[str]:
+    return sorted(os.listdir(directory / CACHE_DIRNAME))
+
+
+def test_hit_and_miss(script: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+
+    first = cache.parse(str(script), parser=parser)
+    second = cache.parse(str(script), parser=parser)
+    # Another instance (like a new process) reads the entry from disk.
+    third = ParseCache().parse(str(script), parser=parser)
+
+    assert first == second == third
+    assert [s.name for s in first.symbols] == ["f"]
+    assert parser.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert _entries(script.parent) == [os.path.basename(cache.cache_filename(str(script)))]
+
+
+def test_changed_source_is_parsed_again(script: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    cache.parse(str(script), parser=parser)
+
+    script.write_text(SOURCE + 'function >> g() [2]\n')
+    index = cache.parse(str(script), parser=parser)
+
+    assert [s.name for s in index.symbols] == ["f", "g"]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_same_size_and_mtime_is_checked_by_hash(script: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    cache.parse(str(script), parser=parser)
+    stat = script.stat()
+
+    script.write_text(SOURCE.replace("f()", "h()"))
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    index = cache.parse(str(script), parser=parser)
+
+    assert [s.name for s in index.symbols] == ["h"]
+    assert parser.calls == 2
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        b"not a pickle",
+        # Truncated pickle.
+        pickle.dumps(("key", "index"))[:-3],
+        # Not a (key, index) pair.
+        pickle.dumps(1),
+        pickle.dumps((1, 2, 3)),
+        # Unknown opcode and a reference to a missing memo entry.
+        b"\x80\x05\xff.",
+        b"\x80\x05h\x00.",
+        pickle.dumps(("key", Rebuilt(operator.getitem, {}, "field"))),
+        pickle.dumps(("key", Rebuilt(operator.getitem, [], 0))),
+        pickle.dumps(("key", Rebuilt(struct.unpack, "<i", b""))),
+        pickle.dumps(("key", Rebuilt(pathlib.Path, 1))),
+    ],
+)
+def test_corrupt_entry_is_replaced(script: pathlib.Path, payload: bytes) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    cache_filename = cache.cache_filename(str(script))
+    os.makedirs(os.path.dirname(cache_filename))
+    with open(cache_filename, "wb") as file:
+        file.write(payload)
+
+    assert [s.name for s in cache.parse(str(script), parser=parser).symbols] == ["f"]
+    assert cache.misses == 1
+
+    cache.parse(str(script), parser=parser)
+    assert (cache.hits, parser.calls) == (1, 1)
+
+
+def test_disabled(script: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    cache.enabled = False
+
+    cache.parse(str(script), parser=parser)
+    cache.parse(str(script), parser=parser)
+
+    assert parser.calls == 2
+    assert not (script.parent / CACHE_DIRNAME).exists()
+
+
+def test_clear(script: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    cache.parse(str(script), parser=parser)
+    (script.parent / CACHE_DIRNAME / "unrelated.txt").write_text("kept")
+
+    cache.clear(str(script.parent))
+    assert _entries(script.parent) == ["unrelated.txt"]
+
+    cache.parse(str(script), parser=parser)
+    assert parser.calls == 2
+
+
+def test_eviction_keeps_other_files(tmp_path: pathlib.Path) -> None:
+    cache, parser = ParseCache(), CountingParser()
+    (tmp_path / CACHE_DIRNAME).mkdir()
+    (tmp_path / CACHE_DIRNAME / "unrelated.txt").write_text("x" * 10_000)
+
+    scripts = []
+    for number in range(3):
+        path = tmp_path / f"script{number}.py"
+        path.write_text(SOURCE)
+        scripts.append(path)
+        cache.parse(str(path), parser=parser)
+        entry = cache.cache_filename(str(path))
+        # Distinct write times, the oldest entry is evicted first.
+        os.utime(entry, ns=(number * 10**9, number * 10**9))
+
+    cache.max_size = os.path.getsize(cache.cache_filename(str(scripts[0]))) * 2
+    extra = tmp_path / "extra.py"
+    extra.write_text(SOURCE)
+    cache.parse(str(extra), parser=parser)
+
+    remaining = _entries(tmp_path)
+    assert "unrelated.txt" in remaining
+    assert os.path.basename(cache.cache_filename(str(scripts[0]))) not in remaining
+    assert os.path.basename(cache.cache_filename(str(extra))) in remaining
+
+
+def test_concurrent_writers(script: pathlib.Path) -> None:
+    parser = CountingParser()
+    barrier = threading.Barrier(16)
+    results = []
+
+    def worker() -> None:
+        barrier.wait()
+        # Every cache misses, all of them write the same entry at once.
+        results.append(ParseCache().parse(str(script), parser=parser))
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 16
+    assert all(result == results[0] for result in results)
+    # No temporary files are left behind.
+    assert _entries(script.parent) == [
+        os.path.basename(ParseCache.cache_filename(str(script)))
+    ]
+    cache = ParseCache()
+    cache.parse(str(script), parser=parser)
+    assert cache.hits == 1
+
+
+def test_unwritable_directory_skips_caching(
+    script: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(_cache.tempfile, "mkstemp", fail)
+    cache, parser = ParseCache(), CountingParser()
+
+    cache.parse(str(script), parser=parser)
+    cache.parse(str(script), parser=parser)
+    assert parser.calls == 2
+    assert _entries(script.parent) == []
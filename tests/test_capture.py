@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Stress tests of per-thread and per-task output capture."""
+
+from __future__ import annotations
+
+import sys
+import asyncio
+import threading
+
+from petuhlang.utils import (
+    OutputInterceptor,
+    StreamingInterceptor,
+    capture_active,
+    real_stdout,
+)
+
+THREADS = 64
+LINES = 200
+
+
+def _capture_in_threads(make_interceptor) -> dict[int, list[str]]:
+    barrier = threading.Barrier(THREADS)
+    captured: dict[int, list[str]] = {}
+
+    def worker(number: int) -> None:
+        barrier.wait()
+        with make_interceptor() as interceptor:
+            assert capture_active()
+            for line in range(LINES):
+                print(f"{number}:{line}")
+        assert not capture_active()
+        captured[number] = list(interceptor)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return captured
+
+
+def _expected(number: int, /) -> list[str]:
+    return [f"{number}:{line}" for line in range(LINES)]
+
+
+def test_output_interceptor_threads(capsys) -> None:
+    stdout = sys.stdout
+    captured = _capture_in_threads(OutputInterceptor)
+
+    assert captured == {number: _expected(number) for number in range(THREADS)}
+    assert capsys.readouterr().out == ""
+    assert real_stdout() is getattr(stdout, "stream", stdout)
+
+
+def test_streaming_interceptor_threads(capsys) -> None:
+    captured = _capture_in_threads(
+        lambda: StreamingInterceptor(capture=True, forward=False)
+    )
+
+    assert captured == {number: _expected(number) for number in range(THREADS)}
+    assert capsys.readouterr().out == ""
+
+
+def test_forwarded_lines_are_whole(capsys) -> None:
+    _capture_in_threads(StreamingInterceptor)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(
+        line for number in range(THREADS) for line in _expected(number)
+    )
+
+
+def test_tasks() -> None:
+    async def task(number: int) -> list[str]:
+        with OutputInterceptor() as interceptor:
+            for line in range(LINES):
+                print(f"{number}:{line}")
+                await asyncio.sleep(0)
+        return list(interceptor)
+
+    async def main() -> list[list[str]]:
+        return await asyncio.gather(*(task(i) for i in range(THREADS)))
+
+    assert asyncio.run(main()) == [_expected(number) for number in range(THREADS)]
+
+
+def test_flush_forwards_pending_output() -> None:
+    with OutputInterceptor() as outer:
+        with StreamingInterceptor():
+            print("first")
+            sys.stdout.flush()
+            assert outer._stringio.getvalue() == "first\n"
+
+            print("progress", end="")
+            sys.stdout.flush()
+            assert outer._stringio.getvalue() == "first\nprogress"
+            print(" done")
+
+    assert outer == ["first", "progress done"]
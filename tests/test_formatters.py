@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of console record formatters."""
+
+from __future__ import annotations
+
+import json
+import math
+
+import pytest
+
+from petuhlang.cli import formatters
+from petuhlang.cli.formatters import JsonLinesFormatter, LevelEnum, TextFormatter
+
+
+class Unprintable:
+    def __str__(self) -> str:
+        raise TypeError("unprintable")
+
+    __repr__ = __str__
+
+
+def _record(context: dict[str, object], /) -> dict[str, object]:
+    line = JsonLinesFormatter().format(LevelEnum.info, "x", context)
+    assert line.endswith("\n") and line.count("\n") == 1
+    return json.loads(line)
+
+
+def test_text() -> None:
+    line = TextFormatter().format(LevelEnum.info, "x", {"a": 1})
+    assert line == "[INFO] x a=1\n"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("s", "s"),
+        (1, 1),
+        (1.5, 1.5),
+        (None, None),
+        (True, True),
+        ([1, "a"], [1, "a"]),
+        (math.inf, "inf"),
+        (math.nan, "nan"),
+        ([math.nan], "[nan]"),
+        ({(1, 2): 3}, "{(1, 2): 3}"),
+        ({1: 2}, {"1": 2}),
+    ],
+)
+def test_json_values(value: object, expected: object) -> None:
+    assert _record({"data": value})["data"] == expected
+
+
+def test_json_circular_and_unprintable() -> None:
+    circular: list[object] = []
+    circular.append(circular)
+
+    record = _record({"a": circular, "b": Unprintable(), "c": [Unprintable()]})
+    assert record["a"] == "[[...]]"
+    assert record["b"].startswith("<") and "Unprintable" in record["b"]
+    assert record["c"].startswith("<list object")
+
+
+def test_json_reserved_keys() -> None:
+    record = _record({"time": 1, "level": 2, "message": 3, "other": 4})
+    assert record["level"] == "info" and record["message"] == "x"
+    assert record["context.time"] == 1
+    assert record["context.level"] == 2
+    assert record["context.message"] == 3
+    assert record["other"] == 4
+
+
+def test_json_fragments_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(formatters, "_MAX_FRAGMENTS", 4)
+    formatter = JsonLinesFormatter()
+    for number in range(16):
+        line = formatter.format(LevelEnum.info, "x", {f"key{number}": number})
+        assert json.loads(line)[f"key{number}"] == number
+
+    assert len(formatter._JsonLinesFormatter__fragments) == 4
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of petuh-functions built from code objects."""
+
+from __future__ import annotations
+
+import pytest
+
+from petuhlang import Runtime, errors
+
+
+class Unprintable:
+    def __str__(self) -> str:
+        raise TypeError("unprintable")
+
+    __repr__ = __str__
+
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+
+
+@pytest.fixture()
+def runtime():
+    with Runtime() as runtime:
+        yield runtime
+
+
+def run(runtime: Runtime, source: str, /, **values: object) -> dict[str, object]:
+    runtime.bind_many(values.items())
+    return runtime.run_source(USING + source)
+
+
+def test_large_default_identity(runtime: Runtime) -> None:
+    big = list(range(100_000))
+    run(runtime, 'function >> first(kwarg("items", value=big)) ["return items"]', big=big)
+
+    first = runtime.namespace["first"]
+    assert first() is big
+    assert first.__defaults__[0] is big
+
+
+def test_unprintable_default_identity(runtime: Runtime) -> None:
+    value = Unprintable()
+    run(runtime, 'function >> same(kwarg("v", value=value)) ["return v"]', value=value)
+
+    assert runtime.namespace["same"]() is value
+
+
+def test_argument_order(runtime: Runtime) -> None:
+    run(runtime, 'function >> pair(arg("a"), kwarg("b", value=2)) ["return a, b"]')
+    assert runtime.namespace["pair"](1) == (1, 2)
+
+    with pytest.raises(errors.BadFunctionArgError):
+        run(runtime, 'function >> bad(kwarg("b", value=2), arg("a")) ["return a"]')
+
+
+@pytest.mark.parametrize("mode", ["off", "check", "coerce"])
+def test_indented_body(runtime: Runtime, mode: str) -> None:
+    runtime.typecheck = mode
+    run(runtime, 'function >> inc(arg("x") >> int) ["""\n    y = x + 1\n    return y\n"""]')
+
+    assert runtime.namespace["inc"](1) == 2
+    if mode == "check":
+        with pytest.raises(errors.ArgumentTypeError):
+            runtime.namespace["inc"]("1")
+
+
+@pytest.mark.parametrize("mode", ["check", "coerce"])
+def test_default_is_not_validated(runtime: Runtime, mode: str) -> None:
+    runtime.typecheck = mode
+    run(runtime, 'function >> g(arg("x"), kwarg("z", value=None) >> int) ["return z"]')
+
+    g = runtime.namespace["g"]
+    assert g(1) is None
+    assert g(1, z=2) == 2
+    if mode == "check":
+        with pytest.raises(errors.ArgumentTypeError):
+            g(1, z="2")
+    else:
+        assert g(1, z="2") == 2
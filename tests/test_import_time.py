@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Import-time budget of `import petuhlang.build`."""
+
+from __future__ import annotations
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+# Cumulative microseconds reported by `python -X importtime` (best of the runs).
+IMPORT_BUDGET_US = 150_000
+RUNS = 3
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str, /, *args: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": ROOT, "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _import_time_us() -> int:
+    lines = _run("import petuhlang.build", "-X", "importtime").stderr.splitlines()
+    (line,) = (line for line in lines if line.rstrip().endswith("| petuhlang.build"))
+    return int(line.split("|")[1])
+
+
+def test_import_budget() -> None:
+    best = min(_import_time_us() for _ in range(RUNS))
+    assert best <= IMPORT_BUDGET_US, f"import petuhlang.build took {best}us"
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["asyncio", "json", "concurrent.futures", "sqlite3", "ctypes", "petuhlang.cli.colors.impl"],
+)
+def test_lazy_modules(module: str) -> None:
+    code = f"import sys, petuhlang.build; print({module!r} in sys.modules)"
+    assert _run(code).stdout.strip() == "False"
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of lazy placeholders of ``using(lazy=True)``."""
+
+from __future__ import annotations
+
+import pytest
+
+from petuhlang import Runtime
+from petuhlang._strategy import LazyDefault
+from petuhlang._functions import PetuhFunction
+from petuhlang._functions.compiled import PetuhCompiledFunction
+
+SCRIPT = """
+from petuhlang import build
+build.using(lazy={lazy}) >> "petuhlang"
+snapshot("before")
+
+function >> used() ["return 1"]
+snapshot("defined")
+if never:
+    function >> unused() ["return 2"]
+    pyclass >> Unused()
+"""
+
+
+def _run(lazy: bool, /) -> dict[str, dict[str, type]]:
+    snapshots: dict[str, dict[str, type]] = {}
+    with Runtime() as runtime:
+
+        def snapshot(name: str) -> None:
+            snapshots[name] = {
+                item: type(runtime.namespace[item])
+                for item in ("used", "unused", "Unused")
+            }
+
+        runtime.bind_many({"snapshot": snapshot, "never": False}.items())
+        runtime.run_source(SCRIPT.format(lazy=lazy))
+    return snapshots
+
+
+def test_names_materialize_on_use() -> None:
+    snapshots = _run(True)
+
+    assert set(snapshots["before"].values()) == {LazyDefault}
+    assert snapshots["defined"] == {
+        "used": PetuhCompiledFunction,
+        "unused": LazyDefault,
+        "Unused": LazyDefault,
+    }
+
+
+def test_eager_names() -> None:
+    snapshots = _run(False)
+
+    assert snapshots["before"]["used"] is PetuhFunction
+    assert snapshots["before"]["Unused"] is not LazyDefault
+
+
+def test_attribute_access_materializes() -> None:
+    with Runtime() as runtime:
+        runtime.bind("never", False)
+        runtime.bind("snapshot", lambda name: None)
+        runtime.run_source(SCRIPT.format(lazy=True))
+
+        placeholder = runtime.namespace["unused"]
+        assert isinstance(placeholder, LazyDefault)
+        assert str(placeholder) == "unused"
+        assert placeholder.__fn_name__ == "unused"
+        assert isinstance(runtime.namespace["unused"], PetuhFunction)
+        with pytest.raises(AttributeError):
+            placeholder.missing_attribute
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of :meth:`PetuhCompiledFunction.map`."""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import concurrent.futures
+
+import pytest
+
+from petuhlang import Runtime, errors
+from petuhlang._functions import compiled
+
+SCRIPT = """
+from petuhlang import build
+build.using >> "petuhlang"
+
+function >> offset() [100]
+pyclass >> Box()
+function >> shifted(arg("x")) ["return x + offset()"]
+function >> boxed(arg("x")) ["return (type(Box()).__name__, shifted(x))"]
+function >> slow(arg("x")) ["import time; time.sleep(0.001 * (x % 3)); return x"]
+asyncfunction >> later(arg("x")) ["return x"]
+"""
+
+
+@pytest.fixture(scope="module")
+def runtime():
+    with Runtime() as runtime:
+        runtime.run_source(SCRIPT)
+        yield runtime
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+@pytest.mark.parametrize("chunksize", [None, 1, 7])
+def test_order(runtime: Runtime, mode: str, chunksize: int | None) -> None:
+    slow = runtime.namespace["slow"]
+    with runtime.activate():
+        results = list(slow.map(range(50), workers=3, mode=mode, chunksize=chunksize))
+    assert results == list(range(50))
+
+
+def test_in_flight_window(runtime: Runtime) -> None:
+    consumed = itertools.count()
+
+    def numbers():
+        for number in itertools.count():
+            next(consumed)
+            yield number
+
+    shifted = runtime.namespace["shifted"]
+    with runtime.activate():
+        results = shifted.map(numbers(), workers=2, chunksize=3)
+        assert list(itertools.islice(results, 5)) == [100, 101, 102, 103, 104]
+        results.close()
+
+    # Two chunks in flight per worker, one more submitted per finished chunk.
+    read = next(consumed)
+    assert read <= (2 * compiled._IN_FLIGHT_PER_WORKER + 2) * 3
+
+
+def test_bad_arguments(runtime: Runtime) -> None:
+    shifted, later = runtime.namespace["shifted"], runtime.namespace["later"]
+    with pytest.raises(ValueError):
+        shifted.map([1], mode="fiber")
+    with pytest.raises(ValueError):
+        shifted.map([1], workers=0)
+    with pytest.raises(errors.UnsupportedFunctionError):
+        later.map([1])
+
+
+def test_dependencies_are_shipped(runtime: Runtime) -> None:
+    with runtime.activate():
+        payload = compiled.dump_definitions(runtime.namespace["boxed"])
+
+    # Like a spawned worker, nothing of the script exists in the runtime.
+    with Runtime() as worker, worker.activate():
+        boxed = compiled.load_definitions(payload)
+        assert boxed(1) == ("Box", 101)
+
+
+@pytest.mark.skipif(
+    "spawn" not in multiprocessing.get_all_start_methods(), reason="no spawn"
+)
+def test_spawned_worker(runtime: Runtime) -> None:
+    boxed = runtime.namespace["boxed"]
+    with runtime.activate(), concurrent.futures.ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        assert list(executor.map(boxed, [1, 2])) == [("Box", 101), ("Box", 102)]
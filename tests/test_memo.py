@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of the ``memo`` keyword."""
+
+from __future__ import annotations
+
+import types
+import threading
+
+import pytest
+
+from petuhlang import Runtime
+from petuhlang._functions import memo
+from petuhlang._functions.impl import _Callable
+from petuhlang._functions.memo import MemoInfo, MemoizedFunction
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(memo, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _memoized(keyword: str, /, body: str = "calls.append(x); return x * 2") -> tuple:
+    runtime = Runtime()
+    calls: list[object] = []
+    runtime.bind("calls", calls)
+    runtime.run_source(USING + f'{keyword} >> function >> f(arg("x")) ["{body}"]')
+    return runtime, runtime.namespace["f"], calls
+
+
+def test_hits_and_misses() -> None:
+    runtime, f, calls = _memoized("memo")
+    with runtime:
+        assert isinstance(f, MemoizedFunction)
+        assert [f(1), f(1), f(2), f(x=1), f(x=1)] == [2, 2, 4, 2, 2]
+        # Keyword arguments are other keys (like functools.lru_cache).
+        assert calls == [1, 2, 1]
+        assert f.cache_info() == MemoInfo(
+            hits=2, misses=3, evictions=0, maxsize=128, currsize=3
+        )
+
+
+def test_lru_eviction() -> None:
+    runtime, f, calls = _memoized("memo(maxsize=2)")
+    with runtime:
+        f(1), f(2), f(1), f(3)
+        # 2 was the least recently used one.
+        f(1), f(2)
+        assert calls == [1, 2, 3, 2]
+        info = f.cache_info()
+        assert (info.evictions, info.currsize, info.maxsize) == (2, 2, 2)
+
+
+def test_unbounded_and_disabled() -> None:
+    runtime, f, calls = _memoized("memo(maxsize=None)")
+    with runtime:
+        for number in range(300):
+            f(number)
+        assert f.cache_info().currsize == 300
+
+    runtime, f, calls = _memoized("memo(maxsize=0)")
+    with runtime:
+        f(1), f(1)
+        assert calls == [1, 1]
+        assert f.cache_info().currsize == 0
+
+
+def test_ttl_expiry(clock: list[float]) -> None:
+    runtime, f, calls = _memoized("memo(ttl=30)")
+    with runtime:
+        f(1)
+        clock[0] += 29
+        f(1)
+        assert calls == [1]
+
+        clock[0] += 2
+        f(1)
+        assert calls == [1, 1]
+        assert f.cache_info().evictions == 1
+
+
+def test_cache_clear() -> None:
+    runtime, f, calls = _memoized("memo")
+    with runtime:
+        f(1), f(1)
+        f.cache_clear()
+        assert f.cache_info() == MemoInfo(
+            hits=0, misses=0, evictions=0, maxsize=128, currsize=0
+        )
+        f(1)
+        assert calls == [1, 1]
+
+
+def test_constant_body_passes_through() -> None:
+    with Runtime() as runtime:
+        runtime.run_source(USING + "memo >> function >> answer() [42]")
+        answer = runtime.namespace["answer"]
+        assert isinstance(answer, _Callable)
+        assert answer() == 42
+
+
+def test_unhashable_arguments() -> None:
+    runtime, f, calls = _memoized("memo", body="calls.append(x); return len(x)")
+    with runtime, pytest.raises(TypeError):
+        f([1, 2])
+
+
+def test_threads() -> None:
+    runtime, f, calls = _memoized("memo(maxsize=16)")
+    barrier = threading.Barrier(8)
+
+    def worker() -> None:
+        barrier.wait()
+        for number in range(200):
+            assert f(number % 32) == number % 32 * 2
+
+    with runtime:
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        info = f.cache_info()
+        assert info.hits + info.misses == 8 * 200
+        assert info.currsize <= 16
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of concurrent then-blocks (``then.parallel [...]``)."""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from petuhlang import errors, _parallel
+from petuhlang.pkeywords import then
+
+
+def _sleeper(value: int, delay: float):
+    def block() -> int:
+        time.sleep(delay)
+        print(f"block {value}")
+        return value
+
+    return block
+
+
+def _failing(message: str):
+    def block() -> None:
+        print(f"failing {message}")
+        raise RuntimeError(message)
+
+    return block
+
+
+def test_values_and_output_in_order(capsys: pytest.CaptureFixture[str]) -> None:
+    # The first block finishes last.
+    result = then.parallel[_sleeper(1, 0.06), _sleeper(2, 0.03), _sleeper(3, 0), 4]
+    assert result.__to_compile__ == [1, 2, 3, 4]
+    assert capsys.readouterr().out == "block 1\nblock 2\nblock 3\n"
+
+
+def test_blocks_run_concurrently() -> None:
+    barrier = threading.Barrier(3, timeout=5)
+    # Every block waits for the others, sequential run would break the barrier.
+    result = then.all[barrier.wait, barrier.wait, barrier.wait]
+    assert sorted(result.__to_compile__) == [0, 1, 2]
+
+
+def test_errors_are_aggregated(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(errors.ParallelBlocksError) as info:
+        then.parallel[_failing("a"), _sleeper(1, 0), _failing("b")]
+
+    assert "2 of 3 then-blocks failed" in str(info.value)
+    assert [str(exc) for exc in info.value.exceptions] == ["a", "b"]
+    # Output of all the blocks is still replayed.
+    assert capsys.readouterr().out == "failing a\nblock 1\nfailing b\n"
+
+
+def test_nested_does_not_deadlock() -> None:
+    _parallel.configure(workers=1)
+    try:
+        result = then.parallel[lambda: then.parallel[lambda: 1, lambda: 2].__to_compile__]
+        assert result.__to_compile__ == [[1, 2]]
+    finally:
+        _parallel.configure()
+
+
+def test_configure_rejects_bad_workers() -> None:
+    with pytest.raises(ValueError):
+        _parallel.configure(workers=0)
+
+
+def test_inside_event_loop(capsys: pytest.CaptureFixture[str]) -> None:
+    async def coroutine() -> str:
+        await asyncio.sleep(0.02)
+        print("coroutine")
+        return "async"
+
+    async def main() -> list[object]:
+        result = await then.parallel[coroutine, _sleeper(1, 0), 2]
+        return result.__to_compile__
+
+    assert asyncio.run(main()) == ["async", 1, 2]
+    assert capsys.readouterr().out == "coroutine\nblock 1\n"
+
+
+def test_coroutines_outside_event_loop() -> None:
+    async def coroutine(value: int) -> int:
+        await asyncio.sleep(0)
+        return value
+
+    result = then.parallel[lambda: coroutine(1), lambda: coroutine(2)]
+    assert result.__to_compile__ == [1, 2]
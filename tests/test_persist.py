@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of results stored between runs by ``persist``."""
+
+from __future__ import annotations
+
+import os
+import sys
+import typing
+import textwrap
+import subprocess
+
+from petuhlang import Runtime
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = textwrap.dedent(
+    '''
+    from petuhlang import build
+    build.using >> "petuhlang"
+
+    persist() >> function >> big(arg("n")) ["return str(n) * 200_000"]
+
+    for n in range(100):
+        assert len(big(n)) == len(str(n)) * 200_000
+    print(big.hits, big.misses)
+    '''
+)
+
+
+def _run_script(path: str, /) -> list[str]:
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    env.pop("PETUHLANG_NO_CACHE", None)
+    return subprocess.run(
+        [sys.executable, path],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    ).stdout.split()
+
+
+def test_second_run_is_served_from_disk(tmp_path) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(SCRIPT)
+
+    assert _run_script(str(script)) == ["0", "100"]
+    # More than the cache directory bound, the code cache must not evict it.
+    database = tmp_path / "__petuhcache__" / "persist" / "persist.sqlite3"
+    assert database.stat().st_size > 16 * 1024 * 1024
+
+    assert _run_script(str(script)) == ["100", "0"]
+    assert database.exists()
+
+
+def _persisted(path: str, definition: str, /) -> typing.Any:
+    with Runtime() as runtime:
+        runtime.run_source(USING + f"persist(path={path!r}) >> {definition}")
+        return runtime.namespace["f"]
+
+
+def test_default_change_invalidates(tmp_path) -> None:
+    path = str(tmp_path / "results.sqlite3")
+    definition = 'function >> f(arg("x"), kwarg("y", value={})) ["return x + y"]'
+
+    assert _persisted(path, definition.format(1))(10) == 11
+    f = _persisted(path, definition.format(2))
+    assert f(10) == 12
+    assert (f.hits, f.misses) == (0, 1)
+
+
+def test_arguments_share_key(tmp_path) -> None:
+    f = _persisted(
+        str(tmp_path / "results.sqlite3"),
+        'function >> f(arg("x"), kwarg("y", value=1)) ["return x + y"]',
+    )
+
+    assert [f(1), f(x=1), f(1, 1), f(1, y=1), f(1, 2)] == [2, 2, 2, 2, 3]
+    assert (f.hits, f.misses) == (3, 2)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of pickling petuh-functions and petuh-classes by definition."""
+
+from __future__ import annotations
+
+import pickle
+import multiprocessing
+import concurrent.futures
+
+import pytest
+
+from petuhlang import Runtime
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+SCRIPT = USING + """
+function >> get() ["return secret"]
+function >> double(arg("x")) ["return x * 2"]
+function >> kind(arg("obj")) ["return type(obj).__name__"]
+pyclass >> K()
+"""
+
+
+def _runtime(secret: str, /) -> Runtime:
+    runtime = Runtime()
+    runtime.bind("secret", secret)
+    runtime.run_source(SCRIPT)
+    return runtime
+
+
+def _round_trip(runtime: Runtime, value: object, /) -> object:
+    with runtime.activate():
+        return pickle.loads(pickle.dumps(value))
+
+
+def test_round_trip_in_runtimes() -> None:
+    first, second = _runtime("A-secret"), _runtime("B-secret")
+    try:
+        for runtime, secret in ((first, "A-secret"), (second, "B-secret")):
+            get, cls = runtime.namespace["get"], runtime.namespace["K"]
+            assert _round_trip(runtime, get) is get
+            assert _round_trip(runtime, get)() == secret
+            assert _round_trip(runtime, cls) is cls
+            assert type(_round_trip(runtime, cls())) is cls
+
+        assert first.namespace["K"] is not second.namespace["K"]
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_worker_processes(method: str) -> None:
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{method} is not supported")
+
+    with _runtime("secret") as runtime:
+        double, kind = runtime.namespace["double"], runtime.namespace["kind"]
+        instance = runtime.namespace["K"]()
+        with runtime.activate(), concurrent.futures.ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context(method)
+        ) as executor:
+            assert list(executor.map(double, range(5))) == [0, 2, 4, 6, 8]
+            assert executor.submit(kind, instance).result() == "K"
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of lazy then-pipelines (``then >> step1 >> step2``)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from petuhlang import errors
+from petuhlang.pkeywords import then
+from petuhlang._pipeline import Pipeline, PipelineRun
+
+
+def test_builds_lazily() -> None:
+    called: list[str] = []
+
+    def source():
+        called.append("source")
+        yield from (1, 2)
+
+    pipeline = then >> source >> (lambda x: x * 10)
+
+    assert isinstance(pipeline, Pipeline)
+    assert len(pipeline.steps) == 2
+    assert not called
+    assert list(pipeline) == [10, 20]
+    assert called == ["source"]
+
+
+def test_streams_one_item_at_a_time() -> None:
+    events: list[str] = []
+
+    def source():
+        for number in range(3):
+            events.append(f"read {number}")
+            yield number
+
+    def split(number: int):
+        for part in ("a", "b"):
+            events.append(f"split {number}{part}")
+            yield f"{number}{part}"
+
+    run = iter(then >> source >> split >> str.upper)
+    assert next(run) == "0A"
+    # Nothing is read ahead of the consumer.
+    assert events == ["read 0", "split 0a"]
+
+    assert list(run) == ["0B", "1A", "1B", "2A", "2B"]
+    assert events[-3:] == ["read 2", "split 2a", "split 2b"]
+
+
+def test_sources() -> None:
+    assert list(then >> [1, 2, 3] >> (lambda x: -x)) == [-1, -2, -3]
+    assert list(then >> (lambda: 5) >> (lambda x: x + 1)) == [6]
+    # Only generators returned by a callable are streamed.
+    assert list(then >> (lambda: [1, 2]) >> len) == [2]
+    # Strings are single items, not iterables of characters.
+    assert list(then >> "text" >> str.upper) == ["TEXT"]
+    assert list(Pipeline()) == []
+
+
+def test_timings() -> None:
+    def slow(item: int) -> int:
+        time.sleep(0.01)
+        return item
+
+    run = (then >> [1, 2, 3] >> slow >> (lambda x: x)).run()
+
+    assert isinstance(run, PipelineRun)
+    assert run.results == [1, 2, 3]
+    assert len(run.timings) == 3
+    assert run.timings[1] >= 0.03
+    assert run.timings[2] < run.timings[1]
+    assert "timings=[0: " in repr(run)
+
+
+def test_run_without_collecting() -> None:
+    seen: list[int] = []
+    run = (then >> range(4) >> seen.append).run(collect=False)
+
+    assert run.results == []
+    assert seen == [0, 1, 2, 3]
+
+
+def test_bad_step() -> None:
+    with pytest.raises(errors.BadPipelineStepError):
+        then >> [1] >> 2
+
+
+def test_errors_propagate() -> None:
+    run = iter(then >> [1, 0] >> (lambda x: 1 / x))
+    assert next(run) == 1
+    with pytest.raises(ZeroDivisionError):
+        next(run)
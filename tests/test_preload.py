@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of preloading petuhlang modules."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from petuhlang import _parser
+from petuhlang._preload import find_petuhlang_modules, preload
+
+MODULE = 'from petuhlang import build\nbuild.using >> "petuhlang"\n\n{}'
+
+
+@pytest.fixture(autouse=True)
+def parsed_modules(monkeypatch: pytest.MonkeyPatch) -> dict[str, object]:
+    registry: dict[str, object] = {}
+    monkeypatch.setattr(_parser, "__parsed_modules__", registry)
+    monkeypatch.setattr("petuhlang._preload.__parsed_modules__", registry)
+    monkeypatch.setenv("PETUHLANG_NO_CACHE", "1")
+    monkeypatch.setattr(_parser.parse_cache, "enabled", False)
+    return registry
+
+
+def _tree(root, count: int, /) -> None:
+    for number in range(count):
+        package = root / f"package{number % 3}"
+        package.mkdir(exist_ok=True)
+        (package / f"module{number}.py").write_text(
+            MODULE.format(f'function >> f{number}() ["return {number}"]\n')
+        )
+    (root / "plain.py").write_text("print('no petuhlang here')\n")
+    (root / "__pycache__").mkdir()
+    (root / "__pycache__" / "skipped.py").write_text(MODULE.format(""))
+
+
+def test_find_modules(tmp_path) -> None:
+    _tree(tmp_path, 5)
+    modules = find_petuhlang_modules([tmp_path])
+    assert sorted(os.path.basename(m) for m in modules) == [
+        f"module{number}.py" for number in range(5)
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_preload(tmp_path, parsed_modules: dict[str, object], workers: int) -> None:
+    _tree(tmp_path, 6)
+    modules = preload([tmp_path], workers=workers)
+
+    assert len(modules) == 6
+    assert parsed_modules == modules
+    assert sorted(
+        symbol.name for index in modules.values() for symbol in index.symbols
+    ) == sorted(f"f{number}" for number in range(6))
+    # Already parsed modules are not parsed again.
+    assert preload([tmp_path], workers=workers) == {}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_undecodable_file_is_skipped(
+    tmp_path, parsed_modules: dict[str, object], workers: int
+) -> None:
+    _tree(tmp_path, 3)
+    broken = tmp_path / "broken.py"
+    broken.write_bytes(MODULE.format("x = '\xff'\n").encode("latin-1"))
+
+    modules = preload([tmp_path], workers=workers)
+    assert len(modules) == 3
+    assert str(broken) not in parsed_modules
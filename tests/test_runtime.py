@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of runtime isolation and teardown."""
+
+from __future__ import annotations
+
+import linecache
+import threading
+
+import pytest
+
+from petuhlang import Runtime, errors
+
+USING = 'from petuhlang import build\nbuild.using >> "petuhlang"\n'
+SCRIPT = """
+barrier.wait()
+from petuhlang import build
+build.using >> "petuhlang"
+
+function >> {name}() ["return {name!r}"]
+result = {name}()
+"""
+
+
+def test_concurrent_scripts_are_isolated() -> None:
+    barrier = threading.Barrier(2)
+    results: dict[str, object] = {}
+
+    def worker(name: str) -> None:
+        with Runtime() as runtime:
+            runtime.bind("barrier", barrier)
+            try:
+                results[name] = runtime.run_source(SCRIPT.format(name=name))["result"]
+            except Exception as error:
+                results[name] = error
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in ("alpha", "beta")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"alpha": "alpha", "beta": "beta"}
+
+
+def test_sources_are_dropped_after_run() -> None:
+    cached = set(linecache.cache)
+    with Runtime() as runtime:
+        script = runtime.run_source(USING)
+        assert runtime.source(script["__file__"]) is None
+
+        with pytest.raises(ZeroDivisionError):
+            runtime.run_source("1 / 0", filename="<failing>")
+        assert runtime.source("<failing>") is None
+
+    assert set(linecache.cache) <= cached
+
+
+def test_close_unbinds_definitions() -> None:
+    runtime = Runtime()
+    runtime.bind("barrier", threading.Barrier(1))
+    runtime.run_source(SCRIPT.format(name="gamma"))
+    assert runtime.is_bound("gamma")
+
+    runtime.close()
+    assert not runtime.is_bound("gamma")
+    assert "gamma" not in runtime.namespace
+
+
+def test_modes_are_per_file() -> None:
+    checked = 'build.using(typecheck="check", optimize=True) >> "petuhlang"\n'
+    definition = 'function >> {}(arg("x") >> int) ["return str(x)"]\n'
+    with Runtime() as runtime:
+        runtime.run_source(
+            "from petuhlang import build\n" + checked + definition.format("f")
+        )
+        runtime.run_source(USING + definition.format("g"))
+
+        assert runtime.namespace["f"].__closure__ is not None
+        with pytest.raises(errors.ArgumentTypeError):
+            runtime.namespace["f"]("1")
+        assert runtime.namespace["g"].__closure__ is None
+        assert runtime.namespace["g"]("1") == "1"
+        assert (runtime.optimize, runtime.typecheck) == (False, "off")
+
+
+def test_using_again_resets_modes() -> None:
+    with Runtime() as runtime:
+        script = runtime.run_source(
+            "from petuhlang import build\n"
+            'build.using(typecheck="check") >> "petuhlang"\n'
+            'function >> f(arg("x") >> int) ["return x"]\n'
+            "checked = f\n"
+            'build.using >> "petuhlang"\n'
+            'function >> g(arg("x") >> int) ["return x"]\n'
+        )
+
+        with pytest.raises(errors.ArgumentTypeError):
+            script["checked"]("1")
+        assert runtime.namespace["g"]("1") == "1"
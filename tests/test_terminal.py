@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of terminal color detection and renderer selection."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from petuhlang.cli.colors import impl, terminal
+from petuhlang.cli.colors.terminal import (
+    ColorLevelEnum,
+    detect_color_level,
+    get_color_level,
+    set_color_level,
+)
+
+
+class FakeTTY(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class ClosedStream(io.StringIO):
+    def isatty(self) -> bool:
+        raise ValueError("I/O operation on closed file.")
+
+
+@pytest.fixture(autouse=True)
+def not_windows(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(terminal, "on_windows", lambda: False)
+
+
+@pytest.fixture()
+def restore_level():
+    yield
+    set_color_level(None)
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected"),
+    [
+        ({}, ColorLevelEnum.basic),
+        ({"TERM": "xterm"}, ColorLevelEnum.basic),
+        ({"TERM": "xterm-256color"}, ColorLevelEnum.ansi256),
+        ({"TERM": "xterm-256color", "COLORTERM": "truecolor"}, ColorLevelEnum.truecolor),
+        ({"COLORTERM": "24bit"}, ColorLevelEnum.truecolor),
+        ({"TERM": "dumb"}, ColorLevelEnum.none),
+        ({"NO_COLOR": "1", "TERM": "xterm-256color"}, ColorLevelEnum.none),
+        ({"FORCE_COLOR": "0"}, ColorLevelEnum.none),
+    ],
+)
+def test_tty(environ: dict[str, str], expected: ColorLevelEnum) -> None:
+    assert detect_color_level(FakeTTY(), environ=environ) is expected
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected"),
+    [
+        ({}, ColorLevelEnum.none),
+        ({"TERM": "xterm-256color", "COLORTERM": "truecolor"}, ColorLevelEnum.none),
+        ({"FORCE_COLOR": ""}, ColorLevelEnum.basic),
+        ({"FORCE_COLOR": "true"}, ColorLevelEnum.basic),
+        ({"FORCE_COLOR": "2"}, ColorLevelEnum.ansi256),
+        ({"FORCE_COLOR": "3"}, ColorLevelEnum.truecolor),
+        ({"FORCE_COLOR": "false"}, ColorLevelEnum.none),
+        ({"FORCE_COLOR": "3", "NO_COLOR": "1"}, ColorLevelEnum.none),
+    ],
+)
+def test_pipe(environ: dict[str, str], expected: ColorLevelEnum) -> None:
+    assert detect_color_level(io.StringIO(), environ=environ) is expected
+
+
+def test_streams_without_terminal() -> None:
+    assert detect_color_level(ClosedStream(), environ={}) is ColorLevelEnum.none
+    assert detect_color_level(object(), environ={}) is ColorLevelEnum.none
+
+
+def test_set_color_level(restore_level: None) -> None:
+    set_color_level(ColorLevelEnum.none)
+    assert get_color_level() is ColorLevelEnum.none
+    assert impl.cprint("text", "RED", return_str=True) == "text"
+
+    set_color_level(1)
+    assert get_color_level() is ColorLevelEnum.basic
+    assert impl.cprint("text", "RED", return_str=True) == (
+        impl._PREFIXES[("RED", None, None)] + "text" + impl._RESET
+    )
+
+
+def test_detect_again_on_next_use(
+    restore_level: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    set_color_level(ColorLevelEnum.truecolor)
+    monkeypatch.setattr(terminal, "detect_color_level", lambda: ColorLevelEnum.none)
+
+    set_color_level(None)
+    # Nothing is detected until colored output is rendered.
+    assert terminal._color_level is None
+    assert impl._render is impl._render_detect
+
+    assert impl.cprint("text", "RED", return_str=True) == "text"
+    assert get_color_level() is ColorLevelEnum.none
+    assert impl._render is impl._render_plain
+
+
+def test_cprint_many_plain(restore_level: None) -> None:
+    set_color_level(ColorLevelEnum.none)
+    style = impl.Style("GREEN", effect="BOLD")
+    assert impl.cprint_many([("a", style), ("b", None)], sep=" ", return_str=True) == "a b"
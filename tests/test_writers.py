@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2021 DenyS
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Tests of console writers: flush policies, queue policies and exit paths."""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import time
+import textwrap
+import threading
+import subprocess
+
+import pytest
+
+from petuhlang.cli import writers
+from petuhlang.cli.writers import AsyncWriter, BufferedWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BlockingStream(io.StringIO):
+    """Stream whose first write waits until it's released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def write(self, text: str, /) -> int:
+        self.started.set()
+        self.released.wait(5)
+        return super().write(text)
+
+
+@pytest.fixture()
+def stream(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr(writers, "real_stdout", lambda: stream)
+    return stream
+
+
+@pytest.fixture()
+def blocking(monkeypatch: pytest.MonkeyPatch) -> BlockingStream:
+    stream = BlockingStream()
+    monkeypatch.setattr(writers, "real_stdout", lambda: stream)
+    yield stream
+    stream.released.set()
+
+
+def _wait_for(condition, /, *, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_buffered_size(stream: io.StringIO) -> None:
+    writer = BufferedWriter(buffer_size=10)
+    try:
+        writer.write("abc\n")
+        writer.write("def\n")
+        assert stream.getvalue() == ""
+
+        writer.write("ghi\n")
+        assert stream.getvalue() == "abc\ndef\nghi\n"
+        writer.write("jkl\n")
+        writer.flush()
+        assert stream.getvalue() == "abc\ndef\nghi\njkl\n"
+    finally:
+        writer.close()
+
+
+def test_buffered_interval(stream: io.StringIO) -> None:
+    writer = BufferedWriter(interval=0.05)
+    try:
+        writer.write("idle\n")
+        assert stream.getvalue() == ""
+        # Written by the timer thread, nothing else is logged.
+        assert _wait_for(lambda: stream.getvalue() == "idle\n")
+
+        writer.write("again\n")
+        assert _wait_for(lambda: stream.getvalue() == "idle\nagain\n")
+    finally:
+        writer.close()
+
+    assert not any(t.name == "petuhlang-console-flush" for t in threading.enumerate())
+
+
+@pytest.mark.parametrize("interval", [0, -1.0])
+def test_buffered_bad_interval(interval: float) -> None:
+    with pytest.raises(ValueError):
+        BufferedWriter(interval=interval)
+
+
+def test_close_flushes(stream: io.StringIO) -> None:
+    for writer in (BufferedWriter(), AsyncWriter()):
+        writer.write(f"{type(writer).__name__}\n")
+        writer.close()
+
+    assert stream.getvalue() == "BufferedWriter\nAsyncWriter\n"
+
+
+@pytest.mark.parametrize(
+    ("policy", "written", "oldest", "newest"),
+    [("drop-newest", "0" "12", 0, 2), ("drop-oldest", "0" "34", 2, 0)],
+)
+def test_async_drop_policies(
+    blocking: BlockingStream, policy: str, written: str, oldest: int, newest: int
+) -> None:
+    writer = AsyncWriter(maxsize=2, policy=policy)
+    try:
+        writer.write("0")
+        # The writer thread took the first record and waits in `write`.
+        assert blocking.started.wait(5)
+        for record in "1234":
+            writer.write(record)
+
+        assert (writer.dropped_oldest, writer.dropped_newest) == (oldest, newest)
+        assert writer.dropped == oldest + newest
+        blocking.released.set()
+        writer.flush()
+        assert blocking.getvalue() == written
+    finally:
+        blocking.released.set()
+        writer.close()
+
+
+def test_async_block_policy(blocking: BlockingStream) -> None:
+    writer = AsyncWriter(maxsize=2, policy="block")
+    try:
+        writer.write("0")
+        assert blocking.started.wait(5)
+        writer.write("1")
+        writer.write("2")
+
+        producer = threading.Thread(target=writer.write, args=("3",))
+        producer.start()
+        producer.join(0.1)
+        assert producer.is_alive()
+
+        blocking.released.set()
+        producer.join(5)
+        writer.flush()
+        assert blocking.getvalue() == "0123"
+        assert writer.dropped == 0
+    finally:
+        blocking.released.set()
+        writer.close()
+
+
+@pytest.mark.parametrize("policy", ["lifo", ""])
+def test_async_bad_policy(policy: str) -> None:
+    with pytest.raises(ValueError):
+        AsyncWriter(policy=policy)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not supported")
+def test_async_after_fork(stream: io.StringIO) -> None:
+    writer = AsyncWriter()
+    try:
+        writer.write("parent\n")
+        writer.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            # The writer thread is started again in the child.
+            code = 1
+            try:
+                writer.write("child\n")
+                writer.flush()
+                code = 0 if stream.getvalue() == "parent\nchild\n" else 1
+            finally:
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert stream.getvalue() == "parent\n"
+    finally:
+        writer.close()
+
+
+def _run_script(source: str, /) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(source)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+
+
+@pytest.mark.parametrize("mode", ["buffered", "async"])
+def test_flushed_at_exit(mode: str) -> None:
+    result = _run_script(
+        f"""
+        from petuhlang.cli.console import console
+        console.configure(mode={mode!r})
+        for number in range(3):
+            console.log(number)
+        """
+    )
+    assert result.returncode == 0
+    assert result.stdout == "0\n1\n2\n"
+
+
+@pytest.mark.parametrize("mode", ["buffered", "async"])
+def test_flushed_before_traceback(mode: str) -> None:
+    result = _run_script(
+        f"""
+        from petuhlang.cli.console import console
+        console.configure(mode={mode!r})
+        console.log("before the error")
+        raise RuntimeError("boom")
+        """
+    )
+    assert result.returncode == 1
+    assert result.stdout.index("before the error") < result.stdout.index("Traceback")
+    assert "RuntimeError: boom" in result.stdout